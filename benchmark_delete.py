@@ -0,0 +1,253 @@
+"""
+Benchmark the recursive folder delete against an in-memory Firestore and
+Storage stand-in.
+
+    python benchmark_delete.py [--files 100000] [--latency-ms 1] [--baseline-files 2000]
+
+Every simulated request sleeps for the given latency and is counted. The
+baseline deletes the same kind of tree the way a naive recursive delete would:
+one document read, one blob delete and one document delete per file. It runs
+on a smaller tree and is scaled up, since it would otherwise take minutes.
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from gui.checkpoints import CheckpointStore
+from gui.folder_delete import FolderDeleter
+
+
+class FakeBackend:
+    def __init__(self, latency):
+        self.latency = latency
+        self.docs = defaultdict(dict)  # collection path -> {document id: data}
+        self.blobs = set()
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def split(self, path):
+        collection, doc_id = path.rsplit("/", 1)
+        return self.docs[collection], doc_id
+
+    def document_count(self):
+        return sum(map(len, self.docs.values()))
+
+    def remove(self, path):
+        documents, doc_id = self.split(path)
+        documents.pop(doc_id, None)
+
+    def request(self):
+        with self.lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+
+class NotFound(Exception):
+    code = 404
+
+
+class FakeDoc:
+    def __init__(self, backend, path):
+        self.backend = backend
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+        self.reference = self
+        documents, doc_id = backend.split(path)
+        self.exists = doc_id in documents
+
+    def collection(self, name):
+        return FakeQuery(self.backend, f"{self.path}/{name}")
+
+    def to_dict(self):
+        documents, doc_id = self.backend.split(self.path)
+        return dict(documents.get(doc_id, {}))
+
+    def get(self):
+        self.backend.request()
+        return FakeDoc(self.backend, self.path)
+
+    def set(self, data):
+        self.backend.request()
+        documents, doc_id = self.backend.split(self.path)
+        documents[doc_id] = dict(data)
+
+    def delete(self):
+        self.backend.request()
+        self.backend.remove(self.path)
+
+
+class FakeQuery:
+    def __init__(self, backend, path, limit_count=None, cursor=None):
+        self.backend = backend
+        self.path = path
+        self.limit_count = limit_count
+        self.cursor = cursor
+
+    def document(self, doc_id):
+        return FakeDoc(self.backend, f"{self.path}/{doc_id}")
+
+    def select(self, fields):
+        return self
+
+    def order_by(self, field):
+        return self
+
+    def limit(self, count):
+        return FakeQuery(self.backend, self.path, count, self.cursor)
+
+    def start_after(self, doc):
+        return FakeQuery(self.backend, self.path, self.limit_count, doc.id)
+
+    def _ids(self):
+        return sorted(self.backend.docs.get(self.path, ()))
+
+    def stream(self):
+        self.backend.request()
+        ids = [i for i in self._ids() if self.cursor is None or i > self.cursor]
+        if self.limit_count is not None:
+            ids = ids[:self.limit_count]
+        return [FakeDoc(self.backend, f"{self.path}/{i}") for i in ids]
+
+    def count(self):
+        query = self
+
+        class Aggregation:
+            def get(self):
+                query.backend.request()
+                return [[type("Result", (), {"value": len(query._ids())})()]]
+        return Aggregation()
+
+
+class FakeBatch:
+    def __init__(self, backend):
+        self.backend = backend
+        self.ops = []
+
+    def delete(self, ref):
+        self.ops.append(ref.path)
+
+    def commit(self):
+        self.backend.request()
+        for path in self.ops:
+            self.backend.remove(path)
+
+
+class FakeDB:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def collection(self, name):
+        return FakeQuery(self.backend, name)
+
+    def document(self, path):
+        return FakeDoc(self.backend, path)
+
+    def batch(self):
+        return FakeBatch(self.backend)
+
+
+class FakeBucket:
+    def __init__(self, backend):
+        self.backend = backend
+        self.client = self
+        self.local = threading.local()
+
+    def batch(self):
+        bucket = self
+
+        class Batch:
+            def __enter__(self):
+                bucket.local.batching = True
+
+            def __exit__(self, *exc):
+                bucket.local.batching = False
+                bucket.backend.request()
+                return False
+        return Batch()
+
+    def blob(self, path):
+        bucket = self
+
+        class Blob:
+            def delete(self):
+                if not getattr(bucket.local, "batching", False):
+                    bucket.backend.request()
+                with bucket.backend.lock:
+                    if path not in bucket.backend.blobs:
+                        raise NotFound(path)
+                    bucket.backend.blobs.remove(path)
+        return Blob()
+
+
+def build_tree(backend, username, total_files, fanout=10, files_per_folder=100):
+    """A folder tree with fanout subfolders per folder and files spread evenly"""
+    root = "folders/%s/user_folders" % username
+    names = ["bench"]
+    queue = ["bench"]
+    while len(names) * files_per_folder < total_files:
+        parent = queue.pop(0)
+        for index in range(fanout):
+            child = f"{parent}-{index}"
+            backend.docs[f"{root}/{parent}/subfolders"][child] = {}
+            names.append(child)
+            queue.append(child)
+    backend.docs[root]["bench"] = {}
+    for number in range(total_files):
+        folder = names[number % len(names)]
+        storage_path = f"users/{username}/files/{folder}-{number}.txt"
+        backend.docs[f"{root}/{folder}/files"][f"{number:06d}.txt"] = {"storage_path": storage_path}
+        backend.blobs.add(storage_path)
+    return root
+
+
+def naive_delete(backend, root):
+    """Per-file read, blob delete and document delete, folder by folder"""
+    db, bucket = FakeDB(backend), FakeBucket(backend)
+    pending = ["bench"]
+    while pending:
+        name = pending.pop()
+        container = db.collection(root).document(name)
+        pending.extend(doc.id for doc in container.collection("subfolders").stream())
+        for doc in container.collection("files").stream():
+            data = doc.get().to_dict()
+            bucket.blob(data["storage_path"]).delete()
+            doc.delete()
+        for doc in container.collection("subfolders").stream():
+            doc.delete()
+        container.delete()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--files", type=int, default=100000)
+    parser.add_argument("--latency-ms", type=float, default=1.0)
+    parser.add_argument("--baseline-files", type=int, default=2000)
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+
+    backend = FakeBackend(latency)
+    build_tree(backend, "bench", args.files)
+    with tempfile.TemporaryDirectory() as folder:
+        deleter = FolderDeleter(FakeDB(backend), FakeBucket(backend), "bench",
+                                CheckpointStore(os.path.join(folder, "checkpoints.json")))
+        start = time.perf_counter()
+        deleted = deleter.run("bench")
+        elapsed = time.perf_counter() - start
+    assert not backend.document_count() and not backend.blobs, "tree was not fully deleted"
+    print(f"recursive delete: {deleted} files in {elapsed:.2f}s, {backend.requests} requests")
+
+    backend = FakeBackend(latency)
+    root = build_tree(backend, "bench", args.baseline_files)
+    start = time.perf_counter()
+    naive_delete(backend, root)
+    scale = args.files / args.baseline_files
+    baseline = (time.perf_counter() - start) * scale
+    print(f"naive delete:     {args.files} files in ~{baseline:.2f}s, ~{int(backend.requests * scale)} requests "
+          f"(measured on {args.baseline_files} files)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Measure how long the app takes to start, with Firebase initialized eagerly at
+import time (as it used to be) and lazily on first use.
+
+    python benchmark_startup.py [--runs 5]
+
+Each measurement runs in a fresh interpreter so nothing is cached between
+them. "import" is the time to import firebase_config; "first window" is the
+time from process start until the welcome screen has been drawn, and needs a
+display. In lazy mode the report also shows when the background warm-up had
+Firebase ready.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+IMPORT_PROBE = """
+import json, time
+start = time.perf_counter()
+import firebase_config
+if {eager}:
+    firebase_config.get_db()
+print(json.dumps({{"import": time.perf_counter() - start}}))
+"""
+
+WINDOW_PROBE = """
+import json, time
+start = time.perf_counter()
+import firebase_config
+if {eager}:
+    firebase_config.get_db()
+from gui.screens import create_root
+from gui.welcome import welcome_screen
+result = {{}}
+root = create_root()
+welcome_screen(root)
+root.update()
+result["first window"] = time.perf_counter() - start
+firebase_config.warm_up().join()
+result["firebase ready"] = time.perf_counter() - start
+root.destroy()
+print(json.dumps(result))
+"""
+
+
+def probe(source, eager):
+    output = subprocess.run([sys.executable, "-c", source.format(eager=eager)],
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure(source, eager, runs):
+    """Median of each timing over several fresh processes"""
+    samples = [probe(source, eager) for _ in range(runs)]
+    return {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for label, eager in (("eager", True), ("lazy", False)):
+        timings = measure(IMPORT_PROBE, eager, args.runs)
+        try:
+            timings.update(measure(WINDOW_PROBE, eager, args.runs))
+        except subprocess.CalledProcessError as e:
+            last_line = (e.stderr.strip().splitlines() or ["unknown error"])[-1]
+            print(f"{label}: first window not measured ({last_line})")
+        print(f"{label}: " + ", ".join(f"{key} {seconds * 1000:.0f} ms" for key, seconds in timings.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Fail when the welcome screen gets slow to import.
+
+    python check_import_budget.py [--budget-ms 100] [--runs 5]
+
+gui.welcome is imported cold in fresh interpreters and the median time is
+compared with the budget. Its import must also stay clear of the heavy
+dependencies that only later screens need; pulling any of them in fails the
+check regardless of timing. Exits with status 1 on failure. The same check
+runs in the test suite (tests/test_import_budget.py).
+"""
+import argparse
+import statistics
+import sys
+from gui.startup_profile import WELCOME_BUDGET_MS, WELCOME_MODULES, profile_imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=WELCOME_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    profiles = [profile_imports(WELCOME_MODULES) for _ in range(args.runs)]
+    failures = [profile.error for profile in profiles if profile.error]
+    elapsed = statistics.median(profile.total_ms() for profile in profiles)
+    if elapsed > args.budget_ms:
+        failures.append(f"importing gui.welcome took {elapsed:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+    heavy = profiles[0].heavy()
+    if heavy:
+        failures.append(f"importing gui.welcome loads {', '.join(heavy)}")
+
+    if failures:
+        print("\n".join(failures))
+        print(profiles[0].report())
+        sys.exit(1)
+    print(f"gui.welcome imports in {elapsed:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
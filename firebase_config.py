@@ -1,15 +1,65 @@
-import firebase_admin
-from firebase_admin import credentials, firestore, storage
+import threading
 
 # Path to your Firebase Admin SDK JSON file
 CREDENTIALS_PATH = "data/firebase_credentials.json"
+STORAGE_BUCKET = "filemanagement-68e13.firebasestorage.app"  # Replace with your Firebase project ID
 
-# Initialize Firebase
-cred = credentials.Certificate(CREDENTIALS_PATH)
-firebase_admin.initialize_app(cred, {"storageBucket": "filemanagement-68e13.firebasestorage.app"})  # Replace with your Firebase project ID
+# Clients are created on first use rather than at import time, so screens that
+# import this module can draw before credentials are parsed and gRPC is set up
+_lock = threading.Lock()
+_clients = {}
 
-# Firestore client for database operations
-db = firestore.client()
 
-# Firebase Storage client for file operations
-bucket = storage.bucket()
+def _client(name):
+    """Create the Firebase app and both clients once, from whichever thread asks first"""
+    client = _clients.get(name)
+    if client is not None:
+        return client
+    with _lock:
+        if not _clients:
+            import firebase_admin
+            from firebase_admin import credentials, firestore, storage
+
+            # Initialize Firebase, unless an earlier attempt got that far
+            try:
+                firebase_admin.get_app()
+            except ValueError:
+                cred = credentials.Certificate(CREDENTIALS_PATH)
+                firebase_admin.initialize_app(cred, {"storageBucket": STORAGE_BUCKET})
+            # Published together, so the unlocked check above never sees half a set
+            _clients.update(db=firestore.client(), bucket=storage.bucket())
+    return _clients[name]
+
+
+def get_db():
+    """Firestore client for database operations"""
+    return _client("db")
+
+
+def get_bucket():
+    """Firebase Storage client for file operations"""
+    return _client("bucket")
+
+
+def warm_up():
+    """
+    Initialize Firebase on a background thread, e.g. while the welcome screen
+    is showing. Failures are left for the first real use to report.
+    """
+    def initialize():
+        try:
+            get_db()
+        except Exception as e:
+            print(f"Firebase warm-up failed: {e}")
+
+    thread = threading.Thread(target=initialize, name="firebase-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def __getattr__(name):
+    # Keeps "from firebase_config import db, bucket" working; the import that
+    # names them is what initializes Firebase, not importing this module
+    if name in ("db", "bucket"):
+        return _client(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
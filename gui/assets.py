@@ -0,0 +1,60 @@
+import os
+import tkinter as tk
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+LOGO = "logo.png"
+LOGO_SUBSAMPLE = 3  # The logo is shown at a third of its size
+ICON_SIZE = 64  # Pixels; about the size of the 48pt glyphs the tiles used to draw
+ICON_COLORS = {"folder": "#4CAF50", "file": "#2196F3"}
+ICON_OVERSAMPLE = 4  # Icons are drawn larger and scaled down for smooth edges
+
+# Shared by every screen for the life of the process. Tk images belong to the
+# interpreter that created them, which is the app's single root window.
+_images = {}  # (file name, subsample) -> PhotoImage
+_icons = {}  # (item type, colour, size) -> PhotoImage
+
+
+def image(name, subsample=1):
+    """An image from assets/, decoded once and shrunk once per factor"""
+    key = (name, subsample)
+    if key not in _images:
+        if subsample == 1:
+            _images[key] = tk.PhotoImage(file=os.path.join(ASSETS_DIR, name))
+        else:
+            _images[key] = image(name).subsample(subsample, subsample)
+    return _images[key]
+
+
+def logo():
+    """The FileHaven logo at the size the screens show it"""
+    return image(LOGO, LOGO_SUBSAMPLE)
+
+
+def icon(item_type, color=None, size=ICON_SIZE):
+    """
+    Folder or file icon, drawn once per type, colour and size and shared by
+    every tile and drag preview that shows it.
+    """
+    color = color or ICON_COLORS[item_type]
+    key = (item_type, color, size)
+    if key not in _icons:
+        from PIL import Image, ImageDraw, ImageTk
+
+        scale = size * ICON_OVERSAMPLE
+        canvas = Image.new("RGBA", (scale, scale), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(canvas)
+        unit = scale / 16
+        if item_type == "folder":
+            # Tab, then the body overlapping it
+            draw.rounded_rectangle((unit, 3 * unit, 7 * unit, 6 * unit), radius=unit, fill=color)
+            draw.rounded_rectangle((unit, 4.5 * unit, 15 * unit, 13.5 * unit), radius=unit, fill=color)
+        else:
+            # Page with a folded corner and a few lines of text
+            draw.polygon([(3 * unit, unit), (10 * unit, unit), (13 * unit, 4 * unit),
+                          (13 * unit, 15 * unit), (3 * unit, 15 * unit)], fill=color)
+            draw.polygon([(10 * unit, unit), (10 * unit, 4 * unit), (13 * unit, 4 * unit)], fill="white")
+            for line in range(3):
+                top = (7 + 2.5 * line) * unit
+                draw.rectangle((5 * unit, top, 11 * unit, top + unit), fill="white")
+        _icons[key] = ImageTk.PhotoImage(canvas.resize((size, size), Image.Resampling.LANCZOS))
+    return _icons[key]
@@ -0,0 +1,214 @@
+import hashlib
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from firebase_admin import firestore
+from .metadata_ops import BatchWriter, get_all
+
+HASH_CHUNK_SIZE = 1024 * 1024
+PIPELINE_THRESHOLD = 16 * 1024 * 1024  # Files above this are read and hashed on separate threads
+
+# Uploads in flight in this process: (username, digest) -> [lock, callers holding or waiting]
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+def hash_file(file_path, chunk_size=HASH_CHUNK_SIZE):
+    """
+    SHA-256 of a file as a hex string, read in chunks.
+
+    One digest cannot be split across cores, so large files are read on a
+    second thread while this one hashes; hashlib releases the GIL on big
+    buffers, which lets disk reads and hashing overlap.
+    """
+    hasher = hashlib.sha256()
+    with open(file_path, 'rb') as file_obj:
+        file_obj.seek(0, 2)
+        size = file_obj.tell()
+        file_obj.seek(0)
+        if size <= PIPELINE_THRESHOLD:
+            for chunk in iter(lambda: file_obj.read(chunk_size), b""):
+                hasher.update(chunk)
+            return hasher.hexdigest()
+
+        chunks = queue.Queue(maxsize=4)
+        failure = []
+
+        def read():
+            try:
+                for chunk in iter(lambda: file_obj.read(chunk_size), b""):
+                    chunks.put(chunk)
+            except Exception as e:
+                failure.append(e)
+            finally:
+                chunks.put(None)
+
+        reader = threading.Thread(target=read, daemon=True)
+        reader.start()
+        for chunk in iter(chunks.get, None):
+            hasher.update(chunk)
+        reader.join()
+    if failure:
+        raise failure[0]
+    return hasher.hexdigest()
+
+
+@contextmanager
+def upload_slot(username, digest):
+    """
+    Serialize stores of the same content. A second caller waits for the first
+    upload to finish and then finds the record, so it only adds a reference.
+    """
+    key = (username, digest)
+    with _in_flight_lock:
+        entry = _in_flight.setdefault(key, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _in_flight_lock:
+            entry[1] -= 1
+            if not entry[1]:
+                del _in_flight[key]
+
+
+def blob_path(username, digest):
+    """Storage path of the content with the given hash"""
+    return f"users/{username}/blobs/{digest}"
+
+
+class BlobStore:
+    """
+    Content-addressed file storage with reference counting.
+
+    Each distinct content is stored once at users/{user}/blobs/{sha256} and
+    described by blobs/{user}/user_blobs/{sha256}, which holds the reference
+    count, the object's generation and the shared thumbnail. File documents
+    carry content_hash; uploading content that is already stored only adds a
+    reference. The object is deleted when the last reference is released,
+    guarded by its generation so a concurrent re-upload is never removed.
+    """
+
+    def __init__(self, db, bucket, username):
+        self.db = db
+        self.bucket = bucket
+        self.username = username
+
+    def refs(self):
+        return self.db.collection("blobs").document(self.username).collection("user_blobs")
+
+    def acquire(self, digest):
+        """Add a reference to stored content; returns its record, or None if it must be uploaded"""
+        transaction = self.db.transaction()
+        ref = self.refs().document(digest)
+
+        @firestore.transactional
+        def add_reference(transaction):
+            doc = ref.get(transaction=transaction)
+            if not doc.exists:
+                return None
+            record = doc.to_dict()
+            record["refcount"] = record.get("refcount", 0) + 1
+            transaction.update(ref, {"refcount": record["refcount"]})
+            return record
+
+        return add_reference(transaction)
+
+    def register(self, digest, size, extra=None):
+        """
+        Record freshly uploaded content and take the first reference. If the
+        same content was registered meanwhile, only a reference is added.
+        """
+        storage_path = blob_path(self.username, digest)
+        blob = self.bucket.get_blob(storage_path)
+        transaction = self.db.transaction()
+        ref = self.refs().document(digest)
+
+        @firestore.transactional
+        def create(transaction):
+            doc = ref.get(transaction=transaction)
+            if doc.exists:
+                record = doc.to_dict()
+                record["refcount"] = record.get("refcount", 0) + 1
+                transaction.update(ref, {"refcount": record["refcount"], "generation": blob.generation})
+                return record
+            record = dict(extra or {})
+            record.update({
+                "storage_path": storage_path,
+                "generation": blob.generation,
+                "size": size,
+                "refcount": 1,
+                "created_at": datetime.now().isoformat()
+            })
+            transaction.set(ref, record)
+            return record
+
+        return create(transaction)
+
+    def store(self, file_path, uploader, digest=None, on_progress=None, metadata=None, extra=None):
+        """
+        Take a reference to a file's content, uploading it only when it is not
+        stored yet. Concurrent stores of the same content in this process
+        upload it once; the others wait and add a reference. extra(digest) may return more fields for a new record, such
+        as a thumbnail. Returns (digest, record, uploaded).
+        """
+        digest = digest or hash_file(file_path)
+        # One upload per content at a time; it shares the object path and the session key
+        with upload_slot(self.username, digest):
+            record = self.acquire(digest)
+            if record is not None:
+                return digest, record, False
+
+            storage_path = blob_path(self.username, digest)
+            size = os.path.getsize(file_path)
+            uploader.upload(self.bucket.blob(storage_path), file_path, storage_path,
+                            on_progress=on_progress, metadata=metadata)
+            fields = extra(digest) if extra else None
+            return digest, self.register(digest, size, fields), True
+
+    def release(self, digest):
+        """Drop one reference; the content is deleted with the last one"""
+        self.release_many({digest: 1})
+
+    def release_many(self, counts):
+        """
+        Drop many references with batched decrements, then delete the
+        contents whose count reached zero. counts maps hash to references.
+        """
+        if not counts:
+            return
+        with BatchWriter(self.db) as writer:
+            for digest, count in counts.items():
+                writer.set(self.refs().document(digest), {"refcount": firestore.Increment(-count)}, merge=True)
+        for doc in get_all(self.db, [self.refs().document(digest) for digest in counts]):
+            if doc.exists and (doc.to_dict() or {}).get("refcount", 0) <= 0:
+                self.collect(doc.id)
+
+    def collect(self, digest):
+        """Delete unreferenced content, re-checking the count in a transaction"""
+        transaction = self.db.transaction()
+        ref = self.refs().document(digest)
+
+        @firestore.transactional
+        def remove(transaction):
+            doc = ref.get(transaction=transaction)
+            if not doc.exists or (doc.to_dict() or {}).get("refcount", 0) > 0:
+                return None
+            transaction.delete(ref)
+            return doc.to_dict()
+
+        record = remove(transaction)
+        if record is None:
+            return
+        for field, generation in (("storage_path", record.get("generation")), ("thumbnail_path", None)):
+            if not record.get(field):
+                continue
+            try:
+                self.bucket.blob(record[field]).delete(if_generation_match=generation)
+            except Exception as e:
+                # Missing, or replaced by a newer upload of the same content
+                if getattr(e, "code", None) not in (404, 412):
+                    raise
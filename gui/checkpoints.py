@@ -0,0 +1,54 @@
+import json
+import os
+import threading
+
+
+class CheckpointStore:
+    """
+    Small JSON file of records by key, for state that has to survive a crash
+    or restart: open upload sessions, interrupted deletes and migrations.
+    Writes go to a temporary file that replaces the old one, so a crash never
+    leaves a half-written file behind.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, records):
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(records, f, indent=2)
+        os.replace(temp_path, self.path)
+
+    def get(self, key):
+        with self.lock:
+            return self._read().get(key)
+
+    def save(self, key, record):
+        with self.lock:
+            records = self._read()
+            records[key] = record
+            self._write(records)
+
+    def remove(self, key):
+        with self.lock:
+            records = self._read()
+            if records.pop(key, None) is not None:
+                self._write(records)
+
+    def pending(self, username):
+        """Return all records belonging to a user"""
+        with self.lock:
+            return {key: record for key, record in self._read().items()
+                    if record.get("username") == username}
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import requests
+
+CACHE_DIR = "data/cache/content"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512MB of downloaded files
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+
+class ContentCache:
+    """
+    Downloaded file contents on disk, keyed by storage path.
+
+    Each entry remembers the ETag and generation the server returned, and
+    later opens send If-None-Match so an unchanged file is answered with a 304
+    and costs no body bytes. Downloads stream to disk in chunks. Least
+    recently used entries are evicted once the cache exceeds max_bytes.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, http=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.http = http or requests.Session()
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index = self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # Drop entries whose file disappeared
+        return {key: entry for key, entry in index.items() if os.path.exists(entry["path"])}
+
+    def _save_index(self):
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f)
+        os.replace(temp_path, self.index_path)
+
+    def _local_path(self, key, file_name):
+        _, ext = os.path.splitext(file_name)
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest + ext.lower())
+
+    def fetch(self, key, url, file_name, on_progress=None):
+        """Return a local path for the file, downloading only if it changed"""
+        with self.lock:
+            entry = self.index.get(key)
+
+        headers = {}
+        if entry and entry.get("etag") and os.path.exists(entry["path"]):
+            headers["If-None-Match"] = entry["etag"]
+
+        with self.http.get(url, headers=headers, stream=True) as response:
+            if response.status_code == 304:
+                with self.lock:
+                    entry["last_used"] = time.time()
+                    self._save_index()
+                if on_progress:
+                    on_progress(entry["size"], entry["size"])
+                return entry["path"]
+            if response.status_code != 200:
+                raise Exception(f"Failed to download file (HTTP {response.status_code})")
+
+            total = int(response.headers.get("Content-Length") or 0)
+            local_path = self._local_path(key, file_name)
+            temp_path = f"{local_path}.{threading.get_ident()}.part"
+            received = 0
+            with open(temp_path, 'wb') as f:
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    received += len(chunk)
+                    if on_progress:
+                        on_progress(received, total or received)
+            os.replace(temp_path, local_path)
+
+            with self.lock:
+                self.index[key] = {
+                    "path": local_path,
+                    "etag": response.headers.get("ETag"),
+                    "generation": response.headers.get("x-goog-generation"),
+                    "size": received,
+                    "last_used": time.time()
+                }
+                self._evict()
+                self._save_index()
+        return local_path
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits (lock held)"""
+        total = sum(entry["size"] for entry in self.index.values())
+        for key, entry in sorted(self.index.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if len(self.index) == 1:
+                break  # Always keep the file that was just opened
+            try:
+                os.remove(entry["path"])
+            except OSError:
+                pass
+            total -= entry["size"]
+            del self.index[key]
+
+
+# Shared cache for every viewer window
+content_cache = ContentCache()
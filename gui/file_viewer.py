@@ -1,14 +1,21 @@
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, filedialog
 import webbrowser
-import tempfile
 import os
-import requests
-from PIL import Image, ImageTk
+from PIL import ImageTk
 import mimetypes
+from .io_executor import io_executor
+from .content_cache import content_cache
+from .text_pager import LineIndex
+from .image_loader import decode_for_viewport, peak_rss_mb
+import threading
+import time
+
+# Text files larger than this are shown through the paged viewer
+PAGED_TEXT_THRESHOLD = 1024 * 1024
 
 class FileViewer:
-    def __init__(self, root, file_url, file_name):
+    def __init__(self, root, file_url, file_name, storage_path=None):
         self.window = tk.Toplevel(root)
         self.window.title(f"Viewing: {file_name}")
         self.window.geometry("800x600")
@@ -22,36 +29,74 @@ class FileViewer:
         
         self.file_url = file_url
         self.file_name = file_name
-        self.temp_dir = tempfile.gettempdir()
+        self.storage_path = storage_path
+        self.download_progress = (0, 0)
         
         # Initialize viewer
         self.init_viewer()
         
     def init_viewer(self):
+        _, ext = os.path.splitext(self.file_name)
+        if ext.lower() in ['.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx']:
+            # Opened in the default system application, no need to download here
+            webbrowser.open(self.file_url)
+            self.window.destroy()
+            return
+
+        # Placeholder while the download runs in the background
+        self.loading_label = tk.Label(self.window, text="Loading...", font=("Helvetica", 12))
+        self.loading_label.pack(expand=True)
+        io_executor.attach(self.window.master)
+        io_executor.submit(
+            "download",
+            self.download_to_cache,
+            on_success=self.display,
+            on_error=self.download_failed
+        )
+        self.show_download_progress()
+
+    def download_to_cache(self):
+        """Fetch the file through the content cache; runs on an I/O worker thread"""
+        def on_progress(received, total):
+            self.download_progress = (received, total)
+
+        return content_cache.fetch(
+            self.storage_path or self.file_url,
+            self.file_url,
+            self.file_name,
+            on_progress=on_progress
+        )
+
+    def show_download_progress(self):
+        """Poll the worker's byte count until the viewer is replaced"""
+        if not self.window.winfo_exists() or not self.loading_label.winfo_exists():
+            return
+        received, total = self.download_progress
+        if total:
+            self.loading_label.config(
+                text=f"Loading... {received * 100 // total}% ({received // 1024} of {total // 1024} KB)"
+            )
+        self.window.after(100, self.show_download_progress)
+
+    def download_failed(self, error):
+        if self.window.winfo_exists():
+            messagebox.showerror("Error", f"Failed to open file: {str(error)}")
+            self.window.destroy()
+
+    def display(self, temp_path):
+        if not self.window.winfo_exists():
+            return  # Viewer was closed while downloading
+        self.loading_label.destroy()
         try:
             # Get file extension
             _, ext = os.path.splitext(self.file_name)
             ext = ext.lower()
             
-            # Download the file
-            response = requests.get(self.file_url)
-            if response.status_code != 200:
-                raise Exception("Failed to download file")
-            
-            # Save to temp file
-            temp_path = os.path.join(self.temp_dir, self.file_name)
-            with open(temp_path, 'wb') as f:
-                f.write(response.content)
-            
             # Handle different file types
             if ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp']:
                 self.show_image(temp_path)
             elif ext in ['.txt', '.py', '.java', '.html', '.css', '.js', '.json', '.xml', '.csv']:
                 self.show_text(temp_path)
-            elif ext in ['.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx']:
-                # For these types, open in default system application
-                webbrowser.open(self.file_url)
-                self.window.destroy()
             else:
                 # For unknown types, offer download
                 self.offer_download(temp_path)
@@ -66,42 +111,97 @@ class FileViewer:
             frame = tk.Frame(self.window)
             frame.pack(expand=True, fill='both')
             
-            # Load and display the image
-            image = Image.open(file_path)
-            
-            # Calculate scaling to fit window while maintaining aspect ratio
-            display_width = 780  # Leaving some padding
-            display_height = 580
-            
-            # Calculate scaling factor
-            width_ratio = display_width / image.width
-            height_ratio = display_height / image.height
-            scale = min(width_ratio, height_ratio)
-            
-            # Resize image
-            new_width = int(image.width * scale)
-            new_height = int(image.height * scale)
-            image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-            
-            photo = ImageTk.PhotoImage(image)
-            
-            # Create canvas for image
-            canvas = tk.Canvas(frame, width=display_width, height=display_height)
-            canvas.pack(expand=True)
-            
-            # Center image on canvas
-            x = (display_width - new_width) // 2
-            y = (display_height - new_height) // 2
-            
-            # Display image
-            canvas.create_image(x, y, anchor='nw', image=photo)
-            canvas.image = photo  # Keep a reference
+            # Leaving some padding
+            self.display_width = 780
+            self.display_height = 560
+            self.image_path = file_path
+            self.zoom = 1.0
+            self.render_generation = 0
+            self.first_pixel_ms = None
+            self.image_started = time.perf_counter()
+
+            # Scrollable canvas so zoomed images can be panned
+            self.image_canvas = tk.Canvas(frame, width=self.display_width, height=self.display_height)
+            x_scroll = tk.Scrollbar(frame, orient=tk.HORIZONTAL, command=self.image_canvas.xview)
+            y_scroll = tk.Scrollbar(frame, orient=tk.VERTICAL, command=self.image_canvas.yview)
+            self.image_canvas.configure(xscrollcommand=x_scroll.set, yscrollcommand=y_scroll.set)
+            y_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+            x_scroll.pack(side=tk.BOTTOM, fill=tk.X)
+            self.image_canvas.pack(expand=True)
+
+            # Zoom controls; higher zoom levels are re-decoded at the needed size
+            controls = tk.Frame(self.window)
+            controls.pack(fill='x')
+            tk.Button(controls, text="−", width=3, command=lambda: self.set_zoom(self.zoom / 1.5)).pack(side=tk.LEFT, padx=5)
+            tk.Button(controls, text="+", width=3, command=lambda: self.set_zoom(self.zoom * 1.5)).pack(side=tk.LEFT)
+            tk.Button(controls, text="Fit", command=lambda: self.set_zoom(1.0)).pack(side=tk.LEFT, padx=5)
+            self.image_status = tk.Label(controls, text="Decoding...", fg="#666")
+            self.image_status.pack(side=tk.RIGHT, padx=10)
+            self.image_canvas.bind("<Control-MouseWheel>",
+                                   lambda e: self.set_zoom(self.zoom * (1.5 if e.delta > 0 else 1 / 1.5)))
+
+            self.render_image()
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to display image: {str(e)}")
             self.window.destroy()
+
+    def set_zoom(self, zoom):
+        zoom = max(1.0, min(zoom, 16.0))
+        if zoom != self.zoom:
+            self.zoom = zoom
+            self.render_image()
+
+    def render_image(self):
+        """Decode just enough pixels for the current zoom on an I/O worker"""
+        self.render_generation += 1
+        generation = self.render_generation
+        width = int(self.display_width * self.zoom)
+        height = int(self.display_height * self.zoom)
+        io_executor.submit(
+            "decode_image",
+            decode_for_viewport,
+            self.image_path,
+            width,
+            height,
+            on_success=lambda result: self.draw_image(generation, *result),
+            on_error=lambda e: self.image_failed(e)
+        )
+
+    def draw_image(self, generation, image, original_size):
+        if generation != self.render_generation or not self.window.winfo_exists():
+            return  # A newer zoom level is on its way, or the viewer was closed
+        photo = ImageTk.PhotoImage(image)
+        
+        # Center image on canvas
+        canvas = self.image_canvas
+        canvas.delete("all")
+        x = max((self.display_width - image.width) // 2, 0)
+        y = max((self.display_height - image.height) // 2, 0)
+        
+        # Display image
+        canvas.create_image(x, y, anchor='nw', image=photo)
+        canvas.configure(scrollregion=(0, 0, max(image.width, self.display_width), max(image.height, self.display_height)))
+        canvas.image = photo  # Keep a reference
+
+        if self.first_pixel_ms is None:
+            self.first_pixel_ms = (time.perf_counter() - self.image_started) * 1000
+        peak = peak_rss_mb()
+        self.image_status.config(
+            text=f"{original_size[0]}×{original_size[1]} shown at {image.width}×{image.height}"
+                 f" · first pixel {self.first_pixel_ms:.0f} ms"
+                 + (f" · peak RSS {peak:.0f} MB" if peak is not None else "")
+        )
+
+    def image_failed(self, error):
+        if self.window.winfo_exists():
+            messagebox.showerror("Error", f"Failed to display image: {str(error)}")
+            self.window.destroy()
             
     def show_text(self, file_path):
+        if os.path.getsize(file_path) > PAGED_TEXT_THRESHOLD:
+            self.show_paged_text(file_path)
+            return
         try:
             # Create text widget
             text_widget = tk.Text(self.window, wrap=tk.WORD, padx=10, pady=10)
@@ -126,6 +226,150 @@ class FileViewer:
             messagebox.showerror("Error", f"Failed to display text: {str(e)}")
             self.window.destroy()
             
+    def show_paged_text(self, file_path):
+        """Show a large text file a screenful at a time from a memory map"""
+        try:
+            self.line_index = LineIndex(file_path)
+            threading.Thread(target=self.line_index.build, daemon=True).start()
+            self.first_line = 0
+            self.visible_lines = 30
+            self.window.bind("<Destroy>", lambda e: e.widget is self.window and self.line_index.close())
+
+            # Toolbar with jump-to-line and search
+            toolbar = tk.Frame(self.window)
+            toolbar.pack(fill='x', padx=10, pady=5)
+
+            tk.Label(toolbar, text="Line:").pack(side=tk.LEFT)
+            self.line_entry = tk.Entry(toolbar, width=10)
+            self.line_entry.pack(side=tk.LEFT, padx=5)
+            self.line_entry.bind("<Return>", lambda e: self.jump_to_line())
+            tk.Button(toolbar, text="Go", command=self.jump_to_line).pack(side=tk.LEFT)
+
+            tk.Label(toolbar, text="Find:").pack(side=tk.LEFT, padx=(15, 0))
+            self.search_entry = tk.Entry(toolbar, width=20)
+            self.search_entry.pack(side=tk.LEFT, padx=5)
+            self.search_entry.bind("<Return>", lambda e: self.find_next())
+            tk.Button(toolbar, text="Find Next", command=self.find_next).pack(side=tk.LEFT)
+
+            self.pager_status = tk.Label(toolbar, text="Indexing...", fg="#666")
+            self.pager_status.pack(side=tk.RIGHT)
+
+            # Text widget holds only the visible lines
+            body = tk.Frame(self.window)
+            body.pack(expand=True, fill='both')
+            self.paged_text = tk.Text(body, wrap=tk.NONE, padx=10, pady=10)
+            self.pager_scrollbar = tk.Scrollbar(body, command=self.on_pager_scroll)
+            self.pager_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+            self.paged_text.pack(expand=True, fill='both')
+
+            self.paged_text.bind("<Configure>", self.on_pager_resize)
+            self.paged_text.bind("<MouseWheel>", lambda e: self.scroll_lines(-3 if e.delta > 0 else 3))
+            self.paged_text.bind("<Button-4>", lambda e: self.scroll_lines(-3))
+            self.paged_text.bind("<Button-5>", lambda e: self.scroll_lines(3))
+
+            self.render_page()
+            self.poll_index()
+
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to display text: {str(e)}")
+            self.window.destroy()
+
+    def render_page(self):
+        """Replace the text widget's contents with the current window of lines"""
+        lines = self.line_index.get_lines(self.first_line, self.visible_lines)
+        self.paged_text.config(state=tk.NORMAL)
+        self.paged_text.delete("1.0", tk.END)
+        self.paged_text.insert(tk.END, "\n".join(lines))
+        self.paged_text.config(state=tk.DISABLED)
+
+        total = max(self.line_index.line_count(), 1)
+        self.pager_scrollbar.set(self.first_line / total,
+                                 min((self.first_line + self.visible_lines) / total, 1.0))
+
+    def poll_index(self):
+        """Refresh status and scrollbar while the index is still growing"""
+        if not self.window.winfo_exists():
+            return
+        count = self.line_index.line_count()
+        if self.line_index.complete:
+            self.pager_status.config(text=f"{count:,} lines")
+        else:
+            percent = self.line_index.indexed_bytes * 100 // max(self.line_index.size, 1)
+            self.pager_status.config(text=f"Indexing... {count:,} lines ({percent}%)")
+            self.window.after(200, self.poll_index)
+        if count < self.first_line + self.visible_lines or self.line_index.complete:
+            self.render_page()
+        else:
+            total = max(count, 1)
+            self.pager_scrollbar.set(self.first_line / total,
+                                     min((self.first_line + self.visible_lines) / total, 1.0))
+
+    def on_pager_resize(self, event):
+        line_height = max(self.paged_text.tk.call("font", "metrics", self.paged_text.cget("font"), "-linespace"), 1)
+        visible = max(int(event.height) // int(line_height), 1)
+        if visible != self.visible_lines:
+            self.visible_lines = visible
+            self.render_page()
+
+    def on_pager_scroll(self, action, amount, unit=None):
+        total = self.line_index.line_count()
+        if action == "moveto":
+            self.show_line(int(float(amount) * total))
+        elif unit == "pages":
+            self.scroll_lines(int(amount) * self.visible_lines)
+        else:
+            self.scroll_lines(int(amount))
+
+    def scroll_lines(self, delta):
+        self.show_line(self.first_line + delta)
+
+    def show_line(self, line):
+        last_start = max(self.line_index.line_count() - self.visible_lines, 0)
+        line = max(0, min(line, last_start))
+        if line != self.first_line:
+            self.first_line = line
+            self.render_page()
+
+    def jump_to_line(self):
+        try:
+            line = int(self.line_entry.get()) - 1
+        except ValueError:
+            return
+        self.show_line(line)
+
+    def find_next(self):
+        """Search from the line after the top of the view without loading the file"""
+        query = self.search_entry.get()
+        if not query:
+            return
+        self.pager_status.config(text="Searching...")
+
+        def found(line):
+            if not self.window.winfo_exists():
+                return
+            if line is None:
+                self.pager_status.config(text=f"'{query}' not found")
+                return
+            self.pager_status.config(text=f"Found on line {line + 1:,}")
+            self.show_line(line)
+            self.highlight_match(query)
+
+        io_executor.submit(
+            "text_search",
+            self.line_index.search,
+            query,
+            self.first_line + 1,
+            on_success=found,
+            on_error=lambda e: self.pager_status.config(text=f"Search failed: {e}")
+        )
+
+    def highlight_match(self, query):
+        self.paged_text.tag_remove("match", "1.0", tk.END)
+        index = self.paged_text.search(query, "1.0", tk.END)
+        if index:
+            self.paged_text.tag_add("match", index, f"{index}+{len(query)}c")
+            self.paged_text.tag_config("match", background="#FFF59D")
+
     def offer_download(self, file_path):
         # Create centered message
         message = tk.Label(
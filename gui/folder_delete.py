@@ -0,0 +1,214 @@
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from .blob_store import BlobStore
+from .checkpoints import CheckpointStore
+from .metadata_ops import BATCH_LIMIT, BatchWriter
+from .storage_ops import delete_blobs
+
+# Local file that remembers folder deletes that have not finished yet
+CHECKPOINTS_PATH = "data/delete_checkpoints.json"
+FOLDER_WORKERS = 4  # Folders of the same depth deleted at once
+BLOB_WORKERS = 4  # Batched storage requests per folder page
+
+
+class DeleteError(Exception):
+    """Raised when part of a folder tree could not be deleted"""
+
+
+def count_documents(collection_ref):
+    """Number of documents in a collection, using a count query when the client supports it"""
+    try:
+        return int(collection_ref.count().get()[0][0].value)
+    except AttributeError:
+        return sum(1 for _ in collection_ref.select([]).stream())
+
+
+def scan_tree(user_folders, folder_name, on_level=None):
+    """
+    Walk a folder and its subfolders breadth-first, one level at a time.
+
+    Returns (levels, file_counts): levels is a list of lists of folder names,
+    starting with [folder_name], and file_counts maps every folder to the
+    number of files directly inside it. on_level(levels, file_counts) is
+    called after each level.
+    """
+    levels = []
+    file_counts = {}
+    seen = {folder_name}
+    level = [folder_name]
+
+    def visit(name):
+        container = user_folders.document(name)
+        files = count_documents(container.collection("files"))
+        children = [doc.id for doc in container.collection("subfolders").select([]).stream()]
+        return files, children
+
+    with ThreadPoolExecutor(max_workers=FOLDER_WORKERS) as pool:
+        while level:
+            levels.append(level)
+            next_level = []
+            for name, (files, children) in zip(level, pool.map(visit, level)):
+                file_counts[name] = files
+                for child in children:
+                    if child not in seen:
+                        seen.add(child)
+                        next_level.append(child)
+            level = next_level
+            if on_level:
+                on_level(levels, file_counts)
+    return levels, file_counts
+
+
+class FolderDeleter:
+    """
+    Delete a folder together with everything below it.
+
+    A folder's contents live under folders/{user}/user_folders/{name}, in the
+    files and subfolders subcollections. The tree is first walked breadth-first
+    to list the folders and count the files, then deleted level by level from
+    the deepest one up: blobs are removed with parallel batched requests and
+    documents in batches of 500. The walk and every finished folder are saved
+    to a checkpoint, so an interrupted delete resumes where it stopped.
+
+    on_progress(done, total, status) is called from worker threads.
+    """
+
+    def __init__(self, db, bucket, username, checkpoints=None, on_progress=None):
+        self.db = db
+        self.bucket = bucket
+        self.username = username
+        self.checkpoints = checkpoints or CheckpointStore(CHECKPOINTS_PATH)
+        self.on_progress = on_progress
+        self.lock = threading.Lock()
+
+    def user_folders(self):
+        return self.db.collection("folders").document(self.username).collection("user_folders")
+
+    def checkpoint_key(self, folder_name):
+        return f"{self.username}/{folder_name}"
+
+    def pending(self):
+        """Folder names whose delete was interrupted"""
+        return [record["folder"] for record in self.checkpoints.pending(self.username).values()]
+
+    def scan(self, folder_name):
+        """Walk the tree breadth-first; returns (levels of folder names, file count)"""
+        def on_level(levels, file_counts):
+            self.report(0, sum(file_counts.values()),
+                        f"Found {len(file_counts)} folder(s), {sum(file_counts.values())} file(s)...")
+
+        levels, file_counts = scan_tree(self.user_folders(), folder_name, on_level)
+        return levels, sum(file_counts.values())
+
+    def run(self, folder_name, entry_path=None):
+        """
+        Delete folder_name and its subtree; entry_path is the document that lists
+        it in its parent folder when that is not the top-level folder document.
+        Returns the number of files deleted.
+        """
+        key = self.checkpoint_key(folder_name)
+        checkpoint = self.checkpoints.get(key)
+        if checkpoint is None:
+            levels, total_files = self.scan(folder_name)
+            checkpoint = {
+                "username": self.username,
+                "folder": folder_name,
+                "entry_path": entry_path,
+                "levels": levels,
+                "total": total_files + sum(map(len, levels)),
+                "done": 0,
+                "finished": []
+            }
+            self.checkpoints.save(key, checkpoint)
+
+        self.checkpoint = checkpoint
+        finished = set(checkpoint["finished"])
+        self.report(checkpoint["done"], checkpoint["total"], "Deleting...")
+
+        # Children go before their parents so an interrupted delete never leaves
+        # a folder whose listing is gone but whose contents are not
+        with ThreadPoolExecutor(max_workers=FOLDER_WORKERS) as pool:
+            for level in reversed(checkpoint["levels"]):
+                names = [name for name in level if name not in finished]
+                errors = {}
+                for name, failed in zip(names, pool.map(self.delete_folder, names)):
+                    if failed:
+                        errors.update(failed)
+                if errors:
+                    self.checkpoints.save(key, checkpoint)
+                    raise DeleteError(f"{len(errors)} item(s) could not be deleted, first: "
+                                      f"{next(iter(errors))}: {next(iter(errors.values()))}")
+
+        if checkpoint.get("entry_path"):
+            self.db.document(checkpoint["entry_path"]).delete()
+        self.checkpoints.remove(key)
+        self.report(checkpoint["total"], checkpoint["total"], "Delete complete!")
+        return checkpoint["total"] - sum(map(len, checkpoint["levels"]))
+
+    def delete_folder(self, name):
+        """Delete one folder's files, subfolder entries and document; returns failures"""
+        container = self.user_folders().document(name)
+        errors = {}
+
+        # Files, one page at a time; the cursor skips files whose blobs failed
+        files_ref = container.collection("files")
+        cursor = None
+        while True:
+            query = files_ref.select(["storage_path", "thumbnail_path", "content_hash"]).order_by("__name__").limit(BATCH_LIMIT)
+            if cursor is not None:
+                query = query.start_after(cursor)
+            docs = list(query.stream())
+            if not docs:
+                break
+            cursor = docs[-1]
+
+            blobs = {}
+            hashes = Counter()
+            for doc in docs:
+                data = doc.to_dict() or {}
+                if data.get("content_hash"):
+                    # Shared content is released after the documents are gone
+                    hashes[data["content_hash"]] += 1
+                    continue
+                for field in ("storage_path", "thumbnail_path"):
+                    if data.get(field):
+                        blobs[data[field]] = doc.id
+            failed = delete_blobs(self.bucket, list(blobs), max_workers=BLOB_WORKERS)
+            failed_docs = {blobs[path] for path in failed}
+            for path, error in failed.items():
+                errors[path] = error
+
+            with BatchWriter(self.db) as writer:
+                for doc in docs:
+                    if doc.id not in failed_docs:
+                        writer.delete(doc.reference)
+            BlobStore(self.db, self.bucket, self.username).release_many(hashes)
+            self.advance(len(docs) - len(failed_docs))
+            if len(docs) < BATCH_LIMIT:
+                break
+
+        if errors:
+            return errors
+
+        # Subfolders were deleted in an earlier level; drop their entries
+        with BatchWriter(self.db) as writer:
+            for doc in container.collection("subfolders").select([]).stream():
+                writer.delete(doc.reference)
+            writer.delete(container)
+
+        with self.lock:
+            self.checkpoint["finished"].append(name)
+            self.checkpoints.save(self.checkpoint_key(self.checkpoint["folder"]), self.checkpoint)
+        self.advance(1)
+        return errors
+
+    def advance(self, count):
+        with self.lock:
+            self.checkpoint["done"] += count
+            done = self.checkpoint["done"]
+        self.report(done, self.checkpoint["total"], f"Deleted {done} of {self.checkpoint['total']} items...")
+
+    def report(self, done, total, status):
+        if self.on_progress:
+            self.on_progress(done, total, status)
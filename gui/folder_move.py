@@ -0,0 +1,203 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .folder_delete import FOLDER_WORKERS, scan_tree
+from .metadata_ops import BATCH_LIMIT, BatchWriter, move_document, move_documents
+
+
+class MoveError(Exception):
+    """Raised when a folder cannot be renamed or moved"""
+
+
+def rebase_path(data, old_path, new_path):
+    """Fields to change on a file whose folder path starts with old_path"""
+    path = data.get("path")
+    if not isinstance(path, list) or path[:len(old_path)] != old_path:
+        return {}
+    path = new_path + path[len(old_path):]
+    return {"path": path, "parent_folder": path[-1]}
+
+
+class FolderPlan:
+    """What a folder rename or move will touch; built without writing anything"""
+
+    def __init__(self, name, new_name, old_path, new_path, source_entry, target_entry, levels, file_counts):
+        self.name = name
+        self.new_name = new_name
+        self.old_path = old_path
+        self.new_path = new_path
+        self.source_entry = source_entry
+        self.target_entry = target_entry
+        self.levels = levels
+        self.file_counts = file_counts
+        self.subfolders = len(levels[1]) if len(levels) > 1 else 0
+
+    @property
+    def renames(self):
+        return self.name != self.new_name
+
+    @property
+    def copied_documents(self):
+        """Documents that are copied to a new location and deleted from the old one"""
+        copied = 1
+        if self.renames:
+            copied += self.file_counts[self.name] + self.subfolders
+        return copied
+
+    @property
+    def descendant_files(self):
+        """Files below the folder whose stored path may need to change"""
+        files = sum(self.file_counts.values())
+        return files - self.file_counts[self.name] if self.renames else files
+
+    def estimate(self):
+        """Dry-run summary: folders, documents and an upper bound on reads, writes and commits"""
+        copied = self.copied_documents
+        writes = 2 * copied + self.descendant_files
+        return {
+            "folders": sum(map(len, self.levels)),
+            "files": sum(self.file_counts.values()),
+            "copied_documents": copied,
+            "reads": 2 * copied + self.descendant_files,
+            "writes": writes,
+            "commits": -(-writes // BATCH_LIMIT) + 1
+        }
+
+
+class FolderMover:
+    """
+    Rename a folder or move it into another folder, carrying its contents.
+
+    Firestore has no subtree rename, so a renamed folder's files and subfolder
+    entries are listed a page at a time and moved with move_documents (batched
+    get_all reads, and 500-write batches that keep each copy and delete
+    together) on a bounded pool of workers. Subfolders keep their own
+    containers, which are keyed by name, so only the stored paths of the files
+    below are rewritten. plan() does the reads only, for a dry run.
+
+    on_progress(done, total, status) is called from worker threads.
+    """
+
+    def __init__(self, db, username, on_progress=None, max_workers=FOLDER_WORKERS):
+        self.db = db
+        self.username = username
+        self.on_progress = on_progress
+        self.max_workers = max_workers
+        self.lock = threading.Lock()
+        self.done = 0
+        self.total = 0
+
+    def user_folders(self):
+        return self.db.collection("folders").document(self.username).collection("user_folders")
+
+    def entry_ref(self, parent, name):
+        """Document that lists a folder inside its parent; top-level folders are their own entry"""
+        if parent is None:
+            return self.user_folders().document(name)
+        return self.user_folders().document(parent).collection("subfolders").document(name)
+
+    def name_in_use(self, name):
+        """Folder names are global, so any document under the name means it is taken"""
+        container = self.user_folders().document(name)
+        if container.get().exists:
+            return True
+        return any(list(container.collection(sub).select([]).limit(1).stream())
+                   for sub in ("files", "subfolders"))
+
+    def plan(self, name, folder_path, new_name=None, target_folder=None):
+        """
+        Plan renaming folder name inside folder_path to new_name, or moving it
+        into target_folder, a folder that is also inside folder_path.
+        """
+        new_name = new_name or name
+        parent = folder_path[-1] if folder_path else None
+        new_parent = target_folder if target_folder is not None else parent
+
+        if new_name == name and new_parent == parent:
+            raise MoveError(f"'{name}' is already in that folder!")
+        if new_name != name and self.name_in_use(new_name):
+            raise MoveError(f"A folder named '{new_name}' already exists!")
+
+        levels, file_counts = scan_tree(self.user_folders(), name)
+        if new_parent in file_counts:
+            raise MoveError(f"Cannot move '{name}' into itself!")
+
+        target_entry = self.entry_ref(new_parent, new_name)
+        if new_parent != parent and target_entry.get().exists:
+            raise MoveError(f"'{target_folder}' already contains a folder named '{new_name}'!")
+
+        new_path = list(folder_path) + ([target_folder] if target_folder is not None else []) + [new_name]
+        return FolderPlan(name, new_name, list(folder_path) + [name], new_path,
+                          self.entry_ref(parent, name), target_entry, levels, file_counts)
+
+    def run(self, plan):
+        """Carry out a plan; returns the number of items processed"""
+        self.done = 0
+        estimate = plan.estimate()
+        self.total = estimate["copied_documents"] + estimate["files"]
+        rebase = lambda data: rebase_path(data, plan.old_path, plan.new_path)
+
+        errors = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            if plan.renames:
+                # Copy the renamed container's contents, then drop the empty original
+                source = self.user_folders().document(plan.name)
+                target = self.user_folders().document(plan.new_name)
+                for sub, updates in (("files", rebase), ("subfolders", None)):
+                    chunks = [[(ref, target.collection(sub).document(ref.id)) for ref in page]
+                              for page in self.pages(source.collection(sub))]
+                    for _, failed in pool.map(lambda chunk, updates=updates: self.move_chunk(chunk, updates), chunks):
+                        errors.update(failed)
+                if errors:
+                    raise MoveError(f"{len(errors)} item(s) could not be moved, first: "
+                                    f"{next(iter(errors))}: {next(iter(errors.values()))}")
+
+            # Rewrite stored paths below the folder; subfolder containers stay put
+            descendants = [name for level in plan.levels[1:] for name in level]
+            if not plan.renames:
+                descendants.insert(0, plan.name)
+            list(pool.map(lambda name: self.rebase_files(name, plan), descendants))
+
+        # Swap the folder's own entry last so it never shows up half moved
+        move_document(self.db, plan.source_entry, plan.target_entry)
+        self.advance(1)
+        return self.done
+
+    def pages(self, collection_ref):
+        """Document references of a collection, BATCH_LIMIT at a time"""
+        cursor = None
+        while True:
+            query = collection_ref.select([]).order_by("__name__").limit(BATCH_LIMIT)
+            if cursor is not None:
+                query = query.start_after(cursor)
+            docs = list(query.stream())
+            if docs:
+                yield [doc.reference for doc in docs]
+            if len(docs) < BATCH_LIMIT:
+                return
+            cursor = docs[-1]
+
+    def move_chunk(self, chunk, updates):
+        moved, failed = move_documents(self.db, chunk, updates)
+        self.advance(len(chunk))
+        return moved, failed
+
+    def rebase_files(self, name, plan):
+        """Update the path of files in one descendant folder that still point at the old path"""
+        files_ref = self.user_folders().document(name).collection("files")
+        docs = list(files_ref.where("path", "array_contains", plan.name).stream())
+        updated = 0
+        with BatchWriter(self.db) as writer:
+            for doc in docs:
+                changes = rebase_path(doc.to_dict() or {}, plan.old_path, plan.new_path)
+                if changes:
+                    writer.update(doc.reference, changes)
+                    updated += 1
+        self.advance(plan.file_counts.get(name, 0))
+        return updated
+
+    def advance(self, count):
+        with self.lock:
+            self.done = min(self.done + count, self.total)
+            done = self.done
+        if self.on_progress:
+            self.on_progress(done, self.total, f"Updated {done} of {self.total} items...")
@@ -0,0 +1,57 @@
+import sys
+from PIL import Image
+
+
+def decode_for_viewport(path, max_width, max_height):
+    """
+    Decode an image only as large as needed to fill max_width x max_height.
+
+    For JPEGs draft() makes the decoder scale by 1/2, 1/4 or 1/8 during DCT
+    decoding, so a 60MP photo is never expanded to full size. Other formats go
+    through thumbnail() with a reducing gap, which uses a fast integer reduce()
+    before the final resample. Returns (image, original_size).
+    """
+    image = Image.open(path)
+    original_size = image.size
+    image.draft("RGB", (max_width, max_height))
+    image.thumbnail((max_width, max_height), Image.Resampling.LANCZOS, reducing_gap=2.0)
+    if image.mode not in ("RGB", "RGBA", "L", "P"):
+        image = image.convert("RGBA")
+    return image, original_size
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB, or None if unavailable"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize / (1024 * 1024)
+    except Exception:
+        pass
+    return None
@@ -0,0 +1,132 @@
+import bisect
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Histogram bucket upper bounds in milliseconds
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+DISPATCH_INTERVAL = 16  # ms, roughly one frame at 60 fps
+
+
+class LatencyHistogram:
+    """Bucketed latency counts for one operation type"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, elapsed_ms, failed=False):
+        self.counts[bisect.bisect_left(BUCKETS_MS, elapsed_ms)] += 1
+        self.count += 1
+        self.errors += 1 if failed else 0
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of samples"""
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count:
+                return BUCKETS_MS[index] if index < len(BUCKETS_MS) else self.max_ms
+        return 0.0
+
+    def summary(self):
+        mean = self.total_ms / self.count if self.count else 0.0
+        return (f"n={self.count} err={self.errors} mean={mean:.0f}ms "
+                f"p50<={self.percentile(0.5):.0f}ms p95<={self.percentile(0.95):.0f}ms "
+                f"max={self.max_ms:.0f}ms")
+
+
+class IOExecutor:
+    """
+    Run blocking Firestore/Storage calls on worker threads.
+
+    Results come back to Tk through a single after() loop on the attached root,
+    so callbacks always run on the UI thread and never while a request is in
+    flight. Every call is timed into a per-operation latency histogram.
+    """
+
+    def __init__(self, max_workers=8):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="io")
+        self.completions = queue.Queue()
+        self.histograms = {}
+        self.lock = threading.Lock()
+        self.root = None
+
+    def attach(self, root):
+        """Deliver callbacks on this root's event loop"""
+        if root is self.root:
+            return
+        self.root = root
+        root.after(DISPATCH_INTERVAL, lambda: self._dispatch(root))
+
+    def submit(self, op, fn, *args, on_success=None, on_error=None, **kwargs):
+        """
+        Run fn(*args, **kwargs) in the pool under the operation name op.
+
+        on_success(result) or on_error(exception) is invoked on the Tk thread.
+        """
+        def run():
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+                failed = False
+            except Exception as e:
+                result = e
+                failed = True
+            self._record(op, (time.perf_counter() - start) * 1000, failed)
+
+            callback = on_error if failed else on_success
+            if callback:
+                self.completions.put((callback, result))
+            elif failed:
+                print(f"Background {op} failed: {result}")
+            return result
+
+        return self.pool.submit(run)
+
+    def post(self, callback, *args):
+        """Run callback(*args) on the Tk thread; safe to call from any thread"""
+        self.completions.put((lambda _: callback(*args), None))
+
+    def _record(self, op, elapsed_ms, failed):
+        with self.lock:
+            histogram = self.histograms.setdefault(op, LatencyHistogram())
+            histogram.record(elapsed_ms, failed)
+
+    def _dispatch(self, root):
+        if root is not self.root:
+            return  # Superseded by a newer root
+        while True:
+            try:
+                callback, result = self.completions.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(result)
+            except Exception as e:
+                print(f"Error in I/O callback: {e}")
+            if root is not self.root:
+                return
+        try:
+            root.after(DISPATCH_INTERVAL, lambda: self._dispatch(root))
+        except Exception:
+            # Root was destroyed; the next attach() restarts dispatching
+            if self.root is root:
+                self.root = None
+
+    def report(self):
+        """Latency summary per operation type"""
+        with self.lock:
+            return "\n".join(f"{op}: {histogram.summary()}"
+                             for op, histogram in sorted(self.histograms.items()))
+
+
+# Shared executor for the whole app
+io_executor = IOExecutor()
@@ -0,0 +1,267 @@
+import hashlib
+from collections import Counter
+from .blob_store import BlobStore
+from .metadata_ops import BATCH_LIMIT, BatchWriter
+from .storage_ops import delete_blobs
+
+ROOT_ID = "root"  # parent_id of items at the top level
+SCHEMA_FIELD = "metadata_schema"  # Field on users/{user} naming the schema in use
+FLAT_SCHEMA = "flat"
+
+
+class ItemStoreError(Exception):
+    """Raised for a missing item or a name that is already taken"""
+
+
+def path_key(folder_path):
+    """Path string of a folder, "/" for the top level"""
+    return "/" + "/".join(folder_path)
+
+
+def item_path(folder_path, name):
+    """Path string of an item inside a folder"""
+    return path_key(list(folder_path) + [name])
+
+
+def item_id(item_type, path):
+    """Stable document id for a migrated item, so migrating twice writes the same documents"""
+    return hashlib.sha1(f"{item_type}:{path}".encode("utf-8")).hexdigest()[:20]
+
+
+def prefix_end(prefix):
+    """
+    Smallest string above every string that starts with prefix. Firestore
+    compares strings by UTF-8 bytes, which orders them by code point, so this
+    is the prefix with its last character incremented.
+    """
+    next_char = ord(prefix[-1]) + 1
+    if 0xD800 <= next_char <= 0xDFFF:
+        next_char = 0xE000  # Surrogates cannot be stored
+    return prefix[:-1] + chr(next_char)
+
+
+def prefix_query(query, field, prefix):
+    """Documents whose field starts with prefix"""
+    if not prefix:
+        return query
+    return query.where(field, ">=", prefix).where(field, "<", prefix_end(prefix))
+
+
+def subtree_query(items_ref, path):
+    """Every item below the folder at path: a single range query on the indexed path field"""
+    # Everything from "path/" up to "path0", "0" being the character after "/"
+    return prefix_query(items_ref, "path", path + "/")
+
+
+class ItemStore:
+    """
+    Flat metadata schema: one items/{user}/user_items collection for the whole tree.
+
+    Every file and folder is a document with name, type, parent_id (the parent
+    folder's document id, or "root"), path (the full "/a/b/name" string) and
+    depth (0 at the top level). A folder listing is one query on parent_id and
+    type, a subtree is one range query on path, and moving or renaming a
+    folder rewrites the paths of its subtree in batched updates. Folders are
+    identified by their full path, so equal names at different depths never
+    collide. The composite indexes are in firestore.indexes.json.
+    """
+
+    def __init__(self, db, username):
+        self.db = db
+        self.username = username
+        self.folder_ids = {}  # path string -> folder document id
+
+    def items_ref(self):
+        return self.db.collection("items").document(self.username).collection("user_items")
+
+    def find(self, path, item_type):
+        """Document snapshot of the item at path, or None"""
+        query = self.items_ref().where("path", "==", path).where("type", "==", item_type).limit(1)
+        docs = list(query.stream())
+        return docs[0] if docs else None
+
+    def folder_id(self, folder_path):
+        """Document id of a folder, looked up once per path"""
+        if not folder_path:
+            return ROOT_ID
+        key = path_key(folder_path)
+        if key not in self.folder_ids:
+            doc = self.find(key, "folder")
+            if doc is None:
+                raise ItemStoreError(f"Folder '{key}' does not exist!")
+            self.folder_ids[key] = doc.id
+        return self.folder_ids[key]
+
+    def knows(self, folder_path):
+        """Whether the folder's id is already cached, so listing it needs no lookup"""
+        return not folder_path or path_key(folder_path) in self.folder_ids
+
+    def children(self, folder_path, item_type):
+        """Query for the folders or files directly inside a folder"""
+        return self.items_ref().where("parent_id", "==", self.folder_id(folder_path)).where("type", "==", item_type)
+
+    def names(self, folder_path, item_type="file"):
+        """Names of the items of one type inside a folder"""
+        return {(doc.to_dict() or {}).get("name")
+                for doc in self.children(folder_path, item_type).select(["name"]).stream()}
+
+    def subtree(self, folder_path):
+        """Query for everything below a folder"""
+        return subtree_query(self.items_ref(), path_key(folder_path))
+
+    def search(self, text, limit=50):
+        """Items anywhere in the tree whose name starts with text"""
+        query = prefix_query(self.items_ref(), "name", text)
+        return list(query.order_by("name").limit(limit).stream())
+
+    def file_ref(self, folder_path, name):
+        """Reference of the file document, or None if there is no such file"""
+        doc = self.find(item_path(folder_path, name), "file")
+        return doc.reference if doc is not None else None
+
+    def entry(self, folder_path, name, item_type):
+        """Fields that place an item at folder_path/name"""
+        return {
+            "name": name,
+            "type": item_type,
+            "parent_id": self.folder_id(folder_path),
+            "path": item_path(folder_path, name),
+            "depth": len(folder_path)
+        }
+
+    def create_folder(self, folder_path, name, data=None):
+        if self.find(item_path(folder_path, name), "folder") is not None:
+            raise ItemStoreError(f"Folder '{name}' already exists!")
+        fields = dict(data or {})
+        fields.update(self.entry(folder_path, name, "folder"))
+        ref = self.items_ref().document()
+        ref.set(fields)
+        return ref
+
+    def put_file(self, folder_path, name, data):
+        """Create or replace the file document at folder_path/name"""
+        ref = self.file_ref(folder_path, name) or self.items_ref().document()
+        fields = dict(data)
+        fields.update(self.entry(folder_path, name, "file"))
+        ref.set(fields)
+        return ref
+
+    def rename_file(self, folder_path, name, new_name, updates=None):
+        """Rename a file in place; its document id does not change"""
+        if self.file_ref(folder_path, new_name) is not None:
+            raise ItemStoreError(f"File '{new_name}' already exists!")
+        ref = self.file_ref(folder_path, name)
+        if ref is None:
+            raise ItemStoreError(f"File '{name}' does not exist!")
+        fields = dict(updates or {})
+        fields.update(name=new_name, path=item_path(folder_path, new_name))
+        ref.update(fields)
+
+    def move_files(self, folder_path, names, target_path, on_progress=None):
+        """Move files into another folder with one batched update; returns (moved, errors)"""
+        docs = {(doc.to_dict() or {}).get("name"): doc for doc in self.children(folder_path, "file").stream()}
+        taken = self.names(target_path)
+        errors = {}
+        moved = 0
+        with BatchWriter(self.db) as writer:
+            for done, name in enumerate(names, 1):
+                if name not in docs:
+                    errors[name] = "does not exist"
+                elif name in taken:
+                    errors[name] = "a file with the same name already exists in the target folder"
+                else:
+                    writer.update(docs[name].reference, self.entry(target_path, name, "file"))
+                    moved += 1
+                if on_progress:
+                    on_progress(done, len(names))
+        return moved, errors
+
+    def move_folder(self, folder_path, name, target_path=None, new_name=None, on_progress=None):
+        """
+        Rename a folder or move it under target_path. The folder keeps its id,
+        so only path and depth change below it. Returns the documents updated.
+        """
+        target_path = list(folder_path) if target_path is None else list(target_path)
+        new_name = new_name or name
+        old_key = item_path(folder_path, name)
+        new_key = item_path(target_path, new_name)
+        if new_key == old_key:
+            raise ItemStoreError(f"'{name}' is already there!")
+        if new_key.startswith(old_key + "/"):
+            raise ItemStoreError(f"Cannot move '{name}' into itself!")
+        if self.find(new_key, "folder") is not None:
+            raise ItemStoreError(f"A folder named '{new_name}' already exists there!")
+        folder = self.find(old_key, "folder")
+        if folder is None:
+            raise ItemStoreError(f"Folder '{name}' does not exist!")
+
+        docs = list(subtree_query(self.items_ref(), old_key).stream())
+        depth_change = len(target_path) - len(folder_path)
+        updated = 0
+        with BatchWriter(self.db) as writer:
+            writer.update(folder.reference, self.entry(target_path, new_name, "folder"))
+            for doc in docs:
+                data = doc.to_dict() or {}
+                writer.update(doc.reference, {
+                    "path": new_key + data["path"][len(old_key):],
+                    "depth": data.get("depth", 0) + depth_change
+                })
+                updated += 1
+                if on_progress and updated % BATCH_LIMIT == 0:
+                    on_progress(updated, len(docs))
+        if on_progress:
+            on_progress(len(docs), len(docs))
+
+        # Cached ids under the old path are stale now
+        self.folder_ids = {key: value for key, value in self.folder_ids.items()
+                           if key != old_key and not key.startswith(old_key + "/")}
+        return updated + 1
+
+    def delete_folder(self, folder_path, name, bucket=None):
+        """
+        Delete a folder and its subtree with one range query and batched
+        deletes. With a bucket the files' blobs are deleted first, and files
+        whose blobs could not be deleted are kept so a retry can find them;
+        references to shared content are released once the documents are gone.
+        Returns the number of files deleted.
+        """
+        key = item_path(folder_path, name)
+        folder = self.find(key, "folder")
+        if folder is None:
+            raise ItemStoreError(f"Folder '{name}' does not exist!")
+        docs = list(subtree_query(self.items_ref(), key).stream())
+
+        blobs = {}
+        hashes = Counter()
+        failed = {}
+        if bucket is not None:
+            for doc in docs:
+                data = doc.to_dict() or {}
+                if data.get("content_hash"):
+                    hashes[data["content_hash"]] += 1
+                    continue
+                for field in ("storage_path", "thumbnail_path"):
+                    if data.get(field):
+                        blobs[data[field]] = doc.id
+            failed = delete_blobs(bucket, list(blobs))
+        kept = {blobs[path] for path in failed}
+
+        deleted = 0
+        with BatchWriter(self.db) as writer:
+            for doc in docs:
+                is_file = (doc.to_dict() or {}).get("type") == "file"
+                # Keep the folders too while any file below them is kept
+                if doc.id in kept or (kept and not is_file):
+                    continue
+                writer.delete(doc.reference)
+                deleted += is_file
+            if not kept:
+                writer.delete(folder.reference)
+        if bucket is not None:
+            BlobStore(self.db, bucket, self.username).release_many(hashes)
+        self.folder_ids = {k: v for k, v in self.folder_ids.items()
+                           if k != key and not k.startswith(key + "/")}
+        if failed:
+            raise ItemStoreError(f"{len(failed)} file(s) could not be deleted, first: "
+                                 f"{next(iter(failed))}: {next(iter(failed.values()))}")
+        return deleted
@@ -0,0 +1,76 @@
+PAGE_SIZE = 100  # Documents fetched per Firestore query
+
+
+def listing_item(doc, item_type):
+    """Grid entry for a Firestore document"""
+    data = doc.to_dict() or {}
+    # Flat schema documents have opaque ids and carry their name as a field
+    item = {"name": data.get("name") or doc.id, "type": item_type}
+    if data.get("thumbnail_url"):
+        item["thumbnail_url"] = data["thumbnail_url"]
+    return item
+
+
+class FolderPager:
+    """
+    Read a folder's subfolders and then its files one page at a time.
+
+    Each page is a query ordered by document id (or by order_field) that
+    starts after the last document of the previous page, so pages can be
+    fetched lazily as the user scrolls instead of streaming whole collections
+    up front. The refs may be collections or queries. next_page() does network
+    I/O and is meant to run on a worker thread.
+    """
+
+    def __init__(self, folder_path, folders_ref, files_ref, page_size=PAGE_SIZE, order_field="__name__"):
+        self.folder_path = folder_path
+        self.sources = [("folder", folders_ref), ("file", files_ref)]
+        self.page_size = page_size
+        self.order_field = order_field
+        self.cursor = None  # Last document snapshot of the current source
+        self.items = []
+        self.done = False
+        self.loading = False
+        self.failed = False
+
+    def next_page(self):
+        """Fetch the next page and append it to items; returns the new items"""
+        while self.sources and not self.done:
+            item_type, ref = self.sources[0]
+            query = ref.order_by(self.order_field).limit(self.page_size)
+            if self.cursor is not None:
+                query = query.start_after(self.cursor)
+            docs = list(query.stream())
+
+            page = [listing_item(doc, item_type) for doc in docs]
+            self.items.extend(page)
+            if len(docs) < self.page_size:
+                # This collection is exhausted; move on to the next one
+                self.sources.pop(0)
+                self.cursor = None
+                self.done = not self.sources
+            else:
+                self.cursor = docs[-1]
+            if page:
+                return page
+        return []
+
+    def merge_with(self, cached_items):
+        """
+        Fetched items followed by the cached items that sort after the cursor.
+
+        Keeps a previously cached listing on screen while its head is being
+        revalidated page by page.
+        """
+        if self.done or not self.sources:
+            return list(self.items)
+        current_type = self.sources[0][0]
+        last_name = listing_item(self.cursor, current_type)["name"] if self.cursor is not None else None
+        tail = []
+        for item in cached_items:
+            if item["type"] == current_type:
+                if last_name is None or item["name"] > last_name:
+                    tail.append(item)
+            elif current_type == "folder":
+                tail.append(item)
+        return self.items + tail
@@ -1,6 +1,9 @@
 import tkinter as tk
-from tkinter import PhotoImage, messagebox
-from firebase_config import db
+from tkinter import messagebox
+from firebase_config import get_db
+from gui.assets import logo
+from gui.screens import create_root, show_screen
+from gui.io_executor import io_executor
 
 def login_screen(root):
     """Display the login screen."""
@@ -14,9 +17,7 @@ def login_screen(root):
             messagebox.showerror("Error", "All fields are required!")
             return
 
-        try:
-            # Retrieve user data from Firestore
-            user_doc = db.collection("users").document(username).get()
+        def check_credentials(user_doc):
             if not user_doc.exists:
                 messagebox.showerror("Error", "User does not exist. Please register first!")
                 return
@@ -30,53 +31,40 @@ def login_screen(root):
             # Login successful
             messagebox.showinfo("Success", "Login successful! Redirecting to dashboard.")
 
-            # Switch to main dashboard using the same window
-            from gui.main_dashboard import main_dashboard
-            main_dashboard(root, username)
-
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+            try:
+                # Switch to main dashboard using the same window
+                from gui.main_dashboard import main_dashboard
+                from gui.item_store import FLAT_SCHEMA, SCHEMA_FIELD
+                flat_schema = user_doc.to_dict().get(SCHEMA_FIELD) == FLAT_SCHEMA
+                main_dashboard(root, username, flat_schema=flat_schema)
+            except Exception as e:
+                messagebox.showerror("Error", f"An error occurred: {str(e)}")
+
+        # Retrieve user data from Firestore without blocking the window
+        io_executor.attach(root)
+        io_executor.submit(
+            "login",
+            lambda: get_db().collection("users").document(username).get(),
+            on_success=check_credentials,
+            on_error=lambda e: messagebox.showerror("Error", f"An error occurred: {str(e)}")
+        )
 
     def forgot_password():
         """Redirect to the password reset page."""
-        clear_screen()
         from gui.reset_password import reset_password_screen
         reset_password_screen(root)
 
     def go_to_register():
         """Redirect to the Register page."""
-        clear_screen()
         from gui.register import register_screen
         register_screen(root)
 
-    def clear_screen():
-        """Clear all widgets from the current screen."""
-        for widget in root.winfo_children():
-            widget.destroy()
-
-    # Initialize the main window if not provided
-    if root is None:
-        root = tk.Tk()
-        root.title("Login - FileHaven")
-        root.geometry("600x500")
-        root.configure(bg="#E3F2FD")
-
-        # Center the window
-        screen_width = root.winfo_screenwidth()
-        screen_height = root.winfo_screenheight()
-        x = int((screen_width / 2) - (600 / 2))
-        y = int((screen_height / 2) - (500 / 2))
-        root.geometry(f"600x500+{x}+{y}")
-
     # Main Frame
-    frame = tk.Frame(root, bg="#E3F2FD")
-    frame.pack(expand=True, fill="both")
+    frame = show_screen(root, "Login - FileHaven", 600, 500)
 
     # Add logo
     try:
-        logo_image = PhotoImage(file="assets/logo.png")  # Path to your logo file
-        logo_image = logo_image.subsample(3, 3)  # Resize the logo
-        tk.Label(frame, image=logo_image, bg="#E3F2FD").pack(pady=10)
+        tk.Label(frame, image=logo(), bg="#E3F2FD").pack(pady=10)
     except Exception as e:
         tk.Label(frame, text="FileHaven", font=("Helvetica", 24, "bold"), bg="#E3F2FD", fg="#1E88E5").pack(pady=10)
 
@@ -149,11 +137,8 @@ def login_screen(root):
     # Footer
     tk.Label(frame, text="FileHaven @2025", font=("Helvetica", 10), bg="#E3F2FD", fg="#666").pack(pady=20)
 
-    # Keep a reference to the logo image to prevent garbage collection
-    frame.image = logo_image if 'logo_image' in locals() else None
-
-    root.mainloop()
-
 # For testing purposes
 if __name__ == "__main__":
-    login_screen()
+    root = create_root()
+    login_screen(root)
+    root.mainloop()
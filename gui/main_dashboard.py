@@ -1,14 +1,37 @@
 import tkinter as tk
 from tkinter import messagebox, filedialog, simpledialog
-from firebase_admin import storage as admin_storage
-from datetime import datetime, timedelta  # Add timedelta to the import
+from datetime import datetime
 import os
 from tkinter import ttk
-from tkinterdnd2 import DND_FILES, TkinterDnD
-from firebase_config import db
-from .file_viewer import FileViewer 
-import threading
-import queue
+from firebase_config import get_db, get_bucket
+from .upload_engine import ResumableUploader
+from .upload_scheduler import UploadScheduler
+from .metadata_cache import MetadataCache
+from .realtime import FolderListener, apply_changes
+from .listing import FolderPager
+from .io_executor import io_executor
+from .screens import create_root, show_screen
+from .assets import icon
+from .progress import ProgressChannel, TransferTracker
+from .name_resolver import name_reservations
+from .storage_ops import move_blob, signed_url
+from .metadata_ops import BATCH_LIMIT, move_document, move_documents
+from .folder_delete import FolderDeleter
+from .folder_move import FolderMover
+from .item_store import ItemStore
+from .blob_store import BlobStore
+from .sync_engine import SyncEngine
+from .thumbnails import is_image, make_thumbnail, thumbnail_cache, thumbnail_path, thumbnail_pool
+import math
+from collections import OrderedDict
+
+# Grid geometry; only the rows in view (plus overscan) get real tiles
+TILE_SIZE = 180
+TILE_PADDING = 15
+ROW_HEIGHT = TILE_SIZE + 2 * TILE_PADDING
+MAX_COLS = 4
+OVERSCAN_ROWS = 2
+THUMBNAIL_MEMORY_ITEMS = 256  # Decoded previews kept for quick rebinding
 
 class ProgressDialog:
     def __init__(self, parent, title="Progress", message="Please wait..."):
@@ -50,47 +73,112 @@ class ProgressDialog:
         self.status_label = tk.Label(self.dialog, text="Starting...")
         self.status_label.grid(row=2, column=0, padx=20, pady=10)
         
-        # Message queue for thread communication
-        self.queue = queue.Queue()
-        self.check_queue()
-        
-    def check_queue(self):
-        """Check for messages from the worker thread"""
-        try:
-            msg = self.queue.get_nowait()
-            if isinstance(msg, tuple):
-                msg_type, value = msg
-                if msg_type == "progress":
-                    self.progress_var.set(value)
-                elif msg_type == "status":
-                    self.status_label.config(text=value)
-                elif msg_type == "message":
-                    self.message_label.config(text=value)
-            self.dialog.after(100, self.check_queue)
-        except queue.Empty:
-            self.dialog.after(100, self.check_queue)
-            
+        # Latest values from worker threads, applied when the Tk thread wakes
+        self.channel = ProgressChannel(self.dialog, self.apply)
+        self.tracker = TransferTracker(self.channel)
+
+    def apply(self, fields):
+        """Show the latest posted values (Tk thread)"""
+        if "progress" in fields:
+            self.progress_var.set(fields["progress"])
+        if "status" in fields:
+            self.status_label.config(text=fields["status"])
+        if "message" in fields:
+            self.message_label.config(text=fields["message"])
+
     def update(self, progress=None, status=None, message=None):
-        """Update progress dialog"""
-        if progress is not None:
-            self.queue.put(("progress", progress))
-        if status is not None:
-            self.queue.put(("status", status))
-        if message is not None:
-            self.queue.put(("message", message))
-            
+        """Update progress dialog from any thread; only the latest value of each field is shown"""
+        self.channel.post(progress=progress, status=status, message=message)
+
+    def transfer(self, key):
+        """Track one of several concurrent operations; the bar shows their combined progress"""
+        return self.tracker.add(key)
+
     def close(self):
         """Close the dialog"""
+        self.channel.close()
         self.dialog.grab_release()
         self.dialog.destroy()
         
+class UploadProgressView:
+    """Single non-modal window showing the combined progress of all queued uploads"""
+
+    def __init__(self, parent, scheduler):
+        self.scheduler = scheduler
+        self.window = tk.Toplevel(parent)
+        self.window.title("Uploads")
+        self.window.transient(parent)
+        self.window.resizable(False, False)
+        self.window.protocol("WM_DELETE_WINDOW", self.window.withdraw)
+
+        # Bottom-right corner so the dashboard stays usable
+        window_width = 360
+        window_height = 170
+        x = parent.winfo_screenwidth() - window_width - 40
+        y = parent.winfo_screenheight() - window_height - 80
+        self.window.geometry(f"{window_width}x{window_height}+{x}+{y}")
+        self.window.grid_columnconfigure(0, weight=1)
+
+        self.files_label = tk.Label(self.window, text="Preparing uploads...")
+        self.files_label.grid(row=0, column=0, padx=20, pady=(15, 5))
+
+        self.progress_var = tk.DoubleVar()
+        ttk.Progressbar(
+            self.window,
+            variable=self.progress_var,
+            maximum=100,
+            mode='determinate',
+            length=300
+        ).grid(row=1, column=0, padx=20, pady=5)
+
+        self.rate_label = tk.Label(self.window, text="")
+        self.rate_label.grid(row=2, column=0, padx=20, pady=5)
+
+        self.current_label = tk.Label(self.window, text="", wraplength=320, fg="#666")
+        self.current_label.grid(row=3, column=0, padx=20, pady=5)
+
+        self.refresh()
+
+    def refresh(self):
+        """Redraw from the scheduler's aggregated snapshot"""
+        if not self.window.winfo_exists():
+            return
+        stats = self.scheduler.snapshot()
+        finished = stats["done_files"] + stats["failed_files"]
+        self.files_label.config(text=f"Uploaded {finished} of {stats['total_files']} files")
+        if stats["total_bytes"]:
+            self.progress_var.set(stats["transferred_bytes"] / stats["total_bytes"] * 100)
+
+        rate_text = f"{format_size(stats['rate'])}/s"
+        if stats["eta"] is not None:
+            rate_text += f"  -  {int(stats['eta'])}s remaining"
+        self.rate_label.config(
+            text=f"{format_size(stats['transferred_bytes'])} of {format_size(stats['total_bytes'])}  -  {rate_text}"
+        )
+        self.current_label.config(text=", ".join(stats["running"][:3]))
+        self.window.after(250, self.refresh)
+
+    def show(self):
+        self.window.deiconify()
+
+    def close(self):
+        self.window.destroy()
+
+
+def format_size(num_bytes):
+    """Human readable byte count"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if num_bytes < 1024 or unit == "GB":
+            return f"{num_bytes:.0f} {unit}" if unit == "B" else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+
 class MainDashboard:
-    def __init__(self, container, username):
+    def __init__(self, container, username, realtime=False, flat_schema=False):
         self.container = container
         self.username = username
         self.drag_data = {"widget": None, "type": None, "name": None, "x": 0, "y": 0}
         self.current_path = []
-        self.root = container
+        self.root = container.winfo_toplevel()
         self.click_data = {
             "time": 0,
             "position": None,
@@ -98,8 +186,33 @@ class MainDashboard:
             "timer": None
         }
         self.selected_item = None  # Track selected item by name and type
+        self.multi_selection = set()  # (name, type) of every selected item
+        self.uploader = ResumableUploader()
+        self.upload_scheduler = UploadScheduler(
+            on_idle=lambda: io_executor.post(self.finish_upload_batch)
+        )
+        self.upload_view = None
+        self.upload_failures = []
+        self.metadata_cache = MetadataCache(username)
+        self.items = ItemStore(get_db(), username) if flat_schema else None  # Flat metadata schema, once migrated
+        self.current_items = []  # Listing currently shown in the grid
+        self.item_widgets = {}  # (name, type) -> tile frame, for visible items only
+        self.item_positions = {}  # (name, type) -> (row, col, canvas width, thumbnail) the tile was bound for
+        self.free_tiles = []  # Pooled tiles not currently showing an item
+        self.tile_update_pending = False
+        self.scroll_region = None
+        self.thumbnail_images = OrderedDict()  # thumbnail URL -> PhotoImage
+        self.listener = None  # Snapshot listener for the current folder in realtime mode
+        self.pager = None  # Paginated fetch of the current folder
+        self.cached_items = []
+        self.realtime_var = tk.BooleanVar(value=realtime)
+        self.clock_job = None
+        io_executor.attach(self.root)
+        self.container.bind("<<ScreenClosed>>", self.close)
         self.initialize_ui()
         self.update_clock()
+        self.resume_pending_uploads()
+        self.resume_pending_deletes()
 
     def initialize_ui(self):
         # Main container configuration
@@ -180,6 +293,16 @@ class MainDashboard:
                 relief="flat"
             ).grid(row=0, column=i, padx=5)
 
+        # Opt-in realtime mode: apply Firestore change events instead of reloading
+        tk.Checkbutton(
+            actions_frame,
+            text="Live Updates",
+            variable=self.realtime_var,
+            command=self.load_items,
+            bg="#BBDEFB",
+            font=("Helvetica", 10)
+        ).grid(row=0, column=len(buttons), padx=5)
+
         # Content Area
         self.content_frame = tk.Frame(self.container)
         self.content_frame.grid(row=2, column=0, sticky="nsew")
@@ -188,25 +311,32 @@ class MainDashboard:
 
         # Create canvas and scrollbar
         self.canvas = tk.Canvas(self.content_frame, bg="#E3F2FD")
-        scrollbar = ttk.Scrollbar(self.content_frame, orient="vertical", command=self.canvas.yview)
+        self.scrollbar = ttk.Scrollbar(self.content_frame, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self.on_canvas_scroll)
         self.scrollable_frame = tk.Frame(self.canvas, bg="#E3F2FD")
 
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        )
-
         # Create window in canvas
         self.canvas_frame = self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
 
         # Configure grid
         self.canvas.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
-        scrollbar.grid(row=0, column=1, sticky="ns")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
 
-        # Bind canvas resizing
+        # F12 shows background I/O latency per operation
+        self.root.bind("<F12>", lambda e: messagebox.showinfo(
+            "I/O Latency", io_executor.report() or "No requests yet."))
+
+        # Bind canvas resizing and wheel scrolling
         self.canvas.bind('<Configure>', self.on_canvas_configure)
+        self.canvas.bind_all("<MouseWheel>", self.on_mousewheel)
+        self.canvas.bind_all("<Button-4>", self.on_mousewheel)
+        self.canvas.bind_all("<Button-5>", self.on_mousewheel)
         
+        # One context menu shared by every tile
+        self.context_menu = tk.Menu(self.root, tearoff=0)
+
         # Set up drag and drop for the scrollable frame instead of canvas
+        from tkinterdnd2 import DND_FILES
         self.scrollable_frame.drop_target_register(DND_FILES)
         self.scrollable_frame.dnd_bind('<<Drop>>', self.handle_drop)
 
@@ -214,22 +344,9 @@ class MainDashboard:
 
     def handle_drop(self, event):
             """Handle file drop events"""
-            files = event.data
-            for file in files:
-                self.upload_specific_file(file)
-                
-    def file_exists(self, filename):
-        """Check if file exists in current location"""
-        try:
-            if self.current_path:
-                current_folder = self.current_path[-1]
-                file_ref = db.collection("folders").document(self.username).collection("user_folders").document(current_folder).collection("files").document(filename)
-            else:
-                file_ref = db.collection("files").document(self.username).collection("user_files").document(filename)
-            
-            return file_ref.get().exists
-        except Exception:
-            return False
+            # event.data is a Tcl list string; braces wrap paths containing spaces
+            files = self.root.tk.splitlist(event.data)
+            self.upload_paths([file for file in files if os.path.isfile(file)])
 
     def upload_files(self):
         """Upload multiple files using file dialog"""
@@ -245,210 +362,355 @@ class MainDashboard:
         
         if not file_paths:
             return
-            
-        for file_path in file_paths:
-            try:
-                file_name = os.path.basename(file_path)
-                new_name = self.check_duplicate_filename(file_name)
-                
-                if new_name != file_name:
-                    if not messagebox.askyesno("File Exists", 
-                        f"File '{file_name}' already exists. Save as '{new_name}'?"):
-                        continue
-                    file_name = new_name
-
-                self.upload_specific_file(file_path, file_name)
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to upload {file_name}: {e}")
+
+        self.upload_paths(list(file_paths))
+
+    def upload_paths(self, file_paths, folder_path=None, file_names=None, on_skipped=None):
+        """Resolve duplicate names for a batch with one listing query, then queue the uploads"""
+        if not file_paths:
+            return
+        folder_path = list(self.current_path if folder_path is None else folder_path)
+        io_executor.submit(
+            "resolve_names",
+            self.fetch_file_names,
+            folder_path,
+            on_success=lambda taken: self.queue_uploads(file_paths, folder_path, taken, file_names, on_skipped),
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to check existing files: {e}")
+        )
+
+    def queue_uploads(self, file_paths, folder_path, taken, file_names=None, on_skipped=None):
+        """
+        Pick a free name for every file in memory and hand them to the scheduler.
+        file_names are the names wanted, the files' own by default; on_skipped(file_path)
+        is called for files the user chose not to upload under another name.
+        """
+        folder_key = "/".join(folder_path)
+        file_names = file_names or [os.path.basename(file_path) for file_path in file_paths]
+        new_names = name_reservations.resolve(folder_key, file_names, taken)
+
+        for file_path, file_name, new_name in zip(file_paths, file_names, new_names):
+            if new_name != file_name:
+                if not messagebox.askyesno("File Exists", 
+                    f"File '{file_name}' already exists. Save as '{new_name}'?"):
+                    name_reservations.release(folder_key, new_name)
+                    if on_skipped:
+                        on_skipped(file_path)
+                    continue
+            self.upload_specific_file(file_path, new_name, folder_path)
+
+    def fetch_file_names(self, folder_path):
+        """Names of all files in a folder, fetched as document ids only"""
+        if self.items is not None:
+            return self.items.names(folder_path)
+        _, files_ref = self.listing_refs(folder_path)
+        return {doc.id for doc in files_ref.select([]).stream()}
                 
-    def upload_specific_file(self, file_path, file_name=None):
-        """Upload a specific file with progress dialog"""
+    def upload_specific_file(self, file_path, file_name=None, folder_path=None):
+        """Queue a specific file on the shared upload scheduler"""
         try:
             if file_name is None:
                 file_name = os.path.basename(file_path)
-                
-            # Create and show progress dialog
-            progress = ProgressDialog(
-                self.root,
-                "Uploading File",
-                f"Uploading {file_name}..."
-            )
-            
-            def upload_task():
-                try:
-                    file_stats = os.stat(file_path)
-                    bucket = admin_storage.bucket()
-                    storage_path = f"users/{self.username}/files/{file_name}"
-                    blob = bucket.blob(storage_path)
-                    
-                    # Custom upload with progress
-                    progress.update(status="Reading file...")
-                    with open(file_path, 'rb') as file_obj:
-                        file_size = os.path.getsize(file_path)
-                        chunk_size = 256 * 1024  # 256KB chunks
-                        uploaded_bytes = 0
-                        
-                        while True:
-                            chunk = file_obj.read(chunk_size)
-                            if not chunk:
-                                break
-                                
-                            # Upload chunk
-                            blob.upload_from_string(
-                                chunk,
-                                if_generation_match=None,
-                                content_type='application/octet-stream'
-                            )
-                            
-                            uploaded_bytes += len(chunk)
-                            progress_percent = (uploaded_bytes / file_size) * 100
-                            
-                            progress.update(
-                                progress=progress_percent,
-                                status=f"Uploaded {uploaded_bytes}/{file_size} bytes"
-                            )
-                    
-                    progress.update(progress=100, status="Generating download URL...")
-                    
-                    # Generate signed URL
-                    download_url = blob.generate_signed_url(
-                        version="v4",
-                        expiration=timedelta(days=7),
-                        method="GET"
-                    )
-                    
-                    # Update database
-                    file_data = {
-                        "name": file_name,
-                        "original_path": file_path,
-                        "storage_path": storage_path,
-                        "download_url": download_url,
-                        "size": file_stats.st_size,
-                        "modified_time": datetime.fromtimestamp(file_stats.st_mtime).isoformat(),
-                        "uploaded_at": datetime.now().isoformat(),
-                        "type": "file",
-                        "synced": True
-                    }
-                    
-                    if self.current_path:
-                        current_folder = self.current_path[-1]
-                        file_ref = db.collection("folders").document(self.username).collection("user_folders").document(current_folder).collection("files")
-                    else:
-                        file_ref = db.collection("files").document(self.username).collection("user_files")
-                    
-                    file_ref.document(file_name).set(file_data)
-                    
-                    # Close progress dialog and reload items
-                    self.root.after(0, lambda: [
-                        progress.close(),
-                        messagebox.showinfo("Success", f"File '{file_name}' uploaded successfully!"),
-                        self.load_items()
-                    ])
-                    
-                except Exception as e:
-                    self.root.after(0, lambda: [
-                        progress.close(),
-                        messagebox.showerror("Error", f"Failed to upload file: {str(e)}")
-                    ])
-            
-            # Start upload in separate thread
-            threading.Thread(target=upload_task, daemon=True).start()
-            
+            # Remember the destination now; the user may navigate away mid-upload
+            if folder_path is None:
+                folder_path = list(self.current_path)
+            file_size = os.path.getsize(file_path)
+
+            def upload_task(on_progress):
+                file_stats = os.stat(file_path)
+                db = get_db()
+                bucket = get_bucket()
+                blobs = BlobStore(db, bucket, self.username)
+
+                # Render the preview in another process while the content is hashed and uploaded
+                thumbnail_future = thumbnail_pool().submit(make_thumbnail, file_path) if is_image(file_name) else None
+
+                def thumbnail_fields(digest):
+                    if thumbnail_future is None:
+                        return {}
+                    try:
+                        thumbnail_bytes, content_type = thumbnail_future.result()
+                        thumbnail_blob = bucket.blob(thumbnail_path(self.username, digest))
+                        thumbnail_blob.upload_from_string(thumbnail_bytes, content_type=content_type)
+                        return {"thumbnail_path": thumbnail_blob.name}
+                    except Exception:
+                        # A missing preview should never fail the upload itself
+                        return {}
+
+                # Identical content is stored once; a repeat upload only adds a reference
+                digest, record, uploaded = blobs.store(
+                    file_path,
+                    self.uploader,
+                    on_progress=on_progress,
+                    metadata={
+                        "username": self.username,
+                        "file_name": file_name,
+                        "folder_path": list(folder_path)
+                    },
+                    extra=thumbnail_fields
+                )
+                if not uploaded:
+                    if thumbnail_future is not None:
+                        thumbnail_future.cancel()
+                    on_progress(file_stats.st_size, file_stats.st_size)
+
+                # Update database
+                file_data = {
+                    "name": file_name,
+                    "original_path": file_path,
+                    "storage_path": record["storage_path"],
+                    "content_hash": digest,
+                    "download_url": signed_url(bucket.blob(record["storage_path"])),
+                    "size": file_stats.st_size,
+                    "modified_time": datetime.fromtimestamp(file_stats.st_mtime).isoformat(),
+                    "uploaded_at": datetime.now().isoformat(),
+                    "type": "file",
+                    "synced": True
+                }
+                if record.get("thumbnail_path"):
+                    file_data["thumbnail_path"] = record["thumbnail_path"]
+                    file_data["thumbnail_url"] = signed_url(bucket.blob(record["thumbnail_path"]))
+
+                if self.items is not None:
+                    self.items.put_file(folder_path, file_name, file_data)
+                    return
+
+                if folder_path:
+                    current_folder = folder_path[-1]
+                    file_ref = db.collection("folders").document(self.username).collection("user_folders").document(current_folder).collection("files")
+                else:
+                    file_ref = db.collection("files").document(self.username).collection("user_files")
+
+                file_ref.document(file_name).set(file_data)
+
+            def upload_done(_):
+                # The document now exists, so the name no longer needs holding
+                name_reservations.release("/".join(folder_path), file_name)
+
+            def upload_failed(error):
+                name_reservations.release("/".join(folder_path), file_name)
+                self.upload_failures.append(f"{file_name}: {error}")
+
+            self.upload_scheduler.submit(file_name, file_size, upload_task,
+                                         on_done=upload_done, on_error=upload_failed)
+
+            # One progress window for the whole batch
+            if self.upload_view is None:
+                self.upload_view = UploadProgressView(self.root, self.upload_scheduler)
+            else:
+                self.upload_view.show()
+
         except Exception as e:
             messagebox.showerror("Error", f"Failed to start upload: {str(e)}")
-                
-    def check_duplicate_filename(self, filename):
-        """Check if filename exists and return a unique name if it does"""
-        base, ext = os.path.splitext(filename)
-        counter = 1
-        new_filename = filename
-        
-        while self.file_exists(new_filename):
-            new_filename = f"{base}_{counter}{ext}"
-            counter += 1
-            
-        return new_filename
-    
-    def file_exists(self, filename):
-        """Check if file exists in current location"""
-        try:
-            if self.current_path:
-                current_folder = self.current_path[-1]
-                file_ref = db.collection("folders").document(self.username).collection("user_folders").document(current_folder).collection("files").document(filename)
-            else:
-                file_ref = db.collection("files").document(self.username).collection("user_files").document(filename)
-            
-            return file_ref.get().exists
-        except Exception:
-            return False
-            
+
+    def finish_upload_batch(self):
+        """Called on the UI thread once every queued upload has finished"""
+        if not self.upload_scheduler.is_idle():
+            return
+        stats = self.upload_scheduler.snapshot()
+        failures, self.upload_failures = self.upload_failures, []
+        self.upload_scheduler.reset()
+
+        if self.upload_view is not None:
+            self.upload_view.close()
+            self.upload_view = None
+
+        self.refresh_items()
+        if failures:
+            messagebox.showerror("Error", "Failed to upload file(s):\n" + "\n".join(failures[:10]))
+        elif stats["total_files"]:
+            messagebox.showinfo("Success", f"{stats['done_files']} file(s) uploaded successfully!")
+
+    def resume_pending_uploads(self):
+        """Offer to finish uploads that were interrupted by a crash or restart"""
+        pending = self.uploader.session_store.pending(self.username)
+        resumes = {}  # folder path -> (file paths, names, {file path: session key})
+        for storage_path, record in pending.items():
+            file_path = record.get("file_path")
+            file_name = record.get("file_name")
+            if not file_path or not file_name or not os.path.exists(file_path):
+                self.uploader.session_store.remove(storage_path)
+                continue
+            if not messagebox.askyesno("Resume Upload",
+                f"Upload of '{file_name}' was interrupted. Resume it now?"):
+                self.uploader.session_store.remove(storage_path)
+                continue
+            folder_path = record.get("folder_path")
+            if folder_path is None:
+                # Sessions saved before the full path was recorded only kept the last folder
+                folder_path = [record["folder"]] if record.get("folder") else []
+            file_paths, file_names, keys = resumes.setdefault(tuple(folder_path), ([], [], {}))
+            file_paths.append(file_path)
+            file_names.append(file_name)
+            keys[file_path] = storage_path
+
+        # The recorded name may have been taken since the crash, so resumes are
+        # reserved and checked like any new upload instead of overwriting it
+        for folder_path, (file_paths, file_names, keys) in resumes.items():
+            self.upload_paths(
+                file_paths, folder_path, file_names,
+                on_skipped=lambda file_path, keys=keys: self.uploader.session_store.remove(keys[file_path])
+            )
+
     def on_canvas_configure(self, event):
         """Handle canvas resize"""
         width = event.width
         self.canvas.itemconfig(self.canvas_frame, width=width)
+        self.layout_tiles()
+
+    def on_canvas_scroll(self, first, last):
+        """Keep the scrollbar in sync and rebind tiles for the newly visible rows"""
+        self.scrollbar.set(first, last)
+        self.schedule_tile_update()
+
+    def on_mousewheel(self, event):
+        """Scroll the grid when the wheel is used over it"""
+        try:
+            if not str(event.widget).startswith(str(self.canvas)):
+                return
+        except Exception:
+            return
+        if event.num == 4:
+            step = -1
+        elif event.num == 5:
+            step = 1
+        else:
+            step = -1 if event.delta > 0 else 1
+        self.canvas.yview_scroll(step, "units")
         
     def update_clock(self):
         """Update the clock display only if widget still exists."""
         if hasattr(self, "time_label") and self.time_label.winfo_exists():
             current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             self.time_label.config(text=current_time)
-            self.root.after(1000, self.update_clock)  # Update every second
-
-    def create_draggable_item(self, name, item_type, row, col):
-        """Create a draggable file or folder with improved selection and drag-drop feedback."""
-        color = "#4CAF50" if item_type == "folder" else "#2196F3"
-        icon = "📁" if item_type == "folder" else "📄"
-
-        # Create main frame with full background
-        frame = tk.Frame(self.scrollable_frame, bg="white", width=180, height=180)
-        frame.grid(row=row, column=col, padx=15, pady=15, sticky="nsew")
-        frame.grid_propagate(False)
+            self.clock_job = self.root.after(1000, self.update_clock)  # Update every second
+
+    def create_tile(self):
+        """Create an empty, recyclable tile; bind_tile() attaches it to an item."""
+        frame = tk.Frame(self.scrollable_frame, bg="white", width=TILE_SIZE, height=TILE_SIZE)
+        frame.pack_propagate(False)
+        frame.item_name = None
+        frame.item_type = None
+        frame.thumbnail_url = None
+        frame.thumbnail_fetch = None  # Future of a preview download still pending
+        frame.slot = None  # (x, y) the tile was last placed at
 
         # Create a single content frame that fills the entire area
         content_frame = tk.Frame(frame, bg="white")
         content_frame.place(relx=0.5, rely=0.5, anchor="center", relwidth=1, relheight=1)
 
         # Center the icon and label vertically in the content frame
-        label_icon = tk.Label(content_frame, text=icon, font=("Helvetica", 48), bg="white", fg=color)
-        label_icon.pack(expand=True, pady=(20, 5))
-
-        display_name = name if len(name) <= 20 else name[:17] + "..."
-        label_name = tk.Label(content_frame, text=display_name, font=("Helvetica", 12), bg="white")
-        label_name.pack(expand=True, pady=(0, 20))
-
-        if len(name) > 20:
-            self.create_tooltip(label_name, name)
+        frame.icon_label = tk.Label(content_frame, bg="white")
+        frame.icon_label.pack(expand=True, pady=(20, 5))
 
-        # Create context menu
-        context_menu = tk.Menu(self.root, tearoff=0)
-        context_menu.add_command(label="Rename", command=lambda: self.rename_item(name, item_type))
-        context_menu.add_command(label="Delete", command=lambda: self.delete_item(name, item_type))
-        
-        if item_type == "folder":
-            context_menu.add_command(label="Open", command=lambda: self.open_folder(name))
+        frame.name_label = tk.Label(content_frame, font=("Helvetica", 12), bg="white")
+        frame.name_label.pack(expand=True, pady=(0, 20))
 
-        # Bind events to both frame and content_frame
-        for widget in (frame, content_frame, label_icon, label_name):
+        # Handlers read the item from the tile at event time, so they survive rebinding
+        for widget in (frame, content_frame, frame.icon_label, frame.name_label):
             widget.bind("<ButtonPress-1>", 
-                       lambda e, f=frame, n=name, t=item_type: self.handle_click(e, f, n, t))
+                       lambda e, f=frame: self.handle_click(e, f, f.item_name, f.item_type))
             widget.bind("<B1-Motion>", lambda e, f=frame: self.handle_motion(e, f))
             widget.bind("<ButtonRelease-1>", 
-                       lambda e, f=frame, n=name, t=item_type: self.handle_release(e, f, n, t))
+                       lambda e, f=frame: self.handle_release(e, f, f.item_name, f.item_type))
             widget.bind("<Double-Button-1>", 
-                       lambda e, f=frame, n=name, t=item_type: self.handle_double_click(e, f, n, t))
-            widget.bind("<Button-3>", lambda e: self.show_context_menu(e, context_menu))
-            
-            if item_type == "folder":
-                widget.bind("<Enter>", lambda e, f=frame: self.highlight_drop_target(e, f))
-                widget.bind("<Leave>", lambda e, f=frame: self.unhighlight_drop_target(e, f))
-
-        # If this item was previously selected, reselect it
-        if (self.selected_item and 
-            self.selected_item["name"] == name and 
-            self.selected_item["type"] == item_type):
+                       lambda e, f=frame: self.handle_double_click(e, f, f.item_name, f.item_type))
+            widget.bind("<Button-3>", lambda e, f=frame: self.show_context_menu(e, f.item_name, f.item_type))
+            widget.bind("<Enter>", 
+                       lambda e, f=frame: f.item_type == "folder" and self.highlight_drop_target(e, f))
+            widget.bind("<Leave>", 
+                       lambda e, f=frame: f.item_type == "folder" and self.unhighlight_drop_target(e, f))
+
+        self.create_tooltip(frame.name_label, lambda f=frame: f.item_name if len(f.item_name or "") > 20 else None)
+        return frame
+
+    def bind_tile(self, frame, item):
+        """Show an item on a tile."""
+        name, item_type = item["name"], item["type"]
+        thumbnail_url = item.get("thumbnail_url")
+        if (frame.item_name != name or frame.item_type != item_type or
+                frame.thumbnail_url != thumbnail_url):
+            self.cancel_thumbnail(frame)
+            frame.item_name = name
+            frame.item_type = item_type
+            frame.thumbnail_url = thumbnail_url
+            frame.icon_label.config(image=icon(item_type), text="")
+            frame.name_label.config(text=name if len(name) <= 20 else name[:17] + "...")
+            if thumbnail_url:
+                self.load_thumbnail(frame, item)
+
+        # Highlight the tile if it now shows the selected item
+        selected = (self.selected_item and
+                    self.selected_item["name"] == name and
+                    self.selected_item["type"] == item_type)
+        if selected:
             self.select_item(None, frame, name, item_type)
+        elif (name, item_type) in self.multi_selection:
+            self.paint_tile(frame, "#BBDEFB")
+        else:
+            self.paint_tile(frame, "white")
+
+    def place_tile(self, frame, row, col, top):
+        """
+        Move a tile to its grid slot. The frame holding the tiles only covers
+        the viewport, so slots are relative to the top of the view; window
+        coordinates stay small however long the folder is.
+        """
+        col_width = max(self.canvas.winfo_width(), TILE_SIZE) / MAX_COLS
+        x = int(col * col_width + max(col_width - TILE_SIZE, 0) / 2)
+        y = int(row * ROW_HEIGHT + TILE_PADDING - top)
+        if frame.slot != (x, y):
+            frame.slot = (x, y)
+            frame.place(x=x, y=y, width=TILE_SIZE, height=TILE_SIZE)
+
+    def load_thumbnail(self, frame, item):
+        """Show a file's preview on its tile, fetching a few KB only when not cached."""
+        url = item["thumbnail_url"]
+        photo = self.thumbnail_images.get(url)
+        if photo is not None:
+            self.thumbnail_images.move_to_end(url)
+            frame.icon_label.config(image=photo, text="")
+            return
 
-        return frame
+        def fetch():
+            # Skip the download if the tile was recycled before a worker got to it;
+            # thumbnail_url is a plain attribute, so reading it here is safe
+            if frame.thumbnail_url != url:
+                return None
+            return thumbnail_cache().fetch(url.split("?", 1)[0], url, item["name"] + ".webp")
+
+        def show(path):
+            if path is None:
+                return
+            from PIL import ImageTk
+            photo = ImageTk.PhotoImage(file=path)
+            self.thumbnail_images[url] = photo
+            while len(self.thumbnail_images) > THUMBNAIL_MEMORY_ITEMS:
+                self.thumbnail_images.popitem(last=False)
+            # The tile may have been recycled for another item meanwhile
+            if frame.winfo_exists() and frame.thumbnail_url == url:
+                frame.icon_label.config(image=photo, text="")
+
+        frame.thumbnail_fetch = io_executor.submit(
+            "thumbnail",
+            fetch,
+            on_success=show,
+            on_error=lambda e: None
+        )
+
+    def cancel_thumbnail(self, frame):
+        """Drop a tile's pending preview download; one already running is discarded on arrival."""
+        if frame.thumbnail_fetch is not None:
+            frame.thumbnail_fetch.cancel()
+            frame.thumbnail_fetch = None
+        frame.thumbnail_url = None
+
+    def paint_tile(self, frame, color):
+        """Set the background of a tile and its content."""
+        frame.configure(bg=color)
+        for child in frame.winfo_children():
+            child.configure(bg=color)
+            for label in child.winfo_children():
+                label.configure(bg=color)
 
     def handle_click(self, event, widget, name, item_type):
         """Handle single click events with delay to differentiate from drag."""
@@ -457,6 +719,11 @@ class MainDashboard:
             self.root.after_cancel(self.click_data["timer"])
             self.click_data["timer"] = None
 
+        # Ctrl+click adds or removes an item from a multi-selection
+        if event.state & 0x0004:
+            self.toggle_selection(widget, name, item_type)
+            return
+
         # Store click data
         self.click_data.update({
             "time": event.time,
@@ -467,6 +734,9 @@ class MainDashboard:
         })
 
         # Select the item with the updated signature
+        if (name, item_type) not in self.multi_selection:
+            self.clear_multi_selection()
+            self.multi_selection = {(name, item_type)}
         self.select_item(event, widget, name, item_type)
 
         # Set timer for potential drag start
@@ -537,17 +807,13 @@ class MainDashboard:
                     # Verify widget still exists
                     self.selected_widget.winfo_exists()
                     # Only configure if widget still exists
-                    self.selected_widget.configure(bg="white")
-                    for child in self.selected_widget.winfo_children():
-                        child.configure(bg="white")
+                    self.paint_tile(self.selected_widget, "white")
                 except tk.TclError:
                     # Widget no longer exists, just ignore and continue
                     pass
 
             # Highlight the current widget
-            widget.configure(bg="#BBDEFB")  # Light blue for selection
-            for child in widget.winfo_children():
-                child.configure(bg="#BBDEFB")
+            self.paint_tile(widget, "#BBDEFB")  # Light blue for selection
             
             self.selected_widget = widget
             self.selected_item = {"name": name, "type": item_type}
@@ -557,6 +823,24 @@ class MainDashboard:
             self.selected_widget = None
             self.selected_item = None
     
+    def toggle_selection(self, widget, name, item_type):
+        """Add an item to, or remove it from, the multi-selection"""
+        key = (name, item_type)
+        if key in self.multi_selection:
+            self.multi_selection.discard(key)
+            self.paint_tile(widget, "white")
+        else:
+            self.multi_selection.add(key)
+            self.paint_tile(widget, "#BBDEFB")
+
+    def clear_multi_selection(self):
+        """Unhighlight every visible tile in the multi-selection"""
+        for key in self.multi_selection:
+            frame = self.item_widgets.get(key)
+            if frame is not None:
+                self.paint_tile(frame, "white")
+        self.multi_selection = set()
+
     def highlight_drop_target(self, event, widget):
         """Highlight a folder when the mouse enters its area during dragging."""
         if self.drag_data["widget"]:
@@ -573,44 +857,47 @@ class MainDashboard:
     
     def view_file(self, file_name):
         """Open file viewer for the selected file."""
-        try:
-            # Get file data from Firestore
-            if self.current_path:
-                current_folder = self.current_path[-1]
-                file_ref = db.collection("folders").document(self.username).collection("user_folders").document(current_folder).collection("files").document(file_name)
-            else:
-                file_ref = db.collection("files").document(self.username).collection("user_files").document(file_name)
-            
-            file_data = file_ref.get().to_dict()
-            
+        # Get file data from Firestore
+        folder_path = list(self.current_path)
+
+        def open_viewer(file_data):
             if not file_data or 'download_url' not in file_data:
                 messagebox.showerror("Error", "File data or download URL not found!")
                 return
                 
-            # Create file viewer
-            FileViewer(self.root, file_data['download_url'], file_name)
-        
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to open file: {str(e)}")
+            # Create file viewer; it pulls in PIL and the download cache, so only on first use
+            from .file_viewer import FileViewer
+            FileViewer(self.root, file_data['download_url'], file_name, file_data.get('storage_path'))
+
+        io_executor.submit(
+            "get_file",
+            lambda: self.file_ref(folder_path, file_name).get().to_dict(),
+            on_success=open_viewer,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to open file: {str(e)}")
+        )
         
     def create_tooltip(self, widget, text):
         """Create tooltip for showing full name on hover"""
         def show_tooltip(event):
+            content = text() if callable(text) else text
+            if not content:
+                return
             tooltip = tk.Toplevel()
             tooltip.wm_overrideredirect(True)
             tooltip.wm_geometry(f"+{event.x_root + 10}+{event.y_root + 10}")
             
-            label = tk.Label(tooltip, text=text, background="#FFE", relief="solid", borderwidth=1)
+            label = tk.Label(tooltip, text=content, background="#FFE", relief="solid", borderwidth=1)
             label.pack()
-            
-            def hide_tooltip():
-                tooltip.destroy()
-            
             widget.tooltip = tooltip
-            widget.bind("<Leave>", lambda e: hide_tooltip())
-            tooltip.bind("<Leave>", lambda e: hide_tooltip())
 
-        widget.bind("<Enter>", show_tooltip)
+        def hide_tooltip(event):
+            tooltip = getattr(widget, "tooltip", None)
+            if tooltip is not None:
+                tooltip.destroy()
+                widget.tooltip = None
+
+        widget.bind("<Enter>", show_tooltip, add="+")
+        widget.bind("<Leave>", hide_tooltip, add="+")
 
     def start_drag(self, event, widget, name, item_type):
         """Start dragging with improved visibility."""
@@ -628,15 +915,13 @@ class MainDashboard:
         # Create a visual drag feedback
         self.drag_clone = tk.Frame(self.scrollable_frame, bg="#E3F2FD", width=180, height=180)
         self.drag_clone.place(x=widget.winfo_x(), y=widget.winfo_y())
+        self.drag_clone.lift()
         
         # Copy the content to the clone
         clone_content = tk.Frame(self.drag_clone, bg="#E3F2FD")
         clone_content.place(relx=0.5, rely=0.5, anchor="center", relwidth=1, relheight=1)
         
-        icon = "📁" if item_type == "folder" else "📄"
-        color = "#4CAF50" if item_type == "folder" else "#2196F3"
-        
-        tk.Label(clone_content, text=icon, font=("Helvetica", 48), bg="#E3F2FD", fg=color).pack(expand=True, pady=(20, 5))
+        tk.Label(clone_content, image=icon(item_type), bg="#E3F2FD").pack(expand=True, pady=(20, 5))
         tk.Label(clone_content, text=name[:17] + "..." if len(name) > 20 else name, 
                 font=("Helvetica", 12), bg="#E3F2FD").pack(expand=True, pady=(0, 20))
 
@@ -663,22 +948,20 @@ class MainDashboard:
 
         # Handle drop logic
         target_folder = None
-        for child in self.scrollable_frame.winfo_children():
-            if child != widget and self.is_dropped_on_widget(event, child):
-                try:
-                    content_frame = child.winfo_children()[0]
-                    labels = [w for w in content_frame.winfo_children() if isinstance(w, tk.Label)]
-                    if len(labels) >= 2:
-                        icon_label = labels[0]
-                        if icon_label.cget("text") == "📁":
-                            name_label = labels[1]
-                            target_folder = name_label.cget("text")
-                            break
-                except Exception:
-                    continue
+        for (item_name, target_type), child in self.item_widgets.items():
+            if target_type == "folder" and child != widget and self.is_dropped_on_widget(event, child):
+                target_folder = item_name
+                break
 
         if target_folder and self.drag_data["type"] == "file":
-            self.move_file(name, target_folder)
+            # Dragging one of several selected files moves the whole selection
+            if (name, item_type) in self.multi_selection and len(self.multi_selection) > 1:
+                names = sorted(n for n, t in self.multi_selection if t == "file")
+                self.move_files(names, target_folder)
+            else:
+                self.move_file(name, target_folder)
+        elif target_folder and self.drag_data["type"] == "folder":
+            self.transfer_folder(name, target_folder=target_folder)
 
         self.drag_data = {"widget": None, "type": None, "name": None, "x": 0, "y": 0}
 
@@ -693,65 +976,221 @@ class MainDashboard:
         return target_x1 <= event.x_root <= target_x2 and target_y1 <= event.y_root <= target_y2
     
     def load_items(self):
-        """Load files and folders into the scrollable frame."""
-        # Store currently selected item before clearing
-        currently_selected = self.selected_item
+        """Show the current folder from the local cache, then revalidate it page by page."""
+        self.stop_listener()
+        self.pager = None
+        folder_path = list(self.current_path)
+        self.cached_items = self.metadata_cache.get(folder_path) or []
+        self.render_items(self.cached_items)
+
+        if self.items is not None and not self.items.knows(folder_path):
+            # The flat schema lists by folder id; look it up once off the Tk thread
+            io_executor.submit(
+                "folder_id",
+                self.items.folder_id,
+                folder_path,
+                on_success=lambda _: self.start_listing(folder_path),
+                on_error=lambda e: messagebox.showerror("Error", f"Failed to fetch items: {e}")
+            )
+            return
+        self.start_listing(folder_path)
 
-        # Clear existing items
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
+    def start_listing(self, folder_path):
+        """Start the listener or the pager for the folder being shown."""
+        if folder_path != self.current_path:
+            return  # The user navigated away while the folder was being looked up
 
-        try:
-            if self.current_path:
-                current_folder = self.current_path[-1]
-                folders_ref = db.collection("folders").document(self.username).collection("user_folders").document(current_folder).collection("subfolders")
-                files_ref = db.collection("folders").document(self.username).collection("user_folders").document(current_folder).collection("files")
-            else:
-                folders_ref = db.collection("folders").document(self.username).collection("user_folders")
-                files_ref = db.collection("files").document(self.username).collection("user_files")
-
-            row, col = 0, 0
-            max_cols = 4  # Number of items per row
-
-            # Load folders
-            for folder in folders_ref.stream():
-                folder_name = folder.id
-                self.create_draggable_item(folder_name, "folder", row, col)
-                col += 1
-                if col >= max_cols:
-                    col = 0
-                    row += 1
-
-            # Load files
-            for file in files_ref.stream():
-                file_name = file.id
-                self.create_draggable_item(file_name, "file", row, col)
-                col += 1
-                if col >= max_cols:
-                    col = 0
-                    row += 1
-
-            # Configure grid columns to be equal width
-            for i in range(max_cols):
-                self.scrollable_frame.grid_columnconfigure(i, weight=1)
-
-            # If the previously selected item no longer exists, clear selection
-            if currently_selected:
-                exists = False
-                for widget in self.scrollable_frame.winfo_children():
-                    for child in widget.winfo_children():
-                        if isinstance(child, tk.Label) and child.cget("text") == currently_selected["name"]:
-                            exists = True
-                            break
-                if not exists:
-                    self.selected_item = None
-                    self.selected_widget = None
+        if self.realtime_var.get():
+            self.start_listener(folder_path)
+            return
+
+        folders_ref, files_ref = self.listing_refs(folder_path)
+        order_field = "name" if self.items is not None else "__name__"
+        self.pager = FolderPager(folder_path, folders_ref, files_ref, order_field=order_field)
+        self.fetch_next_page()
+
+    def fetch_next_page(self):
+        """Fetch the next page of the current listing on a worker thread."""
+        pager = self.pager
+        if pager is None or pager.done or pager.loading or pager.failed:
+            return
+        pager.loading = True
+        io_executor.submit(
+            "list_page",
+            pager.next_page,
+            on_success=lambda _: self.apply_page(pager),
+            on_error=lambda e: self.page_failed(pager, e)
+        )
 
+    def apply_page(self, pager):
+        """Render a page as soon as it arrives; layout_tiles asks for more near the bottom."""
+        pager.loading = False
+        if pager is not self.pager:
+            return  # The user navigated away while this page was loading
+        # Cache every page, not just the last: pages past the first screen are only
+        # fetched on scroll, so a large folder may never be read to the end. The
+        # cached tail beyond the cursor is kept until its pages are revalidated.
+        items = pager.merge_with(self.cached_items)
+        self.metadata_cache.put(pager.folder_path, items)
+
+        if items != self.current_items:
+            self.render_items(items)
+        else:
+            self.layout_tiles()
+
+    def page_failed(self, pager, error):
+        pager.loading = False
+        pager.failed = True
+        if pager is self.pager:
+            messagebox.showerror("Error", f"Failed to fetch items: {error}")
+
+    def refresh_items(self):
+        """Refresh after a change; in realtime mode the listener already delivers it."""
+        if self.listener is None:
+            self.load_items()
+
+    def listing_refs(self, folder_path):
+        """Return the (folders, files) collection references for a folder."""
+        if self.items is not None:
+            return self.items.children(folder_path, "folder"), self.items.children(folder_path, "file")
+        db = get_db()
+        if folder_path:
+            current_folder = folder_path[-1]
+            folders_ref = db.collection("folders").document(self.username).collection("user_folders").document(current_folder).collection("subfolders")
+            files_ref = db.collection("folders").document(self.username).collection("user_folders").document(current_folder).collection("files")
+        else:
+            folders_ref = db.collection("folders").document(self.username).collection("user_folders")
+            files_ref = db.collection("files").document(self.username).collection("user_files")
+        return folders_ref, files_ref
+
+    def file_ref(self, folder_path, name):
+        """Document reference of a file; may query, so call it off the Tk thread."""
+        if self.items is not None:
+            ref = self.items.file_ref(folder_path, name)
+            if ref is None:
+                raise Exception(f"File '{name}' does not exist!")
+            return ref
+        _, files_ref = self.listing_refs(folder_path)
+        return files_ref.document(name)
+
+    def start_listener(self, folder_path):
+        """Subscribe to change events for a folder."""
+        folders_ref, files_ref = self.listing_refs(folder_path)
+
+        def on_changes(item_type, changes, reset):
+            io_executor.post(self.apply_realtime_changes, listener, folder_path, item_type, changes, reset)
+
+        listener = FolderListener(folders_ref, files_ref, on_changes)
+        self.listener = listener
+        try:
+            listener.start()
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to fetch items: {e}")
+            self.listener = None
+            listener.stop()
+            messagebox.showerror("Error", f"Failed to start live updates: {e}")
+
+    def stop_listener(self):
+        """Tear down the current folder's snapshot listeners, if any."""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def apply_realtime_changes(self, listener, folder_path, item_type, changes, reset):
+        """Apply added/modified/removed deltas from a snapshot to the grid."""
+        if listener is not self.listener:
+            return  # Stale event from a folder we already left
+        items = apply_changes(self.current_items, item_type, changes, reset)
+        self.metadata_cache.put(folder_path, items)
+        if items != self.current_items:
+            self.render_items(items)
+
+    def render_items(self, items):
+        """Show a listing; only tiles for the visible rows are bound."""
+        self.current_items = list(items)
+
+        # If the previously selected item no longer exists, clear selection
+        keys = {(item["name"], item["type"]) for item in items}
+        if self.selected_item:
+            key = (self.selected_item["name"], self.selected_item["type"])
+            if key not in keys:
+                self.selected_item = None
+                self.selected_widget = None
+        self.multi_selection &= keys
+
+        self.layout_tiles()
+
+    def schedule_tile_update(self):
+        """Coalesce scroll events into one tile update per idle cycle"""
+        if not self.tile_update_pending:
+            self.tile_update_pending = True
+            self.root.after_idle(self.layout_tiles)
+
+    def layout_tiles(self):
+        """Bind pooled tiles to the items in view, recycling the ones that scrolled out."""
+        self.tile_update_pending = False
+        if not self.canvas.winfo_exists():
+            return
 
-    def show_context_menu(self, event, menu):
+        total_rows = math.ceil(len(self.current_items) / MAX_COLS)
+        canvas_height = self.canvas.winfo_height()
+        content_height = max(total_rows * ROW_HEIGHT, canvas_height)
+        scroll_region = (0, 0, self.canvas.winfo_width(), content_height)
+        if scroll_region != self.scroll_region:
+            # Only touch the canvas when the size changed; it re-fires yscrollcommand
+            self.scroll_region = scroll_region
+            self.canvas.configure(scrollregion=scroll_region)
+
+        # The tile frame is only as tall as the viewport and follows it; a frame
+        # as tall as the folder would overflow Tk's 16-bit window geometry
+        top = self.canvas.canvasy(0)
+        self.canvas.coords(self.canvas_frame, 0, top)
+        self.canvas.itemconfig(self.canvas_frame, height=canvas_height)
+        first_row = max(0, int(top // ROW_HEIGHT) - OVERSCAN_ROWS)
+        last_row = min(total_rows, int((top + canvas_height) // ROW_HEIGHT) + 1 + OVERSCAN_ROWS)
+        visible = {}
+        for index in range(first_row * MAX_COLS, min(len(self.current_items), last_row * MAX_COLS)):
+            item = self.current_items[index]
+            visible[(item["name"], item["type"])] = index
+
+        # Release tiles whose item scrolled out of view or was removed
+        for key in list(self.item_widgets):
+            if key not in visible:
+                frame = self.item_widgets.pop(key)
+                if frame is getattr(self, 'selected_widget', None):
+                    self.selected_widget = None
+                frame.place_forget()
+                frame.slot = None
+                self.cancel_thumbnail(frame)
+                self.free_tiles.append(frame)
+
+        # Bind tiles for newly visible items and move the rest only if their slot changed
+        for key, index in visible.items():
+            row, col = divmod(index, MAX_COLS)
+            frame = self.item_widgets.get(key)
+            if frame is None:
+                frame = self.free_tiles.pop() if self.free_tiles else self.create_tile()
+                self.item_widgets[key] = frame
+                self.item_positions[key] = None
+            item = self.current_items[index]
+            layout = (row, col, self.canvas.winfo_width(), item.get("thumbnail_url"))
+            if self.item_positions[key] != layout:
+                self.bind_tile(frame, item)
+                self.item_positions[key] = layout
+            self.place_tile(frame, row, col, top)
+
+        # Fetch the next page once the user scrolls close to the end of what is loaded
+        if last_row >= total_rows - OVERSCAN_ROWS:
+            self.fetch_next_page()
+
+    def show_context_menu(self, event, name, item_type):
         """Show context menu on right-click."""
+        menu = self.context_menu
+        menu.delete(0, "end")
+        menu.add_command(label="Rename", command=lambda: self.rename_item(name, item_type))
+        menu.add_command(label="Delete", command=lambda: self.delete_item(name, item_type))
+        
+        if item_type == "folder":
+            menu.add_command(label="Open", command=lambda: self.open_folder(name))
         menu.post(event.x_root, event.y_root)
 
     def rename_item(self, name, item_type):
@@ -759,62 +1198,134 @@ class MainDashboard:
         new_name = simpledialog.askstring("Rename", f"Enter new name for {name}:")
         if not new_name:
             return
+        if item_type == "folder":
+            self.transfer_folder(name, new_name=new_name)
+            return
+        folder_path = list(self.current_path)
 
-        try:
-            if item_type == "folder":
-                collection_ref = db.collection("folders").document(self.username).collection("user_folders")
-                # Rename folder
-                old_doc = collection_ref.document(name).get()
-                collection_ref.document(new_name).set(old_doc.to_dict() or {})
-                collection_ref.document(name).delete()
+        def rename_task():
+            # Get file reference
+            file_ref = self.file_ref(folder_path, name)
+            
+            # Get old file data
+            old_doc = file_ref.get()
+            file_data = old_doc.to_dict()
+            if file_data is None:
+                raise Exception(f"File '{name}' does not exist!")
+            updates = {"name": new_name}
+
+            # Refuse a taken name before any stored content is touched
+            if self.items is not None:
+                taken = self.items.file_ref(folder_path, new_name) is not None
             else:
-                # Get file reference
-                if self.current_path:
-                    current_folder = self.current_path[-1]
-                    file_ref = db.collection("folders").document(self.username).collection("user_folders").document(current_folder).collection("files")
+                taken = file_ref.parent.document(new_name).get().exists
+            if taken:
+                raise Exception(f"File '{new_name}' already exists!")
+
+            def commit(new_blob=None):
+                if new_blob is not None:
+                    updates['storage_path'] = new_blob.name
+                    updates['download_url'] = signed_url(new_blob)
+                if self.items is not None:
+                    self.items.rename_file(folder_path, name, new_name, updates)
                 else:
-                    file_ref = db.collection("files").document(self.username).collection("user_files")
-                
-                # Get old file data
-                old_doc = file_ref.document(name).get()
-                file_data = old_doc.to_dict()
-                
-                if file_data and 'storage_path' in file_data:
-                    # Update storage path
-                    old_storage_path = file_data['storage_path']
-                    new_storage_path = f"users/{self.username}/files/{new_name}"
-                    
-                    # Get bucket and create blob references
-                    bucket = admin_storage.bucket()
-                    old_blob = bucket.blob(old_storage_path)
-                    new_blob = bucket.blob(new_storage_path)
-                    
-                    # Copy the blob to the new location
-                    bucket.copy_blob(old_blob, bucket, new_storage_path)
-                    
-                    # Generate new signed URL
-                    new_url = new_blob.generate_signed_url(
-                        version="v4",
-                        expiration=timedelta(days=7),
-                        method="GET"
-                    )
-                    
-                    # Update file data
-                    file_data['storage_path'] = new_storage_path
-                    file_data['download_url'] = new_url
-                    
-                    # Delete old blob
-                    old_blob.delete()
-                
-                # Update database
-                file_data['name'] = new_name
-                file_ref.document(new_name).set(file_data)
-                file_ref.document(name).delete()
+                    # Write the renamed document and delete the old one in one commit
+                    move_document(get_db(), file_ref, file_ref.parent.document(new_name), updates)
 
+            if 'storage_path' in file_data and 'content_hash' not in file_data:
+                # Copy the object inside the storage service; the original goes
+                # only once the metadata points at the copy, and a copy left by a
+                # failed attempt is reused by the next one
+                try:
+                    move_blob(get_bucket(), file_data['storage_path'],
+                              f"users/{self.username}/files/{new_name}", commit=commit)
+                except FileNotFoundError:
+                    raise Exception(f"Stored content of '{name}' is missing!")
+                except FileExistsError:
+                    raise Exception(f"Stored content named '{new_name}' already exists!")
+            else:
+                commit()
+
+        def renamed(_):
             messagebox.showinfo("Success", f"{item_type.capitalize()} renamed successfully!")
-            self.load_items()
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to rename {item_type}: {e}")
+            self.refresh_items()
+
+        io_executor.submit(
+            "rename",
+            rename_task,
+            on_success=renamed,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to rename {item_type}: {e}")
+        )
+
+    def transfer_folder(self, name, new_name=None, target_folder=None):
+        """Rename a folder or move it into target_folder, together with its contents"""
+        folder_path = list(self.current_path)
+        mover = FolderMover(get_db(), self.username)
+        action = "rename" if new_name else "move"
+
+        if self.items is not None:
+            # One subtree query and batched path updates; nothing to estimate
+            target_path = folder_path + [target_folder] if target_folder else None
+            io_executor.submit(
+                action,
+                self.items.move_folder,
+                folder_path,
+                name,
+                target_path=target_path,
+                new_name=new_name,
+                on_success=lambda _: [
+                    messagebox.showinfo("Success", f"Folder {action}d successfully!"),
+                    self.refresh_items()
+                ],
+                on_error=lambda e: messagebox.showerror("Error", f"Failed to {action} folder: {e}")
+            )
+            return
+
+        def planned(plan):
+            estimate = plan.estimate()
+            # Ask first when the folder's contents take more than one batch
+            if estimate["copied_documents"] + estimate["files"] > BATCH_LIMIT and not messagebox.askyesno(
+                    f"Confirm {action.capitalize()}",
+                    f"This will update {estimate['folders']} folder(s) and {estimate['files']} file(s): "
+                    f"about {estimate['reads']} reads and {estimate['writes']} writes. Continue?"):
+                return
+
+            progress = ProgressDialog(
+                self.root,
+                "Renaming Folder" if new_name else "Moving Folder",
+                f"Renaming {name} to {new_name}..." if new_name else f"Moving {name} to {target_folder}..."
+            )
+
+            def on_progress(done, total, status):
+                progress.update(progress=done * 100 / total if total else 0, status=status)
+
+            def transfer_task():
+                mover.on_progress = on_progress
+                mover.run(plan)
+                progress.update(progress=100, status=f"{action.capitalize()} complete!")
+
+            def transferred(_):
+                progress.close()
+                messagebox.showinfo("Success", f"Folder {action}d successfully!")
+                self.refresh_items()
+
+            def failed(e):
+                progress.close()
+                messagebox.showerror("Error", f"Failed to {action} folder: {str(e)}")
+                self.refresh_items()
+
+            io_executor.submit(action, transfer_task, on_success=transferred, on_error=failed)
+
+        io_executor.submit(
+            "plan_" + action,
+            mover.plan,
+            name,
+            folder_path,
+            new_name=new_name,
+            target_folder=target_folder,
+            on_success=planned,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to {action} folder: {e}")
+        )
 
     def delete_item(self, name, item_type):
         """Delete item with progress dialog"""
@@ -827,63 +1338,115 @@ class MainDashboard:
                 "Deleting Item",
                 f"Deleting {item_type} {name}..."
             )
+            folder_path = list(self.current_path)
             
             def delete_task():
-                try:
-                    if item_type == "folder":
-                        progress.update(progress=50, status="Deleting folder...")
-                        collection_ref = db.collection("folders").document(self.username).collection("user_folders")
-                        collection_ref.document(name).delete()
-                    else:
-                        # Delete file
-                        progress.update(progress=25, status="Getting file data...")
-                        
-                        if self.current_path:
-                            current_folder = self.current_path[-1]
-                            file_ref = db.collection("folders").document(self.username).collection("user_folders").document(current_folder).collection("files").document(name)
-                        else:
-                            file_ref = db.collection("files").document(self.username).collection("user_files").document(name)
-                        
-                        file_data = file_ref.get().to_dict()
-                        
-                        if file_data and 'storage_path' in file_data:
-                            progress.update(progress=50, status="Deleting from storage...")
-                            try:
-                                bucket = admin_storage.bucket()
-                                blob = bucket.blob(file_data['storage_path'])
-                                blob.delete()
-                            except Exception:
-                                pass
-                        
-                        progress.update(progress=75, status="Deleting file record...")
-                        file_ref.delete()
+                if item_type == "folder" and self.items is not None:
+                    progress.update(progress=50, status="Deleting folder...")
+                    self.items.delete_folder(folder_path, name, get_bucket())
+                elif item_type == "folder":
+                    # Delete the folder with all of its files and subfolders
+                    entry_path = None
+                    if folder_path:
+                        entry_path = f"folders/{self.username}/user_folders/{folder_path[-1]}/subfolders/{name}"
+                    self.folder_deleter(progress.transfer(name).report).run(name, entry_path)
+                else:
+                    # Delete file
+                    progress.update(progress=25, status="Getting file data...")
+                    
+                    file_ref = self.file_ref(folder_path, name)
                     
-                    progress.update(progress=100, status="Delete complete!")
+                    file_data = file_ref.get().to_dict()
                     
-                    # Close progress and update UI
-                    self.root.after(0, lambda: [
-                        progress.close(),
-                        messagebox.showinfo("Success", f"{item_type.capitalize()} deleted successfully!"),
-                        self.load_items()
-                    ])
+                    content_hash = (file_data or {}).get('content_hash')
                     
-                except Exception as e:
-                    self.root.after(0, lambda: [
-                        progress.close(),
-                        messagebox.showerror("Error", f"Failed to delete {item_type}: {str(e)}"),
-                        self.load_items()
-                    ])
+                    if not content_hash and file_data and 'storage_path' in file_data:
+                        progress.update(progress=50, status="Deleting from storage...")
+                        try:
+                            bucket = get_bucket()
+                            blob = bucket.blob(file_data['storage_path'])
+                            blob.delete()
+                            if file_data.get('thumbnail_path'):
+                                bucket.blob(file_data['thumbnail_path']).delete()
+                        except Exception:
+                            pass
+                    
+                    progress.update(progress=75, status="Deleting file record...")
+                    file_ref.delete()
+
+                    if content_hash:
+                        # Shared content goes once its last file is gone
+                        progress.update(progress=90, status="Releasing stored content...")
+                        BlobStore(get_db(), get_bucket(), self.username).release(content_hash)
+                
+                progress.update(progress=100, status="Delete complete!")
+
+            def deleted(_):
+                progress.close()
+                messagebox.showinfo("Success", f"{item_type.capitalize()} deleted successfully!")
+                self.refresh_items()
+
+            def failed(e):
+                progress.close()
+                messagebox.showerror("Error", f"Failed to delete {item_type}: {str(e)}")
+                self.refresh_items()
             
-            # Start delete in separate thread
-            threading.Thread(target=delete_task, daemon=True).start()
+            # Start delete in the background
+            io_executor.submit("delete", delete_task, on_success=deleted, on_error=failed)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to start delete: {str(e)}")
 
+    def folder_deleter(self, on_progress):
+        """Recursive folder delete that reports through on_progress(done, total, status)"""
+        return FolderDeleter(get_db(), get_bucket(), self.username, on_progress=on_progress)
+
+    def resume_pending_deletes(self):
+        """Offer to finish folder deletes that were interrupted, tracked in one dialog"""
+        names = [name for name in FolderDeleter(None, None, self.username).pending()
+                 if messagebox.askyesno("Resume Delete",
+                     f"Deleting folder '{name}' was interrupted. Finish deleting it now?")]
+        if not names:
+            return
+        progress = ProgressDialog(
+            self.root,
+            "Deleting Items",
+            f"Deleting folder {names[0]}..." if len(names) == 1 else f"Deleting {len(names)} folders..."
+        )
+        remaining = set(names)
+        errors = {}
+
+        def finished(name, error=None):
+            remaining.discard(name)
+            if error is not None:
+                errors[name] = error
+            if remaining:
+                return
+            progress.close()
+            if errors:
+                messagebox.showerror("Error", "Failed to delete folder(s):\n" + "\n".join(
+                    f"{name}: {error}" for name, error in errors.items()))
+            self.refresh_items()
+
+        for name in names:
+            transfer = progress.transfer(name)
+
+            def delete_task(name=name, transfer=transfer):
+                self.folder_deleter(transfer.report).run(name)
+                transfer.finish()
+
+            io_executor.submit(
+                "delete",
+                delete_task,
+                on_success=lambda _, name=name: finished(name),
+                on_error=lambda e, name=name: finished(name, e)
+            )
+
     def open_folder(self, folder_name):
         """Open a folder and update the current path."""
         self.current_path.append(folder_name)
         self.update_path_display()
+        self.canvas.yview_moveto(0)
         self.back_button.config(state="normal")
         self.load_items()
 
@@ -892,6 +1455,7 @@ class MainDashboard:
         if self.current_path:
             self.current_path.pop()
             self.update_path_display()
+            self.canvas.yview_moveto(0)
             if not self.current_path:
                 self.back_button.config(state="disabled")
             self.load_items()
@@ -903,71 +1467,66 @@ class MainDashboard:
 
     def move_file(self, file_name, target_folder):
         """Move a file with progress dialog"""
+        self.move_files([file_name], target_folder)
+
+    def move_files(self, file_names, target_folder):
+        """Move several files into a folder with batched reads and writes"""
         try:
+            label = file_names[0] if len(file_names) == 1 else f"{len(file_names)} files"
             progress = ProgressDialog(
                 self.root,
-                "Moving File",
-                f"Moving {file_name} to {target_folder}..."
+                "Moving File" if len(file_names) == 1 else "Moving Files",
+                f"Moving {label} to {target_folder}..."
             )
+            folder_path = list(self.current_path)
             
             def move_task():
-                try:
-                    # Update progress
-                    progress.update(progress=25, status="Getting source file...")
-                    
-                    # Get source reference
-                    if self.current_path:
-                        current_folder = self.current_path[-1]
-                        source_ref = db.collection("folders").document(self.username).collection("user_folders").document(current_folder).collection("files").document(file_name)
-                    else:
-                        source_ref = db.collection("files").document(self.username).collection("user_files").document(file_name)
-                    
-                    progress.update(progress=50, status="Checking target location...")
-                    
-                    # Get source data
-                    source_doc = source_ref.get()
-                    if not source_doc.exists:
-                        raise Exception(f"File '{file_name}' does not exist!")
+                progress.update(progress=10, status="Reading files...")
+
+                def on_progress(done, total):
+                    progress.update(progress=10 + done * 90 / total, status=f"Moving {done}/{total}...")
+
+                if self.items is not None:
+                    moved, errors = self.items.move_files(folder_path, file_names, folder_path + [target_folder], on_progress)
+                else:
+                    # Get source and target references
+                    db = get_db()
+                    _, source_files = self.listing_refs(folder_path)
+                    target_files = db.collection("folders").document(self.username).collection("user_folders").document(target_folder).collection("files")
+                    moves = [(source_files.document(name), target_files.document(name)) for name in file_names]
 
-                    file_data = source_doc.to_dict()
-                    
                     # Update metadata
-                    file_data.update({
+                    updates = {
                         "moved_at": datetime.now().isoformat(),
                         "parent_folder": target_folder,
-                        "path": self.current_path + [target_folder] if self.current_path else [target_folder]
-                    })
-                    
-                    progress.update(progress=75, status="Moving file...")
-                    
-                    # Get target reference and check existence
-                    target_ref = db.collection("folders").document(self.username).collection("user_folders").document(target_folder).collection("files").document(file_name)
-                    
-                    if target_ref.get().exists:
-                        raise Exception("A file with the same name already exists in the target folder!")
-                    
-                    # Perform move
-                    target_ref.set(file_data)
-                    source_ref.delete()
-                    
-                    progress.update(progress=100, status="Move complete!")
-                    
-                    # Close progress and update UI
-                    self.root.after(0, lambda: [
-                        progress.close(),
-                        messagebox.showinfo("Success", f"Moved '{file_name}' to folder '{target_folder}'!"),
-                        self.load_items()
-                    ])
-                    
-                except Exception as e:
-                    self.root.after(0, lambda: [
-                        progress.close(),
-                        messagebox.showerror("Error", f"Failed to move file: {str(e)}"),
-                        self.load_items()
-                    ])
+                        "path": folder_path + [target_folder]
+                    }
+                    moved, errors = move_documents(db, moves, updates, on_progress)
+                if len(file_names) == 1 and errors:
+                    raise Exception(f"File '{file_names[0]}': {errors[file_names[0]]}")
+
+                progress.update(progress=100, status="Move complete!")
+                if errors:
+                    summary = f"Moved {moved} file(s); {len(errors)} failed:\n" + "\n".join(
+                        f"{name}: {error}" for name, error in list(errors.items())[:10])
+                elif len(file_names) == 1:
+                    summary = f"Moved '{file_names[0]}' to folder '{target_folder}'!"
+                else:
+                    summary = f"Moved {moved} files to folder '{target_folder}'!"
+                return summary
+
+            def finished(summary):
+                progress.close()
+                messagebox.showinfo("Success", summary)
+                self.refresh_items()
+
+            def failed(e):
+                progress.close()
+                messagebox.showerror("Error", f"Failed to move file: {str(e)}")
+                self.refresh_items()
             
-            # Start move in separate thread
-            threading.Thread(target=move_task, daemon=True).start()
+            # Start move in the background
+            io_executor.submit("move", move_task, on_success=finished, on_error=failed)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to start move: {str(e)}")
@@ -977,145 +1536,125 @@ class MainDashboard:
         folder_name = simpledialog.askstring("Folder Name", "Enter folder name:")
         if not folder_name:
             return
-        try:
+        folder_path = list(self.current_path)
+
+        def create_task():
+            if self.items is not None:
+                self.items.create_folder(folder_path, folder_name, {"created_at": datetime.now().isoformat()})
+                return
+
             # Prevent duplicate folder names
-            if self.current_path:
-                current_folder = self.current_path[-1]
+            db = get_db()
+            if folder_path:
+                current_folder = folder_path[-1]
                 folder_ref = db.collection("folders").document(self.username).collection("user_folders").document(current_folder).collection("subfolders")
             else:
                 folder_ref = db.collection("folders").document(self.username).collection("user_folders")
             
             # Check if folder already exists
             if folder_ref.document(folder_name).get().exists:
-                messagebox.showerror("Error", f"Folder '{folder_name}' already exists!")
-                return
+                raise Exception(f"Folder '{folder_name}' already exists!")
 
             # Save the folder in Firebase
             folder_ref.document(folder_name).set({"created_at": datetime.now().isoformat()})
+
+        def created(_):
             messagebox.showinfo("Success", f"Folder '{folder_name}' created successfully!")
-            self.load_items()  # Reload the dashboard to show the new folder
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to create folder: {e}")
+            self.refresh_items()  # Reload the dashboard to show the new folder
+
+        io_executor.submit(
+            "create_folder",
+            create_task,
+            on_success=created,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to create folder: {e}")
+        )
             
     def sync_to_storage(self):
-        """Sync files to Firebase Storage"""
-        try:
-            # Get bucket
-            bucket = admin_storage.bucket()
-            
-            # Get all files in current location
-            if self.current_path:
-                current_folder = self.current_path[-1]
-                files_ref = db.collection("folders").document(self.username).collection("user_folders").document(current_folder).collection("files")
-            else:
-                files_ref = db.collection("files").document(self.username).collection("user_files")
-            
-            files = files_ref.get()
-            
-            for file in files:
-                file_data = file.to_dict()
-                if not file_data.get('synced'):
-                    original_path = file_data.get('original_path')
-                    if original_path and os.path.exists(original_path):
-                        try:
-                            storage_path = f"users/{self.username}/files/{file_data['name']}"
-                            blob = bucket.blob(storage_path)
-                            
-                            # Upload the file
-                            with open(original_path, 'rb') as file_obj:
-                                blob.upload_from_file(file_obj)
-                            
-                            # Get download URL
-                            download_url = blob.generate_signed_url(
-                                version="v4",
-                                expiration=datetime.timedelta(days=7),
-                                method="GET"
-                            )
-                            
-                            # Update file data with storage info
-                            file_data['synced'] = True
-                            file_data['storage_path'] = storage_path
-                            file_data['download_url'] = download_url
-                            files_ref.document(file.id).set(file_data)
-                            
-                        except Exception as e:
-                            print(f"Failed to upload {file_data['name']}: {e}")
-                            continue
-            
-            messagebox.showinfo("Success", "Files synced to Firebase Storage successfully!")
-            self.load_items()
-            
-        except Exception as e:
+        """Upload the local originals that changed since they were last synced"""
+        progress = ProgressDialog(self.root, "Syncing", "Looking for changed files...")
+
+        def on_progress(done, total, status):
+            progress.update(progress=done * 100 / total if total else 0, status=status)
+
+        engine = SyncEngine(
+            get_db(),
+            get_bucket(),
+            self.username,
+            self.listing_refs,
+            self.uploader,
+            folders_keyed_by_name=self.items is None,
+            on_progress=on_progress
+        )
+
+        def finish():
+            progress.close()
+            engine.manifest.close()
+
+        def synced(report):
+            finish()
+            messagebox.showinfo("Sync", report.summary())
+            self.refresh_items()
+
+        def failed(e):
+            finish()
             messagebox.showerror("Error", f"Failed to sync to storage: {str(e)}")
 
+        def planned(report):
+            if not report.changes:
+                finish()
+                messagebox.showinfo("Sync", report.summary() + "\nEverything is up to date.")
+                return
+            if not messagebox.askyesno("Sync", report.summary() + "\n\nUpload the changed files now?"):
+                finish()
+                return
+            progress.update(progress=0, message=f"Uploading {len(report.changes)} file(s)...")
+            io_executor.submit("sync", engine.run, report, on_success=synced, on_error=failed)
+
+        io_executor.submit("plan_sync", engine.plan, on_success=planned, on_error=failed)
+
     def logout(self):
-        """Log out and return to welcome screen with fresh image loading."""
+        """Log out and return to the welcome screen in the same window."""
         from gui.welcome import welcome_screen
 
+        # Swapping the screen tears the dashboard down through close()
+        welcome_screen(self.root)
+
+    def close(self, event=None):
+        """Release what the dashboard holds outside its own frame once its screen is swapped out."""
+        # Stop listening for folder changes
+        self.stop_listener()
+
+        # Release the global bindings owned by the dashboard
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.canvas.unbind_all(sequence)
+        self.root.unbind("<F12>")
+
         # Stop update_clock from running after logout
-        try:
-            self.root.after_cancel(self.update_clock)
-        except Exception:
-            pass
+        if self.clock_job is not None:
+            self.root.after_cancel(self.clock_job)
+            self.clock_job = None
 
-        # Destroy all widgets in the current root
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        # The context menu is a child of the shared root, not of the screen frame
+        self.context_menu.destroy()
 
-        # Force garbage collection to ensure Tkinter reloads the image properly
-        import gc
-        gc.collect()
 
-        # Reload welcome screen
-        welcome_screen(self.root)
-        
-def main_dashboard(root, username):
+def main_dashboard(root, username, realtime=False, flat_schema=False):
     """
-    Initialize the main dashboard using the existing window.
+    Show the main dashboard in the application window.
     
     Args:
-        root: The existing Tkinter root window
+        root: The application's root window, created DnD-capable by create_root
         username: The logged in user's username
+        realtime: Start with live snapshot updates enabled
+        flat_schema: Read and write metadata in the flat items collection
     """
-    # Convert existing root to TkinterDnD if it isn't already
-    if not isinstance(root, TkinterDnD.Tk):
-        # Destroy old root
-        root.destroy()
-        
-        # Create new TkinterDnD root
-        root = TkinterDnD.Tk()
-        
-        # Set window title
-        root.title("FileHaven - Dashboard")
-        
-        # Get screen dimensions
-        screen_width = root.winfo_screenwidth()
-        screen_height = root.winfo_screenheight()
-        
-        # Calculate window size (80% of screen size)
-        window_width = int(screen_width * 0.8)
-        window_height = int(screen_height * 0.8)
-        
-        # Calculate position
-        x = (screen_width - window_width) // 2
-        y = (screen_height - window_height) // 2
-        
-        # Set window geometry
-        root.geometry(f"{window_width}x{window_height}+{x}+{y}")
-        
-        # Make window resizable
-        root.resizable(True, True)
-        
-        # Set minimum size
-        root.minsize(800, 600)
-        
-        # Lift window to top but don't maximize
-        root.lift()
-        root.focus_force()
-    
-    app = MainDashboard(root, username)
-    root.mainloop()
+    # 80% of the screen, resizable down to a usable minimum
+    screen = show_screen(root, "FileHaven - Dashboard", 0.8, 0.8, min_size=(800, 600))
+    root.lift()
+    root.focus_force()
+    return MainDashboard(screen, username, realtime, flat_schema)
 
 if __name__ == "__main__":
-    root = TkinterDnD.Tk()
-    main_dashboard(root, "admin123")
\ No newline at end of file
+    root = create_root()
+    main_dashboard(root, "admin123")
+    root.mainloop()
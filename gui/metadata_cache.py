@@ -0,0 +1,66 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Per-user listing caches live next to the other local app data
+CACHE_DIR = "data/cache"
+
+
+class MetadataCache:
+    """
+    On-disk cache of folder listings for one user, keyed by folder path.
+
+    The dashboard renders straight from here and then revalidates against
+    Firestore in the background, so navigating back and forth through folders
+    that were already visited does not wait on the network.
+    """
+
+    def __init__(self, username, cache_dir=CACHE_DIR):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, f"{username}.sqlite3")
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS listings ("
+            "folder_path TEXT PRIMARY KEY, items TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def key(folder_path):
+        return "/".join(folder_path)
+
+    def get(self, folder_path):
+        """Return the cached item list for a folder, or None if never fetched"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT items FROM listings WHERE folder_path = ?",
+                (self.key(folder_path),)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, folder_path, items):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO listings (folder_path, items, fetched_at) VALUES (?, ?, ?)",
+                (self.key(folder_path), json.dumps(items), time.time())
+            )
+            self.conn.commit()
+
+    def invalidate(self, folder_path=None):
+        """Drop one folder's listing, or everything when no path is given"""
+        with self.lock:
+            if folder_path is None:
+                self.conn.execute("DELETE FROM listings")
+            else:
+                self.conn.execute(
+                    "DELETE FROM listings WHERE folder_path = ?",
+                    (self.key(folder_path),)
+                )
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
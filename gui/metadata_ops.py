@@ -0,0 +1,124 @@
+from firebase_admin import firestore
+
+BATCH_LIMIT = 500  # Maximum writes in one Firestore commit
+
+
+class BatchWriter:
+    """
+    Collect writes and commit them in WriteBatches of at most 500 operations.
+
+    Use as a context manager; whatever is pending is committed on exit.
+    """
+
+    def __init__(self, db, limit=BATCH_LIMIT):
+        self.db = db
+        self.limit = limit
+        self.batch = db.batch()
+        self.pending = 0
+        self.commits = 0
+
+    def reserve(self, count):
+        """Commit first if count more writes would not fit in the current batch"""
+        if self.pending + count > self.limit:
+            self.commit()
+
+    def set(self, ref, data, merge=False):
+        self.reserve(1)
+        self.batch.set(ref, data, merge=merge)
+        self.pending += 1
+
+    def update(self, ref, data):
+        self.reserve(1)
+        self.batch.update(ref, data)
+        self.pending += 1
+
+    def delete(self, ref):
+        self.reserve(1)
+        self.batch.delete(ref)
+        self.pending += 1
+
+    def commit(self):
+        if self.pending:
+            self.batch.commit()
+            self.commits += 1
+        self.batch = self.db.batch()
+        self.pending = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        return False
+
+
+def get_all(db, refs):
+    """Read many documents with BatchGetDocuments, 500 references per call"""
+    docs = []
+    for start in range(0, len(refs), BATCH_LIMIT):
+        docs.extend(db.get_all(refs[start:start + BATCH_LIMIT]))
+    return docs
+
+
+def move_document(db, source_ref, target_ref, updates=None):
+    """
+    Move one document in a single transaction: read source and target,
+    write the copy and delete the original in one commit.
+    """
+    transaction = db.transaction()
+
+    @firestore.transactional
+    def move(transaction):
+        source_doc = source_ref.get(transaction=transaction)
+        if not source_doc.exists:
+            raise Exception(f"'{source_ref.id}' does not exist!")
+        if target_ref.get(transaction=transaction).exists:
+            raise Exception(f"'{target_ref.id}' already exists in the target location!")
+        data = source_doc.to_dict() or {}
+        data.update(updates or {})
+        transaction.set(target_ref, data)
+        transaction.delete(source_ref)
+        return data
+
+    return move(transaction)
+
+
+def move_documents(db, moves, updates=None, on_progress=None):
+    """
+    Move many documents with batched reads and batched commits.
+
+    moves is a list of (source_ref, target_ref). Sources and targets are read
+    with get_all, then each move adds a set and a delete to a WriteBatch, so N
+    moves cost about N/250 commits instead of 4N round trips. updates is a
+    dict merged into every document, or a function that takes a document's
+    data and returns the fields to change. Returns (moved, errors) where
+    errors maps source id to a message.
+    """
+    errors = {}
+    if not moves:
+        return 0, errors
+
+    sources = {doc.reference.path: doc for doc in get_all(db, [source for source, _ in moves])}
+    existing_targets = {doc.reference.path for doc in get_all(db, [target for _, target in moves])
+                        if doc.exists}
+
+    moved = 0
+    with BatchWriter(db) as writer:
+        for done, (source_ref, target_ref) in enumerate(moves, 1):
+            source_doc = sources.get(source_ref.path)
+            if source_doc is None or not source_doc.exists:
+                errors[source_ref.id] = "does not exist"
+            elif target_ref.path in existing_targets:
+                errors[source_ref.id] = "a file with the same name already exists in the target folder"
+            else:
+                data = source_doc.to_dict() or {}
+                data.update((updates(data) if callable(updates) else updates) or {})
+                # Keep each move's set and delete in the same commit
+                writer.reserve(2)
+                writer.set(target_ref, data)
+                writer.delete(source_ref)
+                moved += 1
+            if on_progress:
+                on_progress(done, len(moves))
+    return moved, errors
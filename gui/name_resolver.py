@@ -0,0 +1,52 @@
+import os
+import threading
+
+
+def unique_name(filename, taken):
+    """Return filename, or filename with the first free _N suffix, checked in memory"""
+    base, ext = os.path.splitext(filename)
+    counter = 1
+    new_filename = filename
+    while new_filename in taken:
+        new_filename = f"{base}_{counter}{ext}"
+        counter += 1
+    return new_filename
+
+
+class NameReservations:
+    """
+    Names handed out to uploads that have not written their document yet.
+
+    Two batches queued into the same folder before either finishes would
+    otherwise both see "report_1.pdf" as free; reserving the name when it is
+    chosen and releasing it once the upload ends prevents that.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reserved = {}
+
+    def resolve(self, folder_key, filenames, taken):
+        """Pick and reserve a unique name for each filename, in order"""
+        with self.lock:
+            reserved = self.reserved.setdefault(folder_key, set())
+            in_use = set(taken) | reserved
+            names = []
+            for filename in filenames:
+                name = unique_name(filename, in_use)
+                in_use.add(name)
+                reserved.add(name)
+                names.append(name)
+            return names
+
+    def release(self, folder_key, name):
+        with self.lock:
+            reserved = self.reserved.get(folder_key)
+            if reserved is not None:
+                reserved.discard(name)
+                if not reserved:
+                    del self.reserved[folder_key]
+
+
+# Shared by every upload in the process
+name_reservations = NameReservations()
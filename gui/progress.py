@@ -0,0 +1,111 @@
+import threading
+import tkinter as tk
+
+WAKEUP_EVENT = "<<ProgressPending>>"
+
+
+class ProgressChannel:
+    """
+    Hands progress from worker threads to a widget on the Tk thread.
+
+    post() only records the latest value of each field, so a fast producer
+    overwrites rather than queues, and wakes the Tk thread with a virtual event
+    when nothing is pending yet. The Tk side applies everything pending in one
+    go, so the display never lags behind the work however often it reports.
+    apply(fields) receives a dict of the fields posted since the last call.
+    """
+
+    def __init__(self, widget, apply):
+        self.widget = widget
+        self.apply = apply
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.woken = False  # A wakeup event is on its way to the Tk thread
+        self.closed = False
+        widget.bind(WAKEUP_EVENT, self.drain)
+
+    def post(self, **fields):
+        """Record fields from any thread; None values are ignored"""
+        with self.lock:
+            if self.closed:
+                return
+            self.pending.update((key, value) for key, value in fields.items() if value is not None)
+            wake = bool(self.pending) and not self.woken
+            self.woken = self.woken or wake
+        if wake:
+            try:
+                self.widget.event_generate(WAKEUP_EVENT, when="tail")
+            except (tk.TclError, RuntimeError):
+                # The widget is gone or the event loop not running yet; the
+                # next post tries again rather than waiting on a lost wakeup
+                with self.lock:
+                    self.woken = False
+
+    def drain(self, event=None):
+        """Apply everything posted since the last drain (Tk thread)"""
+        with self.lock:
+            fields, self.pending = self.pending, {}
+            self.woken = False
+        if fields and not self.closed:
+            self.apply(fields)
+
+    def close(self):
+        """Drop anything still pending and ignore later posts"""
+        with self.lock:
+            self.closed = True
+            self.pending = {}
+            self.woken = False
+
+
+class Transfer:
+    """
+    One of several operations tracked by the same dialog. report(done, total,
+    status) has the signature of the on_progress callbacks used across the gui
+    package, so it can be passed to them directly.
+    """
+
+    def __init__(self, tracker, key):
+        self.tracker = tracker
+        self.key = key
+
+    def report(self, done, total, status=None):
+        self.tracker.report(self.key, done, total, status)
+
+    def finish(self, status=None):
+        self.tracker.finish(self.key, status)
+
+
+class TransferTracker:
+    """Combined progress of concurrent transfers, posted to a ProgressChannel"""
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.lock = threading.Lock()
+        self.transfers = {}  # key -> [done, total, finished]
+
+    def add(self, key):
+        with self.lock:
+            self.transfers[key] = [0, None, False]
+        return Transfer(self, key)
+
+    def report(self, key, done, total, status=None):
+        with self.lock:
+            self.transfers[key][:2] = [done, total]
+            progress, summary = self.combined()
+        self.channel.post(progress=progress, status=status or summary)
+
+    def finish(self, key, status=None):
+        with self.lock:
+            entry = self.transfers[key]
+            entry[0], entry[2] = entry[1] or entry[0], True
+            progress, summary = self.combined()
+        self.channel.post(progress=progress, status=status or summary)
+
+    def combined(self):
+        """(percent, summary) across every transfer; call with the lock held"""
+        entries = list(self.transfers.values())
+        finished = sum(1 for entry in entries if entry[2])
+        # Each transfer counts equally, so one large one does not hide the rest
+        fractions = [1.0 if entry[2] else (entry[0] / entry[1] if entry[1] else 0.0) for entry in entries]
+        progress = sum(fractions) * 100 / len(entries) if entries else 0
+        return progress, f"{finished} of {len(entries)} finished"
@@ -0,0 +1,77 @@
+import threading
+from .listing import listing_item
+
+
+def apply_changes(items, item_type, changes, reset=False):
+    """
+    Apply snapshot deltas for one item type to a listing.
+
+    changes is a list of (kind, item) pairs where kind is "ADDED", "MODIFIED"
+    or "REMOVED" and item is a listing entry. With reset=True the changes are
+    the full current contents of the collection and replace every item of that
+    type. Folders stay ahead of files and existing items keep their position.
+    """
+    if reset:
+        typed = [item for kind, item in changes if kind != "REMOVED"]
+    else:
+        typed = [item for item in items if item["type"] == item_type]
+        for kind, changed in changes:
+            position = next((index for index, item in enumerate(typed)
+                             if item["name"] == changed["name"]), None)
+            if kind == "REMOVED":
+                if position is not None:
+                    del typed[position]
+            elif position is None:
+                typed.append(changed)
+            else:
+                # Modified in place, e.g. a thumbnail was attached
+                typed[position] = changed
+
+    others = [item for item in items if item["type"] != item_type]
+    if item_type == "folder":
+        return typed + others
+    return others + typed
+
+
+class FolderListener:
+    """
+    Subscribe to Firestore snapshot listeners for one folder's subfolders and files.
+
+    on_changes(item_type, changes, reset) is called from the listener thread for
+    every snapshot; the first snapshot of each collection is delivered with
+    reset=True. Any object with on_snapshot(callback) returning a watch that has
+    unsubscribe() works, so a fake Firestore can drive it.
+    """
+
+    def __init__(self, folders_ref, files_ref, on_changes):
+        self.refs = {"folder": folders_ref, "file": files_ref}
+        self.on_changes = on_changes
+        self.watches = []
+        self.seen = set()
+        self.lock = threading.Lock()
+        self.active = False
+
+    def start(self):
+        self.active = True
+        for item_type, ref in self.refs.items():
+            callback = lambda docs, changes, read_time, item_type=item_type: self._on_snapshot(item_type, changes)
+            self.watches.append(ref.on_snapshot(callback))
+
+    def _on_snapshot(self, item_type, changes):
+        with self.lock:
+            if not self.active:
+                return
+            reset = item_type not in self.seen
+            self.seen.add(item_type)
+        deltas = [(change.type.name, listing_item(change.document, item_type)) for change in changes]
+        self.on_changes(item_type, deltas, reset)
+
+    def stop(self):
+        with self.lock:
+            self.active = False
+        for watch in self.watches:
+            try:
+                watch.unsubscribe()
+            except Exception:
+                pass
+        self.watches = []
@@ -1,8 +1,10 @@
 import tkinter as tk
-from tkinter import PhotoImage, messagebox
-from firebase_config import db
+from tkinter import messagebox
+from firebase_config import get_db
+from gui.assets import logo
+from gui.screens import create_root, show_screen
 
-def register_screen(root=None):
+def register_screen(root):
     """Display the registration screen."""
 
     def register_user():
@@ -26,6 +28,7 @@ def register_screen(root=None):
 
         try:
             # Check if username already exists
+            db = get_db()
             user_doc = db.collection("users").document(username).get()
             if user_doc.exists:
                 messagebox.showerror("Error", "Username already exists. Please choose a different username!")
@@ -34,7 +37,6 @@ def register_screen(root=None):
             # Save user credentials to Firestore
             db.collection("users").document(username).set({"password": password})
             messagebox.showinfo("Success", "Account created successfully! Redirecting to login page.")
-            clear_screen()
             from gui.login import login_screen
             login_screen(root)
         except Exception as e:
@@ -42,38 +44,15 @@ def register_screen(root=None):
 
     def back_to_login():
         """Redirect to the Login page."""
-        clear_screen()
         from gui.login import login_screen
         login_screen(root)
 
-    def clear_screen():
-        """Clear all widgets from the current screen."""
-        for widget in root.winfo_children():
-            widget.destroy()
-
-    # Initialize the main window if not provided
-    if root is None:
-        root = tk.Tk()
-        root.title("Register - FileHaven")
-        root.geometry("600x500")
-        root.configure(bg="#E3F2FD")  # Light blue background color
-
-        # Center the window
-        screen_width = root.winfo_screenwidth()
-        screen_height = root.winfo_screenheight()
-        x = int((screen_width / 2) - (600 / 2))
-        y = int((screen_height / 2) - (500 / 2))
-        root.geometry(f"600x500+{x}+{y}")
-
     # Main Frame
-    frame = tk.Frame(root, bg="#E3F2FD")
-    frame.pack(expand=True, fill="both")
+    frame = show_screen(root, "Register - FileHaven", 600, 500)
 
     # Add logo
     try:
-        logo_image = PhotoImage(file="assets/logo.png")  # Path to your logo file
-        logo_image = logo_image.subsample(3, 3)  # Resize the logo
-        tk.Label(frame, image=logo_image, bg="#E3F2FD").pack(pady=10)
+        tk.Label(frame, image=logo(), bg="#E3F2FD").pack(pady=10)
     except Exception as e:
         tk.Label(frame, text="FileHaven", font=("Helvetica", 24, "bold"), bg="#E3F2FD", fg="#1E88E5").pack(pady=10)
 
@@ -144,11 +123,8 @@ def register_screen(root=None):
     # Footer
     tk.Label(frame, text="FileHaven @2025", font=("Helvetica", 10), bg="#E3F2FD", fg="#666").pack(pady=20)
 
-    # Keep a reference to the logo image to prevent garbage collection
-    frame.image = logo_image if 'logo_image' in locals() else None
-
-    root.mainloop()
-
 # For testing purposes
 if __name__ == "__main__":
-    register_screen()
+    root = create_root()
+    register_screen(root)
+    root.mainloop()
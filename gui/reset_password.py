@@ -1,8 +1,10 @@
 import tkinter as tk
-from tkinter import messagebox, PhotoImage
-from firebase_config import db
+from tkinter import messagebox
+from firebase_config import get_db
+from gui.assets import logo
+from gui.screens import create_root, show_screen
 
-def reset_password_screen(root=None):
+def reset_password_screen(root):
     """Display the Reset Password screen."""
 
     def handle_reset_password():
@@ -26,6 +28,7 @@ def reset_password_screen(root=None):
 
         try:
             # Check if username exists
+            db = get_db()
             user_doc = db.collection("users").document(username).get()
             if not user_doc.exists:
                 messagebox.showerror("Error", "Username does not exist. Please register first!")
@@ -34,7 +37,6 @@ def reset_password_screen(root=None):
             # Update the user's password
             db.collection("users").document(username).update({"password": new_password})
             messagebox.showinfo("Success", "Password reset successfully! Redirecting to login page.")
-            clear_screen()
             from gui.login import login_screen
             login_screen(root)
 
@@ -43,38 +45,15 @@ def reset_password_screen(root=None):
 
     def back_to_login():
         """Return to the Login page."""
-        clear_screen()
         from gui.login import login_screen
         login_screen(root)
 
-    def clear_screen():
-        """Clear all widgets from the current screen."""
-        for widget in root.winfo_children():
-            widget.destroy()
-
-    # Initialize the main window if not provided
-    if root is None:
-        root = tk.Tk()
-        root.title("Reset Password - FileHaven")
-        root.geometry("600x500")
-        root.configure(bg="#E3F2FD")
-
-        # Center the window
-        screen_width = root.winfo_screenwidth()
-        screen_height = root.winfo_screenheight()
-        x = int((screen_width / 2) - (600 / 2))
-        y = int((screen_height / 2) - (500 / 2))
-        root.geometry(f"600x500+{x}+{y}")
-
     # Main Frame
-    frame = tk.Frame(root, bg="#E3F2FD")
-    frame.pack(expand=True, fill="both")
+    frame = show_screen(root, "Reset Password - FileHaven", 600, 500)
     
     # Add logo
     try:
-        logo_image = PhotoImage(file="assets/logo.png")  # Path to your logo file
-        logo_image = logo_image.subsample(3, 3)  # Resize the logo
-        tk.Label(frame, image=logo_image, bg="#E3F2FD").pack(pady=10)
+        tk.Label(frame, image=logo(), bg="#E3F2FD").pack(pady=10)
     except Exception as e:
         tk.Label(frame, text="FileHaven", font=("Helvetica", 24, "bold"), bg="#E3F2FD", fg="#1E88E5").pack(pady=10)
 
@@ -145,8 +124,8 @@ def reset_password_screen(root=None):
     # Footer
     tk.Label(frame, text="FileHaven @2025", font=("Helvetica", 10), bg="#E3F2FD", fg="#666").pack(pady=20)
 
-    root.mainloop()
-
 # For testing purposes
 if __name__ == "__main__":
-    reset_password_screen()
+    root = create_root()
+    reset_password_screen(root)
+    root.mainloop()
@@ -0,0 +1,158 @@
+from collections import deque
+from datetime import datetime
+from .checkpoints import CheckpointStore
+from .folder_delete import count_documents
+from .item_store import FLAT_SCHEMA, ROOT_ID, SCHEMA_FIELD, ItemStore, item_id, item_path
+from .metadata_ops import BATCH_LIMIT, BatchWriter
+
+# Local file that remembers how far a migration got
+CHECKPOINTS_PATH = "data/migration_checkpoints.json"
+LEGACY_FIELDS = ("path", "parent_folder")  # Replaced by the flat schema's own fields
+
+
+class SchemaMigration:
+    """
+    Copy a user's folders and files from the nested collections into the flat
+    items collection while the app keeps working.
+
+    The legacy tree is walked breadth-first from the top level, following
+    subfolder entries, and every folder's files are copied in 500-document
+    batches. Migrated documents get ids derived from their path, so a pass can
+    be interrupted and resumed from the checkpoint, or simply run again to pick
+    up files added or changed meanwhile, without creating duplicates. The
+    legacy data is left untouched; the dashboard switches to the flat schema
+    once finish() marks the user as migrated.
+
+    Legacy folders are keyed by name only, so a name that appears at two places
+    in the tree shares one set of contents. The contents are copied to the
+    first place found and the other places are reported in conflicts.
+
+    on_progress(done, total, status) is called after every batch; total is only
+    known for a dry run and is None otherwise.
+    """
+
+    def __init__(self, db, username, checkpoints=None, on_progress=None):
+        self.db = db
+        self.username = username
+        self.store = ItemStore(db, username)
+        self.checkpoints = checkpoints or CheckpointStore(CHECKPOINTS_PATH)
+        self.on_progress = on_progress
+        self.conflicts = []
+
+    def user_folders(self):
+        return self.db.collection("folders").document(self.username).collection("user_folders")
+
+    def root_files(self):
+        return self.db.collection("files").document(self.username).collection("user_files")
+
+    def files_ref(self, folder_path):
+        """Legacy collection holding a folder's files"""
+        if not folder_path:
+            return self.root_files()
+        return self.user_folders().document(folder_path[-1]).collection("files")
+
+    def subfolder_names(self, folder_path):
+        """Names of a folder's subfolders in the legacy schema"""
+        ref = (self.user_folders() if not folder_path
+               else self.user_folders().document(folder_path[-1]).collection("subfolders"))
+        return [doc.id for doc in ref.select([]).stream()]
+
+    def folder_entry(self, folder_path):
+        """Legacy document that lists a folder in its parent"""
+        if len(folder_path) == 1:
+            return self.user_folders().document(folder_path[0])
+        return self.user_folders().document(folder_path[-2]).collection("subfolders").document(folder_path[-1])
+
+    def walk(self, queue, seen):
+        """Yield folder paths breadth-first, extending queue and seen as it goes"""
+        while queue:
+            folder_path = queue.popleft()
+            yield folder_path
+            for name in self.subfolder_names(folder_path):
+                if name in seen:
+                    self.conflicts.append(item_path(folder_path, name))
+                    continue
+                seen.add(name)
+                queue.append(folder_path + [name])
+
+    def dry_run(self):
+        """Count what a migration would copy without writing anything"""
+        folders = files = 0
+        for folder_path in self.walk(deque([[]]), set()):
+            folders += 1 if folder_path else 0
+            files += count_documents(self.files_ref(folder_path))
+            self.report(folders + files, None, f"Found {folders} folder(s), {files} file(s)...")
+        return {
+            "folders": folders,
+            "files": files,
+            "documents": folders + files,
+            "commits": -(-(folders + files) // BATCH_LIMIT),
+            "conflicts": list(self.conflicts)
+        }
+
+    def run(self):
+        """Copy the legacy tree into the items collection; returns the documents written"""
+        if self.migrated():
+            raise RuntimeError(f"{self.username} already uses the flat schema")
+        checkpoint = self.checkpoints.get(self.username)
+        if checkpoint is None:
+            checkpoint = {"username": self.username, "queue": [[]], "seen": [], "done": 0}
+        queue = deque(checkpoint["queue"])
+        seen = set(checkpoint["seen"])
+
+        for folder_path in self.walk(queue, seen):
+            checkpoint["done"] += self.copy_folder(folder_path)
+            # The folder's subfolders are queued by now, so the checkpoint can move on
+            checkpoint.update(queue=list(queue), seen=sorted(seen))
+            self.checkpoints.save(self.username, checkpoint)
+            self.report(checkpoint["done"], None, f"Copied {checkpoint['done']} item(s)...")
+
+        # A complete pass starts over next time, to pick up later changes
+        self.checkpoints.remove(self.username)
+        return checkpoint["done"]
+
+    def copy_folder(self, folder_path):
+        """Write one folder's item and all of its files; returns the documents written"""
+        parent_id = ROOT_ID
+        written = 0
+        with BatchWriter(self.db) as writer:
+            if folder_path:
+                folder_key = item_path(folder_path[:-1], folder_path[-1])
+                parent_id = item_id("folder", folder_key)
+                legacy = self.folder_entry(folder_path).get().to_dict() or {}
+                writer.set(self.store.items_ref().document(parent_id), dict(legacy, **{
+                    "name": folder_path[-1],
+                    "type": "folder",
+                    "parent_id": item_id("folder", item_path(folder_path[:-2], folder_path[-2]))
+                                 if len(folder_path) > 1 else ROOT_ID,
+                    "path": folder_key,
+                    "depth": len(folder_path) - 1
+                }))
+                written += 1
+
+            for doc in self.files_ref(folder_path).stream():
+                data = {key: value for key, value in (doc.to_dict() or {}).items()
+                        if key not in LEGACY_FIELDS}
+                key = item_path(folder_path, doc.id)
+                data.update(name=doc.id, type="file", parent_id=parent_id, path=key, depth=len(folder_path))
+                writer.set(self.store.items_ref().document(item_id("file", key)), data)
+                written += 1
+                if written % BATCH_LIMIT == 0:
+                    self.report(written, None, f"Copying {item_path(folder_path, '')}...")
+        return written
+
+    def migrated(self):
+        user = self.db.collection("users").document(self.username).get().to_dict() or {}
+        return user.get(SCHEMA_FIELD) == FLAT_SCHEMA
+
+    def finish(self):
+        """Switch the user to the flat schema and drop the checkpoint"""
+        self.db.collection("users").document(self.username).update({
+            SCHEMA_FIELD: FLAT_SCHEMA,
+            "migrated_at": datetime.now().isoformat()
+        })
+        self.checkpoints.remove(self.username)
+
+    def report(self, done, total, status):
+        if self.on_progress:
+            self.on_progress(done, total, status)
@@ -0,0 +1,47 @@
+import tkinter as tk
+
+BACKGROUND = "#E3F2FD"
+
+
+def create_root():
+    """
+    The application's one window, created once at startup. It is DnD-capable
+    so the dashboard can accept dropped files without replacing it.
+    """
+    from tkinterdnd2 import TkinterDnD
+    root = TkinterDnD.Tk()
+    root.configure(bg=BACKGROUND)
+    return root
+
+
+def show_screen(root, title, width, height, min_size=(1, 1), resizable=True):
+    """
+    Swap the current screen for an empty frame and return it.
+
+    Screens are frames inside the one root window, so switching between them
+    only destroys the old frame's widgets; the window, its event loop and the
+    Tcl interpreter stay. Sizes are in pixels; a float is a fraction of the
+    screen. The window is re-centered for the new size.
+    """
+    previous = getattr(root, "screen", None)
+    if previous is not None and previous.winfo_exists():
+        previous.event_generate("<<ScreenClosed>>")
+        previous.destroy()
+
+    screen_width = root.winfo_screenwidth()
+    screen_height = root.winfo_screenheight()
+    if isinstance(width, float):
+        width = int(screen_width * width)
+    if isinstance(height, float):
+        height = int(screen_height * height)
+    x = (screen_width - width) // 2
+    y = (screen_height - height) // 2
+
+    root.title(title)
+    root.minsize(*min_size)
+    root.resizable(resizable, resizable)
+    root.geometry(f"{width}x{height}+{x}+{y}")
+
+    root.screen = tk.Frame(root, bg=BACKGROUND)
+    root.screen.pack(expand=True, fill="both")
+    return root.screen
@@ -0,0 +1,76 @@
+import subprocess
+import sys
+
+# Modules a screen pays for on its first import
+WELCOME_MODULES = ("gui.welcome",)
+DASHBOARD_MODULES = ("gui.login", "gui.main_dashboard")
+START_MARKER = "-- startup profile --"
+WELCOME_BUDGET_MS = 100  # Cold import of the welcome screen
+# Deferred to the screens and actions that use them
+HEAVY_MODULES = ("firebase_admin", "google.cloud", "grpc", "PIL", "requests", "tkinterdnd2")
+
+
+class ImportCost:
+    """One line of python -X importtime: a module and its import time in microseconds"""
+
+    def __init__(self, name, self_us, cumulative_us, depth):
+        self.name = name
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+        self.depth = depth
+
+
+class ImportProfile:
+    """Import costs of a set of modules, measured in a fresh interpreter"""
+
+    def __init__(self, modules, costs, error=None):
+        self.modules = modules
+        self.costs = costs
+        self.error = error
+
+    def loaded(self):
+        return {cost.name for cost in self.costs}
+
+    def total_ms(self):
+        """Time to import the requested modules, including everything they pulled in"""
+        return sum(cost.cumulative_us for cost in self.costs if cost.depth == 0) / 1000
+
+    def heavy(self):
+        """Loaded modules that belong to HEAVY_MODULES, which the welcome screen must not import"""
+        return sorted(name for name in self.loaded()
+                      if any(name == module or name.startswith(module + ".") for module in HEAVY_MODULES))
+
+    def report(self, top=20):
+        lines = [f"Importing {', '.join(self.modules)}: {self.total_ms():.1f} ms, {len(self.costs)} modules"]
+        if self.error:
+            lines.append(f"Import failed: {self.error}")
+        lines.append(f"{'cumulative ms':>14} {'self ms':>9}  module")
+        for cost in sorted(self.costs, key=lambda cost: cost.cumulative_us, reverse=True)[:top]:
+            lines.append(f"{cost.cumulative_us / 1000:>14.1f} {cost.self_us / 1000:>9.1f}  "
+                         f"{'  ' * cost.depth}{cost.name}")
+        return "\n".join(lines)
+
+
+def profile_imports(modules, python=sys.executable):
+    """Import modules in a child interpreter with -X importtime and parse what it reports"""
+    # The marker separates the interpreter's own startup imports from the ones asked for
+    source = "import sys; sys.stderr.write(%r); " % (START_MARKER + "\n")
+    source += "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run([python, "-X", "importtime", "-c", source], capture_output=True, text=True)
+    costs = []
+    error = None
+    lines = result.stderr.splitlines()
+    if START_MARKER in lines:
+        lines = lines[lines.index(START_MARKER) + 1:]
+    for line in lines:
+        if not line.startswith("import time:"):
+            if line.strip():
+                error = line.strip()  # The last line of a traceback names the failure
+            continue
+        fields = line[len("import time:"):].split("|")
+        if not fields[0].strip().isdigit():
+            continue  # Column headings
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        costs.append(ImportCost(name.strip(), int(fields[0]), int(fields[1]), depth))
+    return ImportProfile(modules, costs, error if result.returncode else None)
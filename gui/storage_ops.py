@@ -0,0 +1,174 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+MAX_PARALLEL_REWRITES = 16
+DELETE_BATCH_SIZE = 100  # Storage JSON API limit per batch request
+
+
+def signed_url(blob):
+    """Seven day download URL, signed locally without a network call"""
+    return blob.generate_signed_url(
+        version="v4",
+        expiration=timedelta(days=7),
+        method="GET"
+    )
+
+
+def rewrite_blob(bucket, source, dest_path, if_generation_match=None):
+    """
+    Copy source to dest_path inside the storage service.
+
+    Large objects may need several rewrite calls; each returns a token that
+    continues where the previous call stopped. if_generation_match=0 refuses
+    to overwrite an existing object. Returns the destination blob.
+    """
+    dest = bucket.blob(dest_path)
+    token, _, _ = dest.rewrite(source, if_generation_match=if_generation_match)
+    while token is not None:
+        token, _, _ = dest.rewrite(source, token=token, if_generation_match=if_generation_match)
+    return dest
+
+
+def same_content(a, b):
+    """Whether two stored objects hold the same bytes, going by their checksums"""
+    if a.md5_hash and b.md5_hash:
+        return a.md5_hash == b.md5_hash
+    # Composite objects have no MD5, only a CRC32C
+    return bool(a.crc32c) and a.crc32c == b.crc32c and a.size == b.size
+
+
+def copy_for_move(bucket, source_path, dest_path):
+    """
+    First half of a move: rewrite source to dest, or detect that a previous
+    attempt already did. Returns (dest_blob, source_blob_or_None); the source
+    is None once it is gone. A destination that holds different content
+    raises FileExistsError, a missing source FileNotFoundError.
+    """
+    if source_path == dest_path:
+        return bucket.blob(dest_path), None
+    source = bucket.get_blob(source_path)
+    dest = bucket.get_blob(dest_path)
+    if source is None:
+        if dest is not None:
+            return dest, None  # Already moved by an earlier attempt
+        raise FileNotFoundError(f"{source_path} does not exist")
+    if dest is None:
+        try:
+            return rewrite_blob(bucket, source, dest_path, if_generation_match=0), source
+        except Exception as e:
+            if getattr(e, "code", None) != 412:
+                raise
+            dest = bucket.get_blob(dest_path)  # Created since it was looked up
+    # A copy left by an earlier attempt counts as done
+    if dest is None or not same_content(source, dest):
+        raise FileExistsError(f"{dest_path} already exists")
+    return dest, source
+
+
+def delete_source(source):
+    """Second half of a move: drop the original unless it changed since it was copied"""
+    try:
+        source.delete(if_generation_match=source.generation)
+    except Exception as e:
+        if getattr(e, "code", None) != 404:
+            raise
+
+
+def move_blob(bucket, source_path, dest_path, commit=None):
+    """
+    Rename one object server side. Safe to retry: rerunning after a failure
+    at any step just finishes the move.
+
+    commit(dest_blob), if given, runs between the copy and the delete, e.g. to
+    point metadata at the new path. If it raises, the original stays and the
+    copy is left for the next attempt to reuse.
+    """
+    dest, source = copy_for_move(bucket, source_path, dest_path)
+    if commit:
+        commit(dest)
+    if source is not None:
+        delete_source(source)
+    return dest
+
+
+def move_blobs(bucket, moves, commit=None, max_workers=MAX_PARALLEL_REWRITES, on_progress=None):
+    """
+    Rename many objects at once.
+
+    moves is a list of (source_path, dest_path). Rewrites run in parallel and
+    the source deletes are sent in batched requests of up to 100, instead of
+    one blocking copy and delete per file. commit({source_path: dest_blob}),
+    if given, receives the successful copies before any original is deleted.
+    Returns {source_path: dest_blob or exception}; failed moves are safe to
+    pass again.
+    """
+    results = {}
+    copied = []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(copy_for_move, bucket, *move) for move in moves]
+        for done, (move, future) in enumerate(zip(moves, futures), 1):
+            try:
+                dest, source = future.result()
+                results[move[0]] = dest
+                if source is not None:
+                    copied.append(source)
+            except Exception as e:
+                results[move[0]] = e
+            if on_progress:
+                on_progress(done, len(moves))
+
+    if commit:
+        commit({path: dest for path, dest in results.items() if not isinstance(dest, Exception)})
+
+    # Delete the originals in batches; a missing original means it was already moved
+    for start in range(0, len(copied), DELETE_BATCH_SIZE):
+        chunk = copied[start:start + DELETE_BATCH_SIZE]
+        try:
+            with bucket.client.batch():
+                for source in chunk:
+                    source.delete(if_generation_match=source.generation)
+        except Exception:
+            # Fall back to individual deletes so one failure doesn't hide the rest
+            for source in chunk:
+                try:
+                    delete_source(source)
+                except Exception as e:
+                    results[source.name] = e
+
+    return results
+
+
+def delete_blobs(bucket, paths, max_workers=4):
+    """
+    Delete many objects by path.
+
+    Paths are split into batched requests of up to 100 that are sent from
+    parallel workers. Objects that are already gone count as deleted. Returns
+    {path: exception} for the deletes that failed.
+    """
+    errors = {}
+
+    def delete_chunk(chunk):
+        failed = {}
+        try:
+            with bucket.client.batch():
+                for path in chunk:
+                    bucket.blob(path).delete()
+        except Exception:
+            # One missing object fails the whole batch; retry one by one
+            for path in chunk:
+                try:
+                    bucket.blob(path).delete()
+                except Exception as e:
+                    if getattr(e, "code", None) != 404:
+                        failed[path] = e
+        return failed
+
+    chunks = [paths[start:start + DELETE_BATCH_SIZE] for start in range(0, len(paths), DELETE_BATCH_SIZE)]
+    if len(chunks) == 1:
+        return delete_chunk(chunks[0])
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for failed in pool.map(delete_chunk, chunks):
+            errors.update(failed)
+    return errors
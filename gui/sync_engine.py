@@ -0,0 +1,280 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from .blob_store import BlobStore, hash_file
+from .listing import listing_item
+from .metadata_cache import CACHE_DIR
+from .storage_ops import signed_url
+
+SYNC_WORKERS = 4  # Files hashed or uploaded at once
+
+
+class SyncManifest:
+    """
+    Local record of what each file document looked like on disk when it was
+    last synced: original path, size, modification time and content hash.
+
+    A file whose size and mtime still match is skipped without being read.
+    """
+
+    def __init__(self, username, cache_dir=CACHE_DIR):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, f"{username}.sync.sqlite3")
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS manifest ("
+            "doc_path TEXT PRIMARY KEY, original_path TEXT NOT NULL, size INTEGER NOT NULL, "
+            "mtime REAL NOT NULL, content_hash TEXT, synced_at REAL NOT NULL)"
+        )
+        self.conn.commit()
+
+    def get(self, doc_path):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT original_path, size, mtime, content_hash FROM manifest WHERE doc_path = ?",
+                (doc_path,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"original_path": row[0], "size": row[1], "mtime": row[2], "content_hash": row[3]}
+
+    def put(self, doc_path, original_path, size, mtime, content_hash):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO manifest VALUES (?, ?, ?, ?, ?, ?)",
+                (doc_path, original_path, size, mtime, content_hash, time.time())
+            )
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class SyncChange:
+    """A file whose local original differs from what is stored"""
+
+    def __init__(self, doc, original_path, size, mtime, digest):
+        self.doc = doc
+        self.data = doc.to_dict() or {}
+        self.name = self.data.get("name") or doc.id
+        self.original_path = original_path
+        self.size = size
+        self.mtime = mtime
+        self.digest = digest
+
+
+class SyncReport:
+    """What a sync found and, after run(), what it uploaded and how fast"""
+
+    def __init__(self):
+        self.scanned = 0
+        self.unchanged = 0
+        self.missing = 0
+        self.changes = []
+        self.scan_seconds = 0.0
+        self.uploaded = 0
+        self.deduplicated = 0
+        self.bytes_uploaded = 0
+        self.failed = {}
+        self.upload_seconds = 0.0
+        self.finished = False
+
+    @property
+    def changed_bytes(self):
+        return sum(change.size for change in self.changes)
+
+    def throughput(self):
+        """(megabytes per second, files per second) of the upload phase"""
+        if not self.upload_seconds:
+            return 0.0, 0.0
+        return (self.bytes_uploaded / (1024 * 1024) / self.upload_seconds,
+                (self.uploaded + self.deduplicated) / self.upload_seconds)
+
+    def summary(self):
+        lines = [
+            f"Scanned {self.scanned} file(s) in {self.scan_seconds:.1f}s: "
+            f"{len(self.changes)} changed ({self.changed_bytes / (1024 * 1024):.1f} MB), "
+            f"{self.unchanged} unchanged, {self.missing} missing locally."
+        ]
+        if self.finished:
+            megabytes_per_second, files_per_second = self.throughput()
+            lines.append(
+                f"Uploaded {self.uploaded} file(s), {self.deduplicated} already stored, "
+                f"{len(self.failed)} failed: {self.bytes_uploaded / (1024 * 1024):.1f} MB in "
+                f"{self.upload_seconds:.1f}s ({megabytes_per_second:.2f} MB/s, {files_per_second:.1f} files/s)."
+            )
+            lines.extend(f"{name}: {error}" for name, error in list(self.failed.items())[:10])
+        return "\n".join(lines)
+
+
+class SyncEngine:
+    """
+    Upload the local originals of files that changed since they were synced.
+
+    plan() walks the whole folder tree breadth-first and compares every file
+    that has an original_path against the manifest: size and mtime first, then
+    the content hash when those differ. It changes nothing remote, so on its
+    own it is a dry run. run(report) uploads the changed files on a pool of
+    workers through the content store, so content that is already stored is
+    not sent again, and updates the documents and the manifest.
+
+    listing_refs(folder_path) returns the (folders, files) refs of a folder in
+    whichever schema is in use. on_progress(done, total, status) is called from
+    worker threads; total is None while scanning.
+    """
+
+    def __init__(self, db, bucket, username, listing_refs, uploader, manifest=None,
+                 folders_keyed_by_name=True, max_workers=SYNC_WORKERS, on_progress=None):
+        self.db = db
+        self.bucket = bucket
+        self.username = username
+        self.listing_refs = listing_refs
+        self.uploader = uploader
+        self.manifest = manifest or SyncManifest(username)
+        self.folders_keyed_by_name = folders_keyed_by_name
+        self.max_workers = max_workers
+        self.on_progress = on_progress
+        self.lock = threading.Lock()
+
+    def walk_files(self):
+        """Yield every file document in the tree, folder by folder"""
+        queue = deque([[]])
+        seen = set()
+        while queue:
+            folder_path = queue.popleft()
+            folders_ref, files_ref = self.listing_refs(folder_path)
+            yield from files_ref.stream()
+            for doc in folders_ref.stream():
+                name = listing_item(doc, "folder")["name"]
+                # Nested folders are keyed by name, so one name is only walked once
+                key = name if self.folders_keyed_by_name else tuple(folder_path + [name])
+                if key not in seen:
+                    seen.add(key)
+                    queue.append(folder_path + [name])
+
+    def plan(self):
+        """Find the files whose local original changed; returns a SyncReport"""
+        report = SyncReport()
+        start = time.perf_counter()
+        to_hash = []
+
+        for doc in self.walk_files():
+            data = doc.to_dict() or {}
+            original_path = data.get("original_path")
+            if not original_path:
+                continue
+            report.scanned += 1
+            try:
+                stats = os.stat(original_path)
+            except OSError:
+                report.missing += 1
+                continue
+
+            synced = data.get("synced") and data.get("storage_path")
+            entry = self.manifest.get(doc.reference.path)
+            if synced and entry and entry["original_path"] == original_path and \
+                    entry["size"] == stats.st_size and entry["mtime"] == stats.st_mtime:
+                report.unchanged += 1
+            elif synced and not entry and data.get("size") == stats.st_size and \
+                    data.get("modified_time") == datetime.fromtimestamp(stats.st_mtime).isoformat():
+                # Uploaded by this app and untouched since; remember it without reading it
+                self.manifest.put(doc.reference.path, original_path, stats.st_size, stats.st_mtime,
+                                  data.get("content_hash"))
+                report.unchanged += 1
+            else:
+                to_hash.append((doc, original_path, stats))
+            self.report(report.scanned, None, f"Scanned {report.scanned} file(s)...")
+
+        # Only files whose size or mtime moved are read, several at a time
+        def compare(item):
+            doc, original_path, stats = item
+            return doc, original_path, stats, hash_file(original_path)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for done, (doc, original_path, stats, digest) in enumerate(pool.map(compare, to_hash), 1):
+                data = doc.to_dict() or {}
+                if data.get("synced") and data.get("content_hash") == digest:
+                    # Touched but not modified
+                    self.manifest.put(doc.reference.path, original_path, stats.st_size, stats.st_mtime, digest)
+                    report.unchanged += 1
+                else:
+                    report.changes.append(SyncChange(doc, original_path, stats.st_size, stats.st_mtime, digest))
+                self.report(done, len(to_hash), f"Compared {done} of {len(to_hash)} file(s)...")
+
+        report.scan_seconds = time.perf_counter() - start
+        return report
+
+    def run(self, report):
+        """Upload the changes found by plan() and fill in the report"""
+        blobs = BlobStore(self.db, self.bucket, self.username)
+        total = report.changed_bytes
+        sent = {}
+        start = time.perf_counter()
+
+        def on_progress(change, uploaded, _):
+            with self.lock:
+                sent[change.doc.reference.path] = uploaded
+                done = sum(sent.values())
+            self.report(done, total, f"Uploading {done / (1024 * 1024):.1f} of {total / (1024 * 1024):.1f} MB...")
+
+        def sync(change):
+            digest, record, uploaded = blobs.store(
+                change.original_path,
+                self.uploader,
+                digest=change.digest,
+                on_progress=lambda done, size: on_progress(change, done, size),
+                metadata={"username": self.username}
+            )
+            updates = {
+                "storage_path": record["storage_path"],
+                "content_hash": digest,
+                "download_url": signed_url(self.bucket.blob(record["storage_path"])),
+                "size": change.size,
+                "modified_time": datetime.fromtimestamp(change.mtime).isoformat(),
+                "synced_at": datetime.now().isoformat(),
+                "synced": True
+            }
+            if record.get("thumbnail_path"):
+                updates["thumbnail_path"] = record["thumbnail_path"]
+                updates["thumbnail_url"] = signed_url(self.bucket.blob(record["thumbnail_path"]))
+            change.doc.reference.update(updates)
+
+            # Let go of what the document pointed at before
+            old_hash = change.data.get("content_hash")
+            if old_hash and old_hash != digest:
+                blobs.release(old_hash)
+            elif not old_hash and change.data.get("storage_path"):
+                try:
+                    self.bucket.blob(change.data["storage_path"]).delete()
+                except Exception as e:
+                    if getattr(e, "code", None) != 404:
+                        raise
+            self.manifest.put(change.doc.reference.path, change.original_path, change.size, change.mtime, digest)
+            return uploaded
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = [(change, pool.submit(sync, change)) for change in report.changes]
+            for change, future in futures:
+                try:
+                    if future.result():
+                        report.uploaded += 1
+                        report.bytes_uploaded += change.size
+                    else:
+                        report.deduplicated += 1
+                        on_progress(change, change.size, change.size)
+                except Exception as e:
+                    report.failed[change.name] = e
+
+        report.upload_seconds = time.perf_counter() - start
+        report.finished = True
+        return report
+
+    def report(self, done, total, status):
+        if self.on_progress:
+            self.on_progress(done, total, status)
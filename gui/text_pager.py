@@ -0,0 +1,108 @@
+import bisect
+import mmap
+import os
+import threading
+from array import array
+
+INDEX_BLOCK_SIZE = 4 * 1024 * 1024  # Bytes scanned per indexing step
+SEARCH_BLOCK_SIZE = 4 * 1024 * 1024
+
+
+class LineIndex:
+    """
+    Line offsets of a memory-mapped text file, built incrementally.
+
+    build() scans the file in blocks on a background thread and appends the
+    start offset of every line, so the viewer can show the first lines of a
+    huge file right away and read any line window without loading the rest.
+    """
+
+    def __init__(self, path):
+        self.size = os.path.getsize(path)
+        self.file = open(path, 'rb')
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        self.offsets = array('Q', [0])  # Start offset of each line
+        self.indexed_bytes = 0
+        self.complete = self.size == 0
+        self.closed = False
+        self.lock = threading.Lock()
+
+    def build(self):
+        """Index the whole file; meant to run on a worker thread"""
+        pos = 0
+        while pos < self.size:
+            with self.lock:
+                if self.closed:
+                    return
+                end = min(pos + INDEX_BLOCK_SIZE, self.size)
+                block = self.mm[pos:end]
+            starts = []
+            i = block.find(b"\n")
+            while i != -1:
+                starts.append(pos + i + 1)
+                i = block.find(b"\n", i + 1)
+            self.offsets.extend(starts)
+            pos = end
+            self.indexed_bytes = pos
+        self.complete = True
+
+    def line_count(self):
+        """Lines whose end is known so far (all lines once complete)"""
+        count = len(self.offsets) - 1
+        if self.complete and self.offsets[-1] < self.size:
+            count += 1
+        return count
+
+    def get_lines(self, start, count):
+        """Decode up to count lines starting at line number start"""
+        lines = []
+        with self.lock:
+            if self.closed or self.mm is None:
+                return lines
+            last = min(start + count, self.line_count())
+            for line in range(start, last):
+                begin = self.offsets[line]
+                end = self.offsets[line + 1] if line + 1 < len(self.offsets) else self.size
+                lines.append(self.mm[begin:end].rstrip(b"\r\n").decode("utf-8", errors="replace"))
+        return lines
+
+    def line_of_offset(self, offset):
+        """Line number containing a byte offset, counting past the index if needed"""
+        indexed = len(self.offsets)
+        if offset < self.offsets[-1] or self.complete:
+            return bisect.bisect_right(self.offsets, offset) - 1
+        with self.lock:
+            extra = self.mm[self.offsets[indexed - 1]:offset].count(b"\n")
+        return indexed - 1 + extra
+
+    def search(self, text, start_line=0):
+        """
+        Line number of the next line at or after start_line containing text, or None.
+
+        Scans the mapped file block by block, so memory use stays flat.
+        """
+        needle = text.encode("utf-8")
+        if not needle or self.mm is None:
+            return None
+        start_line = min(start_line, max(len(self.offsets) - 1, 0))
+        pos = self.offsets[start_line]
+        overlap = len(needle) - 1
+        while pos < self.size:
+            with self.lock:
+                if self.closed:
+                    return None
+                end = min(pos + SEARCH_BLOCK_SIZE + overlap, self.size)
+                found = self.mm.find(needle, pos, end)
+            if found != -1:
+                return self.line_of_offset(found)
+            if end == self.size:
+                break
+            pos = end - overlap
+        return None
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            if self.mm is not None:
+                self.mm.close()
+            self.file.close()
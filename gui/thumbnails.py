@@ -0,0 +1,66 @@
+import io
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from .content_cache import ContentCache
+
+THUMBNAIL_SIZE = (128, 128)
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp')
+THUMBNAIL_CACHE_DIR = "data/cache/thumbnails"
+THUMBNAIL_CACHE_BYTES = 64 * 1024 * 1024
+
+_pool = None
+_pool_lock = threading.Lock()
+_cache = None
+
+
+def is_image(file_name):
+    return os.path.splitext(file_name)[1].lower() in IMAGE_EXTENSIONS
+
+
+def thumbnail_path(username, key):
+    """Storage path of the thumbnail for a file name or content hash"""
+    return f"users/{username}/thumbnails/{key}.webp"
+
+
+def make_thumbnail(file_path):
+    """
+    Render a small WebP thumbnail and return (bytes, content_type).
+
+    Runs in a worker process, so it only takes and returns plain values.
+    Falls back to JPEG when Pillow was built without WebP.
+    """
+    from PIL import Image
+
+    image = Image.open(file_path)
+    image.draft("RGB", THUMBNAIL_SIZE)
+    image.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS, reducing_gap=2.0)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA")
+
+    output = io.BytesIO()
+    try:
+        image.save(output, "WEBP", quality=75)
+        return output.getvalue(), "image/webp"
+    except (OSError, KeyError):
+        output = io.BytesIO()
+        image.convert("RGB").save(output, "JPEG", quality=75)
+        return output.getvalue(), "image/jpeg"
+
+
+def thumbnail_pool():
+    """Process pool for thumbnail rendering, started on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=2)
+        return _pool
+
+
+def thumbnail_cache():
+    """On-disk LRU cache of downloaded thumbnails"""
+    global _cache
+    with _pool_lock:
+        if _cache is None:
+            _cache = ContentCache(THUMBNAIL_CACHE_DIR, THUMBNAIL_CACHE_BYTES)
+        return _cache
@@ -0,0 +1,162 @@
+import os
+import time
+import requests
+from .checkpoints import CheckpointStore
+
+# Resumable uploads require every chunk except the last to be a multiple of 256 KB
+CHUNK_ALIGNMENT = 256 * 1024
+DEFAULT_CHUNK_SIZE = 8 * CHUNK_ALIGNMENT  # 2MB chunks
+
+# Local file that remembers open upload sessions between runs
+SESSIONS_PATH = "data/upload_sessions.json"
+
+
+class UploadError(Exception):
+    """Raised when the storage service rejects an upload"""
+
+
+class UploadSessionStore(CheckpointStore):
+    """Persist resumable upload session URIs so an interrupted upload can resume"""
+
+    def __init__(self, path=SESSIONS_PATH):
+        super().__init__(path)
+
+
+class ResumableUploader:
+    """
+    Stream a local file to a storage resumable upload session chunk by chunk.
+
+    One session is opened per file and its URI is stored in the session store,
+    so if the app crashes or is closed mid-transfer the next upload of the same
+    file continues from the last byte the server committed. The blob only needs
+    to provide create_resumable_upload_session(), which makes it easy to point
+    the uploader at a local HTTP stand-in for the storage API.
+    """
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE, session_store=None, http=None,
+                 max_retries=5, retry_delay=1.0):
+        if chunk_size <= 0 or chunk_size % CHUNK_ALIGNMENT:
+            raise ValueError(f"chunk_size must be a positive multiple of {CHUNK_ALIGNMENT} bytes")
+        self.chunk_size = chunk_size
+        self.session_store = session_store or UploadSessionStore()
+        self.http = http or requests.Session()
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+
+    def upload(self, blob, file_path, storage_path, content_type="application/octet-stream",
+               on_progress=None, metadata=None):
+        """Upload file_path to blob, resuming a previous session when possible"""
+        file_stats = os.stat(file_path)
+        total_size = file_stats.st_size
+        key = storage_path
+
+        # Only reuse a saved session if the local file is unchanged
+        record = self.session_store.get(key)
+        if record and (record.get("file_path") != file_path or
+                       record.get("size") != total_size or
+                       record.get("mtime") != file_stats.st_mtime):
+            record = None
+
+        offset = None
+        if record:
+            offset = self.query_offset(record["session_url"], total_size)
+        if offset is None:
+            session_url = blob.create_resumable_upload_session(
+                content_type=content_type,
+                size=total_size
+            )
+            record = dict(metadata or {})
+            record.update({
+                "session_url": session_url,
+                "file_path": file_path,
+                "storage_path": storage_path,
+                "size": total_size,
+                "mtime": file_stats.st_mtime,
+                "created_at": time.time()
+            })
+            self.session_store.save(key, record)
+            offset = 0
+
+        session_url = record["session_url"]
+        if on_progress:
+            on_progress(offset, total_size)
+
+        with open(file_path, 'rb') as file_obj:
+            if total_size == 0:
+                self._send(session_url, b"", 0, total_size)
+            while offset < total_size:
+                file_obj.seek(offset)
+                chunk = file_obj.read(self.chunk_size)
+                if not chunk:
+                    raise UploadError(f"{file_path} shrank during upload")
+                offset = self._send(session_url, chunk, offset, total_size)
+                if on_progress:
+                    on_progress(offset, total_size)
+
+        self.session_store.remove(key)
+        return total_size
+
+    def _send(self, session_url, data, start, total_size):
+        """PUT one chunk, retrying transient failures; return the committed offset"""
+        if total_size == 0:
+            content_range = "bytes */0"
+        else:
+            content_range = f"bytes {start}-{start + len(data) - 1}/{total_size}"
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.http.put(
+                    session_url,
+                    data=data,
+                    headers={"Content-Range": content_range}
+                )
+            except requests.RequestException:
+                response = None
+
+            if response is not None:
+                if response.status_code in (200, 201):
+                    return total_size
+                if response.status_code == 308:
+                    return self._committed_offset(response)
+                if response.status_code in (404, 410):
+                    raise UploadError("Upload session expired")
+                if response.status_code < 500 and response.status_code != 429:
+                    raise UploadError(f"Upload rejected with HTTP {response.status_code}: {response.text}")
+
+            if attempt == self.max_retries:
+                break
+            time.sleep(self.retry_delay * (2 ** attempt))
+
+            # The server may have committed part of the chunk before failing, so ask
+            # where to continue instead of blindly resending
+            committed = self.query_offset(session_url, total_size)
+            if committed is None:
+                raise UploadError("Upload session expired")
+            if committed != start:
+                return committed
+
+        raise UploadError("Upload failed after repeated retries")
+
+    def query_offset(self, session_url, total_size):
+        """Ask the server how many bytes it has; None if the session is gone"""
+        try:
+            response = self.http.put(
+                session_url,
+                data=b"",
+                headers={"Content-Range": f"bytes */{total_size}"}
+            )
+        except requests.RequestException:
+            return None
+        if response.status_code in (200, 201):
+            return total_size
+        if response.status_code == 308:
+            return self._committed_offset(response)
+        return None
+
+    @staticmethod
+    def _committed_offset(response):
+        """Parse the Range header of a 308 response ("bytes=0-N")"""
+        range_header = response.headers.get("Range")
+        if not range_header:
+            return 0
+        return int(range_header.rsplit("-", 1)[1]) + 1
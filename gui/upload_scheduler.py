@@ -0,0 +1,157 @@
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+
+DEFAULT_MAX_WORKERS = 4
+RATE_WINDOW = 5.0  # Seconds of history used for the transfer rate
+
+
+class BandwidthLimiter:
+    """Token bucket shared by all upload workers to cap total bytes per second"""
+
+    def __init__(self, bytes_per_second):
+        self.rate = bytes_per_second
+        self.tokens = bytes_per_second
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def consume(self, amount):
+        """Block until amount bytes may be sent"""
+        if not self.rate or amount <= 0:
+            return
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            self.tokens -= amount
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+class UploadJob:
+    """A single queued upload and its progress"""
+
+    def __init__(self, name, size, work, on_done=None, on_error=None):
+        self.name = name
+        self.size = size
+        self.work = work
+        self.on_done = on_done
+        self.on_error = on_error
+        self.transferred = 0
+        self.state = "queued"
+        self.error = None
+
+
+class UploadScheduler:
+    """
+    Run uploads on a bounded pool of worker threads.
+
+    Jobs wait in a priority queue ordered by size so small files finish first and
+    the user gets quick feedback. A job's work callable receives a progress
+    callback (uploaded_bytes, total_bytes); the scheduler uses it to apply the
+    global bandwidth limit and to aggregate progress for the whole batch.
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, bandwidth_limit=None, on_idle=None):
+        self.max_workers = max_workers
+        self.limiter = BandwidthLimiter(bandwidth_limit) if bandwidth_limit else None
+        self.on_idle = on_idle
+        self.queue = queue.PriorityQueue()
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+        self.workers = []
+        self.jobs = []
+        self.pending = 0  # Submitted jobs that have not finished yet
+        self.samples = deque()
+
+    def submit(self, name, size, work, on_done=None, on_error=None):
+        """Queue an upload; returns the UploadJob"""
+        job = UploadJob(name, size, work, on_done, on_error)
+        with self.lock:
+            self.jobs.append(job)
+            self.pending += 1
+            self.queue.put((size, next(self.counter), job))
+            if len(self.workers) < self.max_workers:
+                worker = threading.Thread(target=self._worker, daemon=True)
+                self.workers.append(worker)
+                worker.start()
+        return job
+
+    def _worker(self):
+        while True:
+            try:
+                _, _, job = self.queue.get(timeout=1)
+            except queue.Empty:
+                with self.lock:
+                    if self.queue.empty():
+                        self.workers.remove(threading.current_thread())
+                        return
+                continue
+
+            with self.lock:
+                job.state = "running"
+            try:
+                result = job.work(lambda uploaded, total, job=job: self._report(job, uploaded))
+                job.state = "done"
+                if job.on_done:
+                    job.on_done(result)
+            except Exception as e:
+                job.state = "failed"
+                job.error = e
+                if job.on_error:
+                    job.on_error(e)
+            finally:
+                with self.lock:
+                    self.pending -= 1
+                    idle = self.pending == 0
+                self.queue.task_done()
+                if idle and self.on_idle:
+                    self.on_idle()
+
+    def _report(self, job, uploaded):
+        with self.lock:
+            delta = uploaded - job.transferred
+            job.transferred = uploaded
+            if delta > 0:
+                self.samples.append((time.monotonic(), delta))
+        if self.limiter and delta > 0:
+            self.limiter.consume(delta)
+
+    def snapshot(self):
+        """Aggregated progress for every job since the last reset()"""
+        with self.lock:
+            now = time.monotonic()
+            while self.samples and now - self.samples[0][0] > RATE_WINDOW:
+                self.samples.popleft()
+            if self.samples:
+                elapsed = max(now - self.samples[0][0], 1.0)
+                rate = sum(delta for _, delta in self.samples) / elapsed
+            else:
+                rate = 0.0
+
+            total_bytes = sum(job.size for job in self.jobs)
+            transferred = sum(job.transferred for job in self.jobs)
+            remaining = total_bytes - transferred
+            return {
+                "total_files": len(self.jobs),
+                "done_files": sum(1 for job in self.jobs if job.state == "done"),
+                "failed_files": sum(1 for job in self.jobs if job.state == "failed"),
+                "running": [job.name for job in self.jobs if job.state == "running"],
+                "total_bytes": total_bytes,
+                "transferred_bytes": transferred,
+                "rate": rate,
+                "eta": remaining / rate if rate else None
+            }
+
+    def is_idle(self):
+        with self.lock:
+            return self.pending == 0
+
+    def reset(self):
+        """Forget finished jobs so the next batch starts a fresh progress total"""
+        with self.lock:
+            self.jobs = [job for job in self.jobs if job.state in ("queued", "running")]
+            self.samples.clear()
@@ -1,66 +1,35 @@
 import tkinter as tk
-from tkinter import PhotoImage
-import os
+from firebase_config import warm_up
+from gui.assets import logo
+from gui.screens import show_screen
 
-def welcome_screen(existing_root=None):
+def welcome_screen(root):
     """
-    Display the welcome screen with persistent image handling.
-    
+    Display the welcome screen in the application window.
+
     Args:
-        existing_root: Optional existing Tk root window to reuse
+        root: The application's root window
     """
 
     def open_register():
         """Navigate to the Register Screen."""
         from gui.register import register_screen
-        clear_screen()
         register_screen(root)
 
     def open_login():
         """Navigate to the Login Screen."""
         from gui.login import login_screen
-        clear_screen()
         login_screen(root)
 
-    def clear_screen():
-        """Clear all widgets from the current screen."""
-        for widget in root.winfo_children():
-            widget.destroy()
-
-    # Use existing root if provided, otherwise create a new one
-    if existing_root:
-        root = existing_root
-        clear_screen()
-    else:
-        root = tk.Tk()
-
-    root.title("Welcome - FileHaven")
-    root.geometry("600x400")
-    root.configure(bg="#E3F2FD")
-
-    # Center the window
-    screen_width = root.winfo_screenwidth()
-    screen_height = root.winfo_screenheight()
-    x = int((screen_width / 2) - (600 / 2))
-    y = int((screen_height / 2) - (400 / 2))
-    root.geometry(f"600x400+{x}+{y}")
+    screen = show_screen(root, "Welcome - FileHaven", 600, 400)
 
     # Main Frame
-    frame = tk.Frame(root, bg="#E3F2FD")
+    frame = tk.Frame(screen, bg="#E3F2FD")
     frame.pack(expand=True)
 
-    # Get absolute path to logo
-    logo_path = r"C:\Users\brian\OneDrive\Desktop\Helping Assignment\Group Assignment IT Apps 24 jan\FileManager\assets\logo.png"
-
-    # Reload the image **every time** welcome_screen is called
+    # Logo, decoded once and shared with the other screens
     try:
-        if os.path.exists(logo_path):
-            logo_image = PhotoImage(file=logo_path).subsample(3, 3)  # Recreate a fresh image reference
-            logo_label = tk.Label(frame, image=logo_image, bg="#E3F2FD")
-            logo_label.pack(pady=10)
-            # Keep a reference to prevent garbage collection
-            logo_label.image = logo_image
-            
+        tk.Label(frame, image=logo(), bg="#E3F2FD").pack(pady=10)
     except Exception as e:
         tk.Label(frame, text="FileHaven", font=("Helvetica", 24, "bold"), 
                  bg="#E3F2FD", fg="#1E88E5").pack(pady=10)
@@ -108,7 +77,7 @@ def welcome_screen(existing_root=None):
         fg="#666",
     ).pack(pady=20)
 
-    if not existing_root:
-        root.mainloop()
+    # Connect to Firebase in the background while the user picks an option
+    root.after_idle(warm_up)
 
     return root
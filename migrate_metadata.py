@@ -0,0 +1,46 @@
+"""
+Copy a user's folders and files into the flat items collection.
+
+    python migrate_metadata.py USERNAME [--dry-run] [--finish]
+
+Without --finish the legacy collections stay in use, so the copy can run while
+the user keeps working and can be repeated to pick up later changes. --finish
+switches the user to the flat schema after the copy; they need to log in again
+for the dashboard to use it. Deploy firestore.indexes.json before finishing.
+"""
+import argparse
+from firebase_config import db
+from gui.schema_migration import SchemaMigration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("username")
+    parser.add_argument("--dry-run", action="store_true", help="only count what would be copied")
+    parser.add_argument("--finish", action="store_true", help="switch the user to the flat schema afterwards")
+    args = parser.parse_args()
+
+    migration = SchemaMigration(
+        db,
+        args.username,
+        on_progress=lambda done, total, status: print(status, end="\r", flush=True)
+    )
+
+    if args.dry_run:
+        estimate = migration.dry_run()
+        print(f"\n{estimate['folders']} folder(s) and {estimate['files']} file(s): "
+              f"{estimate['documents']} documents in about {estimate['commits']} batch(es)")
+    else:
+        written = migration.run()
+        print(f"\nCopied {written} document(s)")
+        if args.finish:
+            migration.finish()
+            print(f"{args.username} now uses the flat schema")
+
+    for path in migration.conflicts:
+        print(f"Warning: '{path}' shares its contents with another folder of the same name "
+              f"and was skipped")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,22 @@
-from gui.welcome import welcome_screen
+import sys
+
+
+def profile_startup():
+    """Report what each screen's modules cost to import, in fresh interpreters"""
+    from gui.startup_profile import DASHBOARD_MODULES, WELCOME_MODULES, profile_imports
+    for modules in (WELCOME_MODULES, DASHBOARD_MODULES):
+        print(profile_imports(modules).report())
+        print()
+
 
 if __name__ == "__main__":
-    welcome_screen()
+    if "--profile-startup" in sys.argv[1:]:
+        profile_startup()
+    else:
+        from gui.screens import create_root
+        from gui.welcome import welcome_screen
+
+        # One window for the whole session; screens swap frames inside it
+        root = create_root()
+        welcome_screen(root)
+        root.mainloop()
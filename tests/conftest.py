@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The app runs from the repository root (python run.py), so tests import its
+# modules the same way
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
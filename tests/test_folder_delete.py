@@ -0,0 +1,79 @@
+import pytest
+
+from benchmark_delete import FakeBackend, FakeBucket, FakeDB, build_tree
+from gui.checkpoints import CheckpointStore
+from gui.folder_delete import DeleteError, FolderDeleter
+
+
+class FailingBucket(FakeBucket):
+    """Blob deletes of the paths in failing raise until they are removed from it"""
+
+    def __init__(self, backend, failing):
+        super().__init__(backend)
+        self.failing = set(failing)
+
+    def blob(self, path):
+        blob = super().blob(path)
+        bucket = self
+
+        class Blob:
+            def delete(self):
+                if path in bucket.failing:
+                    raise RuntimeError(f"cannot delete {path}")
+                blob.delete()
+        return Blob()
+
+
+@pytest.fixture
+def checkpoints(tmp_path):
+    return CheckpointStore(str(tmp_path / "checkpoints.json"))
+
+
+def test_deletes_whole_tree(checkpoints):
+    backend = FakeBackend(0)
+    build_tree(backend, "alice", 1000, fanout=3, files_per_folder=50)
+    reports = []
+    deleter = FolderDeleter(FakeDB(backend), FakeBucket(backend), "alice", checkpoints,
+                            on_progress=lambda done, total, status: reports.append((done, total)))
+
+    assert deleter.run("bench") == 1000
+
+    assert backend.document_count() == 0
+    assert not backend.blobs
+    assert reports[-1][0] == reports[-1][1]
+    assert checkpoints.pending("alice") == {}
+
+
+def test_interrupted_delete_resumes_from_checkpoint(checkpoints):
+    backend = FakeBackend(0)
+    build_tree(backend, "alice", 1000, fanout=3, files_per_folder=50)
+    stuck = sorted(backend.blobs)[0]
+    bucket = FailingBucket(backend, [stuck])
+    deleter = FolderDeleter(FakeDB(backend), bucket, "alice", checkpoints)
+
+    with pytest.raises(DeleteError, match=stuck):
+        deleter.run("bench")
+    assert deleter.pending() == ["bench"]
+    # The failing folder's level stops the delete before any of its ancestors
+    assert stuck in backend.blobs
+    assert len(backend.blobs) < 1000
+    finished = list(checkpoints.get("alice/bench")["finished"])
+    assert finished
+
+    bucket.failing.clear()
+    FolderDeleter(FakeDB(backend), bucket, "alice", checkpoints).run("bench")
+
+    assert backend.document_count() == 0
+    assert not backend.blobs
+    assert checkpoints.get("alice/bench") is None
+
+
+def test_entry_in_parent_is_deleted_last(checkpoints):
+    backend = FakeBackend(0)
+    root = build_tree(backend, "alice", 100, fanout=2, files_per_folder=50)
+    backend.docs[f"{root}/parent/subfolders"]["bench"] = {}
+
+    FolderDeleter(FakeDB(backend), FakeBucket(backend), "alice", checkpoints).run(
+        "bench", entry_path=f"{root}/parent/subfolders/bench")
+
+    assert backend.docs[f"{root}/parent/subfolders"] == {}
@@ -0,0 +1,28 @@
+import statistics
+
+from gui.startup_profile import HEAVY_MODULES, WELCOME_BUDGET_MS, WELCOME_MODULES, profile_imports
+
+RUNS = 3  # Cold imports measured; the median evens out a slow run
+
+
+def test_welcome_import_stays_within_budget():
+    profiles = [profile_imports(WELCOME_MODULES) for _ in range(RUNS)]
+
+    assert [profile.error for profile in profiles] == [None] * RUNS
+    elapsed = statistics.median(profile.total_ms() for profile in profiles)
+    assert elapsed <= WELCOME_BUDGET_MS, profiles[0].report()
+
+
+def test_welcome_import_leaves_heavy_modules_out():
+    profile = profile_imports(WELCOME_MODULES)
+
+    assert profile.error is None
+    assert profile.heavy() == [], profile.report()
+
+
+def test_heavy_modules_are_detected():
+    # A profile of something that does pull a heavy dependency in must be caught
+    profile = profile_imports(("requests",))
+
+    assert "requests" in HEAVY_MODULES
+    assert "requests" in profile.heavy()
@@ -0,0 +1,41 @@
+from gui.item_store import prefix_end, subtree_query
+
+
+class FakeQuery:
+    """Collection stand-in that records range filters and applies them to a list of paths"""
+
+    def __init__(self, paths, filters=()):
+        self.paths = paths
+        self.filters = filters
+
+    def where(self, field, op, value):
+        return FakeQuery(self.paths, self.filters + ((op, value),))
+
+    def results(self):
+        # Firestore compares strings by their UTF-8 bytes
+        def matches(path):
+            key = path.encode("utf-8")
+            return all(key >= value.encode("utf-8") if op == ">=" else key < value.encode("utf-8")
+                       for op, value in self.filters)
+        return [path for path in self.paths if matches(path)]
+
+
+def test_subtree_range_is_exact():
+    query = subtree_query(FakeQuery([]), "/a")
+
+    assert query.filters == ((">=", "/a/"), ("<", "/a0"))
+
+
+def test_subtree_includes_names_above_private_use_area():
+    paths = ["/a", "/a/b.txt", "/a/\U0001F600 pics", "/a/\U0001F600 pics/x", "/a/Ａ.txt",
+             "/a/￿", "/ab", "/a0", "/b/c"]
+
+    assert subtree_query(FakeQuery(paths), "/a").results() == [
+        "/a/b.txt", "/a/\U0001F600 pics", "/a/\U0001F600 pics/x", "/a/Ａ.txt", "/a/￿"]
+
+
+def test_prefix_end_increments_last_character():
+    assert prefix_end("/a/") == "/a0"
+    assert prefix_end("abc") == "abd"
+    assert prefix_end("\U0001F600") == "\U0001F601"
+    assert prefix_end("x퟿") == "x"
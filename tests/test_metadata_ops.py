@@ -0,0 +1,76 @@
+from gui.metadata_ops import BATCH_LIMIT, BatchWriter
+
+
+class FakeBatch:
+    def __init__(self, db):
+        self.db = db
+        self.ops = []
+
+    def set(self, ref, data, merge=False):
+        self.ops.append(("set", ref))
+
+    def update(self, ref, data):
+        self.ops.append(("update", ref))
+
+    def delete(self, ref):
+        self.ops.append(("delete", ref))
+
+    def commit(self):
+        self.db.committed.append(self.ops)
+
+
+class FakeDB:
+    def __init__(self):
+        self.committed = []  # Operations of each committed batch
+
+    def batch(self):
+        return FakeBatch(self)
+
+
+def test_batches_are_flushed_at_the_limit():
+    db = FakeDB()
+
+    with BatchWriter(db) as writer:
+        for number in range(2 * BATCH_LIMIT + 1):
+            writer.delete(f"doc-{number}")
+
+    assert [len(ops) for ops in db.committed] == [BATCH_LIMIT, BATCH_LIMIT, 1]
+    assert writer.commits == 3
+    assert [ref for ops in db.committed for _, ref in ops] == [f"doc-{n}" for n in range(2 * BATCH_LIMIT + 1)]
+
+
+def test_exactly_full_batch_commits_once():
+    db = FakeDB()
+
+    with BatchWriter(db) as writer:
+        for number in range(BATCH_LIMIT):
+            writer.set(f"doc-{number}", {})
+
+    assert [len(ops) for ops in db.committed] == [BATCH_LIMIT]
+
+
+def test_reserve_keeps_related_writes_together():
+    db = FakeDB()
+
+    with BatchWriter(db, limit=5) as writer:
+        for number in range(4):
+            writer.update(f"doc-{number}", {})
+        writer.reserve(2)
+        writer.set("target", {})
+        writer.delete("source")
+
+    assert [[ref for _, ref in ops] for ops in db.committed] == [
+        ["doc-0", "doc-1", "doc-2", "doc-3"], ["target", "source"]]
+
+
+def test_nothing_is_committed_after_an_error():
+    db = FakeDB()
+
+    try:
+        with BatchWriter(db) as writer:
+            writer.delete("doc")
+            raise ValueError
+    except ValueError:
+        pass
+
+    assert db.committed == []
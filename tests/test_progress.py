@@ -0,0 +1,62 @@
+import tkinter as tk
+
+from gui.progress import ProgressChannel
+
+
+class FakeWidget:
+    """Records wakeups; fail makes event_generate raise like a Tk without its event loop"""
+
+    def __init__(self):
+        self.wakeups = 0
+        self.fail = False
+
+    def bind(self, sequence, callback):
+        self.callback = callback
+
+    def event_generate(self, sequence, when=None):
+        if self.fail:
+            raise tk.TclError("main thread is not in main loop")
+        self.wakeups += 1
+
+
+def test_posts_coalesce_until_drained():
+    widget = FakeWidget()
+    applied = []
+    channel = ProgressChannel(widget, applied.append)
+
+    channel.post(progress=10)
+    channel.post(progress=20, status="Working")
+    assert widget.wakeups == 1
+
+    channel.drain()
+    assert applied == [{"progress": 20, "status": "Working"}]
+    channel.post(progress=30)
+    assert widget.wakeups == 2
+
+
+def test_failed_wakeup_is_retried_on_next_post():
+    widget = FakeWidget()
+    applied = []
+    channel = ProgressChannel(widget, applied.append)
+
+    widget.fail = True
+    channel.post(progress=10)
+    widget.fail = False
+    channel.post(progress=20)
+
+    assert widget.wakeups == 1
+    channel.drain()
+    assert applied == [{"progress": 20}]
+
+
+def test_closed_channel_ignores_posts():
+    widget = FakeWidget()
+    applied = []
+    channel = ProgressChannel(widget, applied.append)
+
+    channel.close()
+    channel.post(progress=10)
+    channel.drain()
+
+    assert widget.wakeups == 0
+    assert applied == []
@@ -0,0 +1,143 @@
+from enum import Enum
+
+from gui.realtime import FolderListener, apply_changes
+
+
+class ChangeType(Enum):
+    ADDED = 1
+    MODIFIED = 2
+    REMOVED = 3
+
+
+class FakeDoc:
+    def __init__(self, doc_id, data=None):
+        self.id = doc_id
+        self.data = data
+
+    def to_dict(self):
+        return self.data
+
+
+class FakeChange:
+    def __init__(self, kind, doc):
+        self.type = ChangeType[kind]
+        self.document = doc
+
+
+class FakeWatch:
+    def __init__(self):
+        self.unsubscribed = False
+
+    def unsubscribe(self):
+        self.unsubscribed = True
+
+
+class FakeCollection:
+    """Stands in for a Firestore collection; emit() delivers a snapshot to listeners"""
+
+    def __init__(self):
+        self.callbacks = []
+        self.watch = FakeWatch()
+
+    def on_snapshot(self, callback):
+        self.callbacks.append(callback)
+        return self.watch
+
+    def emit(self, *changes):
+        changes = [FakeChange(kind, doc) for kind, doc in changes]
+        for callback in self.callbacks:
+            callback([change.document for change in changes], changes, None)
+
+
+def folder(name):
+    return {"name": name, "type": "folder"}
+
+
+def file(name, **fields):
+    return dict({"name": name, "type": "file"}, **fields)
+
+
+def test_added_items_are_appended_to_their_type():
+    items = [folder("a"), file("x")]
+
+    result = apply_changes(items, "folder", [("ADDED", folder("b"))])
+    result = apply_changes(result, "file", [("ADDED", file("y"))])
+
+    assert result == [folder("a"), folder("b"), file("x"), file("y")]
+
+
+def test_modified_item_keeps_its_position():
+    items = [folder("a"), file("x"), file("y"), file("z")]
+
+    result = apply_changes(items, "file", [("MODIFIED", file("y", thumbnail_url="thumb"))])
+
+    assert result == [folder("a"), file("x"), file("y", thumbnail_url="thumb"), file("z")]
+
+
+def test_removed_item_is_dropped():
+    items = [folder("a"), folder("b"), file("x")]
+
+    assert apply_changes(items, "folder", [("REMOVED", folder("a"))]) == [folder("b"), file("x")]
+    assert apply_changes(items, "file", [("REMOVED", file("missing"))]) == items
+
+
+def test_mixed_change_set_is_applied_in_order():
+    items = [file("x"), file("y")]
+    changes = [("REMOVED", file("x")), ("ADDED", file("z")), ("MODIFIED", file("y", thumbnail_url="t")),
+               ("ADDED", file("x"))]
+
+    assert apply_changes(items, "file", changes) == [file("y", thumbnail_url="t"), file("z"), file("x")]
+
+
+def test_reset_replaces_every_item_of_the_type():
+    items = [folder("old"), file("x")]
+
+    result = apply_changes(items, "folder", [("ADDED", folder("a")), ("ADDED", folder("b"))], reset=True)
+
+    assert result == [folder("a"), folder("b"), file("x")]
+
+
+def test_listener_delivers_first_snapshot_as_reset():
+    folders, files = FakeCollection(), FakeCollection()
+    received = []
+    listener = FolderListener(folders, files, lambda *args: received.append(args))
+    listener.start()
+
+    files.emit(("ADDED", FakeDoc("x")), ("ADDED", FakeDoc("id-1", {"name": "y", "thumbnail_url": "t"})))
+    files.emit(("MODIFIED", FakeDoc("x", {"thumbnail_url": "u"})), ("REMOVED", FakeDoc("id-1", {"name": "y"})))
+    folders.emit(("ADDED", FakeDoc("a")))
+
+    assert received == [
+        ("file", [("ADDED", file("x")), ("ADDED", file("y", thumbnail_url="t"))], True),
+        ("file", [("MODIFIED", file("x", thumbnail_url="u")), ("REMOVED", file("y"))], False),
+        ("folder", [("ADDED", folder("a"))], True),
+    ]
+
+
+def test_listener_applied_to_listing():
+    folders, files = FakeCollection(), FakeCollection()
+    items = []
+
+    def on_changes(item_type, changes, reset):
+        items[:] = apply_changes(items, item_type, changes, reset)
+
+    FolderListener(folders, files, on_changes).start()
+    folders.emit(("ADDED", FakeDoc("a")))
+    files.emit(("ADDED", FakeDoc("x")), ("ADDED", FakeDoc("y")))
+    folders.emit(("ADDED", FakeDoc("b")), ("REMOVED", FakeDoc("a")))
+    files.emit(("MODIFIED", FakeDoc("x", {"thumbnail_url": "t"})))
+
+    assert items == [folder("b"), file("x", thumbnail_url="t"), file("y")]
+
+
+def test_stopped_listener_ignores_snapshots_and_unsubscribes():
+    folders, files = FakeCollection(), FakeCollection()
+    received = []
+    listener = FolderListener(folders, files, lambda *args: received.append(args))
+    listener.start()
+
+    listener.stop()
+    files.emit(("ADDED", FakeDoc("x")))
+
+    assert received == []
+    assert folders.watch.unsubscribed and files.watch.unsubscribed
@@ -0,0 +1,173 @@
+import hashlib
+import itertools
+import threading
+
+import pytest
+
+from gui.storage_ops import move_blob, move_blobs
+
+
+class PreconditionFailed(Exception):
+    code = 412
+
+
+class NotFound(Exception):
+    code = 404
+
+
+class FakeBucket:
+    """Objects kept as path -> (content, generation)"""
+
+    def __init__(self, objects=None):
+        self.generations = itertools.count(1)
+        self.objects = {path: (content, next(self.generations)) for path, content in (objects or {}).items()}
+        self.client = self
+        self.lock = threading.Lock()
+        self.fail_deletes = set()
+
+    def batch(self):
+        class Batch:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+        return Batch()
+
+    def blob(self, path):
+        return FakeBlob(self, path)
+
+    def get_blob(self, path):
+        blob = FakeBlob(self, path)
+        return blob if blob.generation is not None else None
+
+
+class FakeBlob:
+    def __init__(self, bucket, path):
+        self.bucket = bucket
+        self.name = path
+        self.generation = self.md5_hash = self.crc32c = self.size = None
+        self.reload()
+
+    def reload(self):
+        content, self.generation = self.bucket.objects.get(self.name, (None, None))
+        if content is not None:
+            self.md5_hash = hashlib.md5(content).hexdigest()
+            self.size = len(content)
+
+    def rewrite(self, source, token=None, if_generation_match=None):
+        with self.bucket.lock:
+            if if_generation_match is not None and self.bucket.objects.get(self.name, (None, 0))[1] != if_generation_match:
+                raise PreconditionFailed(self.name)
+            self.bucket.objects[self.name] = (self.bucket.objects[source.name][0], next(self.bucket.generations))
+        self.reload()
+        return None, self.size, self.size
+
+    def delete(self, if_generation_match=None):
+        with self.bucket.lock:
+            if self.name in self.bucket.fail_deletes:
+                raise RuntimeError(f"cannot delete {self.name}")
+            if self.name not in self.bucket.objects:
+                raise NotFound(self.name)
+            if if_generation_match is not None and self.bucket.objects[self.name][1] != if_generation_match:
+                raise PreconditionFailed(self.name)
+            del self.bucket.objects[self.name]
+
+
+class CommitFailed(Exception):
+    pass
+
+
+def fail_commit(dest):
+    raise CommitFailed
+
+
+def test_move_blob_copies_commits_and_deletes():
+    bucket = FakeBucket({"a": b"content"})
+    committed = []
+
+    dest = move_blob(bucket, "a", "b", commit=lambda dest: committed.append(dest.name))
+
+    assert committed == ["b"]
+    assert dest.name == "b"
+    assert {path: content for path, (content, _) in bucket.objects.items()} == {"b": b"content"}
+
+
+def test_retry_after_failed_commit_reuses_copy():
+    bucket = FakeBucket({"a": b"content"})
+    with pytest.raises(CommitFailed):
+        move_blob(bucket, "a", "b", commit=fail_commit)
+    assert set(bucket.objects) == {"a", "b"}
+    copy_generation = bucket.objects["b"][1]
+
+    move_blob(bucket, "a", "b")
+
+    assert set(bucket.objects) == {"b"}
+    assert bucket.objects["b"][1] == copy_generation
+
+
+def test_retry_after_failed_source_delete_finishes_move():
+    bucket = FakeBucket({"a": b"content"})
+    bucket.fail_deletes.add("a")
+    with pytest.raises(RuntimeError):
+        move_blob(bucket, "a", "b")
+
+    bucket.fail_deletes.clear()
+    committed = []
+    move_blob(bucket, "a", "b", commit=lambda dest: committed.append(dest.name))
+
+    assert committed == ["b"]
+    assert set(bucket.objects) == {"b"}
+
+
+def test_retry_after_finished_move_only_commits():
+    bucket = FakeBucket({"b": b"content"})
+    committed = []
+
+    move_blob(bucket, "a", "b", commit=lambda dest: committed.append(dest.name))
+
+    assert committed == ["b"]
+    assert set(bucket.objects) == {"b"}
+
+
+def test_destination_with_other_content_is_refused():
+    bucket = FakeBucket({"a": b"content", "b": b"something else"})
+
+    with pytest.raises(FileExistsError):
+        move_blob(bucket, "a", "b")
+    assert bucket.objects["b"][0] == b"something else"
+    assert "a" in bucket.objects
+
+
+def test_missing_source_is_reported():
+    with pytest.raises(FileNotFoundError):
+        move_blob(FakeBucket(), "a", "b")
+
+
+def test_move_blobs_commits_copies_before_deleting():
+    bucket = FakeBucket({f"src/{n}": b"%d" % n for n in range(250)})
+    bucket.objects["dst/7"] = (b"taken", next(bucket.generations))
+    seen = {}
+
+    def commit(copies):
+        seen.update(copies)
+        assert all(source in bucket.objects for source in copies)
+
+    results = move_blobs(bucket, [(f"src/{n}", f"dst/{n}") for n in range(250)], commit=commit)
+
+    assert isinstance(results["src/7"], FileExistsError)
+    assert len(seen) == 249
+    assert set(bucket.objects) == {f"dst/{n}" for n in range(250)} | {"src/7"}
+
+
+def test_move_blobs_is_safe_to_rerun_after_failed_commit():
+    moves = [(f"src/{n}", f"dst/{n}") for n in range(10)]
+    bucket = FakeBucket({source: source.encode() for source, _ in moves})
+    with pytest.raises(CommitFailed):
+        move_blobs(bucket, moves, commit=fail_commit)
+
+    results = move_blobs(bucket, moves)
+
+    assert not any(isinstance(result, Exception) for result in results.values())
+    assert {path: content for path, (content, _) in bucket.objects.items()} == {
+        dest: source.encode() for source, dest in moves}
@@ -0,0 +1,72 @@
+import pytest
+
+from gui import text_pager
+from gui.text_pager import LineIndex
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    # Small blocks so lines and matches straddle block boundaries
+    monkeypatch.setattr(text_pager, "INDEX_BLOCK_SIZE", 7)
+    monkeypatch.setattr(text_pager, "SEARCH_BLOCK_SIZE", 5)
+
+
+def index_of(tmp_path, content):
+    path = tmp_path / "text.txt"
+    path.write_bytes(content)
+    index = LineIndex(str(path))
+    index.build()
+    return index
+
+
+def test_lines_are_indexed_across_blocks(tmp_path, small_blocks):
+    lines = [f"line {number}" for number in range(20)]
+    index = index_of(tmp_path, "\n".join(lines).encode() + b"\n")
+
+    assert index.complete
+    assert index.line_count() == 20
+    assert index.get_lines(0, 3) == lines[:3]
+    assert index.get_lines(18, 10) == lines[18:]
+    index.close()
+
+
+def test_last_line_without_newline_and_crlf(tmp_path):
+    index = index_of(tmp_path, b"first\r\nsecond\r\nlast")
+
+    assert index.line_count() == 3
+    assert index.get_lines(0, 3) == ["first", "second", "last"]
+    index.close()
+
+
+def test_empty_file(tmp_path):
+    index = index_of(tmp_path, b"")
+
+    assert index.line_count() == 0
+    assert index.get_lines(0, 10) == []
+    assert index.search("anything") is None
+    index.close()
+
+
+def test_search_finds_matches_across_blocks(tmp_path, small_blocks):
+    lines = ["alpha", "beta", "gamma needle", "delta", "needle again"]
+    index = index_of(tmp_path, "\n".join(lines).encode())
+
+    assert index.search("needle") == 2
+    assert index.search("needle", start_line=3) == 4
+    assert index.search("missing") is None
+    index.close()
+
+
+def test_invalid_utf8_is_replaced(tmp_path):
+    index = index_of(tmp_path, b"ok\n\xff\xfe bad\n")
+
+    assert index.get_lines(1, 1) == ["�� bad"]
+    index.close()
+
+
+def test_closed_index_returns_nothing(tmp_path):
+    index = index_of(tmp_path, b"one\ntwo\n")
+    index.close()
+
+    assert index.get_lines(0, 2) == []
+    assert index.search("one") is None
@@ -0,0 +1,194 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from gui.upload_engine import CHUNK_ALIGNMENT, ResumableUploader, UploadError, UploadSessionStore
+
+
+class StorageStandIn(ThreadingHTTPServer):
+    """
+    Local stand-in for the resumable upload API: a chunk PUT answers 308 with
+    the committed Range until the last byte arrives, then 200. A "bytes */N"
+    PUT asks for the committed offset; unknown sessions answer 404 (or 410).
+    """
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), UploadHandler)
+        self.sessions = {}  # id -> bytearray of committed bytes
+        self.created = 0
+        self.puts = []  # (session id, first byte) of every chunk received
+        self.commit_limit = None  # Commit at most this many bytes of a chunk
+        self.missing_status = 404  # Answer for sessions that do not exist
+        self.lock = threading.Lock()
+
+    def new_session(self):
+        with self.lock:
+            self.created += 1
+            session_id = str(self.created)
+            self.sessions[session_id] = bytearray()
+        return f"http://127.0.0.1:{self.server_port}/upload/{session_id}"
+
+
+class UploadHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_PUT(self):
+        server = self.server
+        session_id = self.path.rsplit("/", 1)[1]
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        spec, total = self.headers["Content-Range"].split(" ", 1)[1].split("/")
+        total = int(total)
+        with server.lock:
+            data = server.sessions.get(session_id)
+            if data is None:
+                return self.reply(server.missing_status)
+            if spec != "*":
+                start = int(spec.split("-")[0])
+                server.puts.append((session_id, start))
+                if start != len(data):
+                    return self.reply(400)
+                if server.commit_limit is not None:
+                    body = body[:server.commit_limit]
+                data.extend(body)
+            if len(data) == total:
+                return self.reply(200)
+            return self.reply(308, {"Range": f"bytes=0-{len(data) - 1}"} if data else {})
+
+    def reply(self, status, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeBlob:
+    def __init__(self, server):
+        self.server = server
+        self.sessions_created = 0
+
+    def create_resumable_upload_session(self, content_type=None, size=None):
+        self.sessions_created += 1
+        return self.server.new_session()
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def server():
+    server = StorageStandIn()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return UploadSessionStore(str(tmp_path / "sessions.json"))
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "source.bin"
+    path.write_bytes(bytes(range(256)) * (3 * CHUNK_ALIGNMENT // 256))
+    return str(path)
+
+
+def uploader(store):
+    return ResumableUploader(chunk_size=CHUNK_ALIGNMENT, session_store=store, retry_delay=0)
+
+
+def interrupt_after(offset):
+    def on_progress(done, total):
+        if done >= offset:
+            raise Interrupted
+    return on_progress
+
+
+def uploaded(server, session_url):
+    return bytes(server.sessions[session_url.rsplit("/", 1)[1]])
+
+
+def test_upload_sends_file_in_chunks(server, store, source):
+    blob = FakeBlob(server)
+
+    assert uploader(store).upload(blob, source, "users/a/file.bin") == 3 * CHUNK_ALIGNMENT
+
+    assert bytes(server.sessions["1"]) == open(source, "rb").read()
+    assert [start for _, start in server.puts] == [0, CHUNK_ALIGNMENT, 2 * CHUNK_ALIGNMENT]
+    assert store.get("users/a/file.bin") is None
+
+
+def test_upload_resumes_after_partial_upload(server, store, source):
+    blob = FakeBlob(server)
+    with pytest.raises(Interrupted):
+        uploader(store).upload(blob, source, "users/a/file.bin", on_progress=interrupt_after(CHUNK_ALIGNMENT))
+    record = store.get("users/a/file.bin")
+    assert len(uploaded(server, record["session_url"])) == CHUNK_ALIGNMENT
+
+    # A new uploader, as after a restart, finds the session and skips what was committed
+    server.puts.clear()
+    uploader(store).upload(blob, source, "users/a/file.bin")
+
+    assert blob.sessions_created == 1
+    assert [start for _, start in server.puts] == [CHUNK_ALIGNMENT, 2 * CHUNK_ALIGNMENT]
+    assert uploaded(server, record["session_url"]) == open(source, "rb").read()
+    assert store.get("users/a/file.bin") is None
+
+
+def test_upload_continues_from_partially_committed_chunk(server, store, source):
+    server.commit_limit = CHUNK_ALIGNMENT // 2
+
+    uploader(store).upload(FakeBlob(server), source, "users/a/file.bin")
+
+    assert bytes(server.sessions["1"]) == open(source, "rb").read()
+    assert [start for _, start in server.puts][:3] == [0, CHUNK_ALIGNMENT // 2, CHUNK_ALIGNMENT]
+
+
+@pytest.mark.parametrize("status", [404, 410])
+def test_stale_session_starts_a_new_one(server, store, source, status):
+    blob = FakeBlob(server)
+    with pytest.raises(Interrupted):
+        uploader(store).upload(blob, source, "users/a/file.bin", on_progress=interrupt_after(CHUNK_ALIGNMENT))
+    stale = store.get("users/a/file.bin")["session_url"]
+    del server.sessions[stale.rsplit("/", 1)[1]]
+    server.missing_status = status
+
+    uploader(store).upload(blob, source, "users/a/file.bin")
+
+    assert blob.sessions_created == 2
+    assert bytes(server.sessions["2"]) == open(source, "rb").read()
+
+
+@pytest.mark.parametrize("status", [404, 410])
+def test_session_expiring_mid_upload_raises(server, store, source, status):
+    blob = FakeBlob(server)
+
+    def expire(done, total):
+        if done >= CHUNK_ALIGNMENT:
+            server.sessions.pop("1", None)
+    server.missing_status = status
+
+    with pytest.raises(UploadError, match="expired"):
+        uploader(store).upload(blob, source, "users/a/file.bin", on_progress=expire)
+
+
+def test_changed_file_does_not_reuse_session(server, store, source):
+    blob = FakeBlob(server)
+    with pytest.raises(Interrupted):
+        uploader(store).upload(blob, source, "users/a/file.bin", on_progress=interrupt_after(CHUNK_ALIGNMENT))
+    with open(source, "ab") as file_obj:
+        file_obj.write(b"more")
+
+    uploader(store).upload(blob, source, "users/a/file.bin")
+
+    assert blob.sessions_created == 2
+    assert bytes(server.sessions["2"]) == open(source, "rb").read()